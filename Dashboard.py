@@ -1,8 +1,8 @@
 import streamlit as st
-import pandas as pd
 import time
 import base64
-from db import get_connection
+from db import baca_sql
+from query_halaman import QUERY_STATUS_PROJECT, QUERY_PEMBELIAN_TERAKHIR
 
 # =========================================
 # 1. KONFIGURASI HALAMAN (WAJIB PALING ATAS)
@@ -126,19 +126,19 @@ if "first_load_done" not in st.session_state:
 st.title("🚀 Dashboard Manajerial")
 st.markdown("Ringkasan performa bisnis, status produksi, dan peringatan dini.")
 
-conn = get_connection()
-conn.row_factory = None
-c = conn.cursor()
-
 # --- A. METRICS ---
-total_omzet = c.execute("SELECT SUM(price_per_item * amount) FROM projects").fetchone()[0] or 0
-total_spend = c.execute("SELECT SUM(price) FROM purchases").fetchone()[0] or 0
+# Satu baris dashboard_summary (dijaga trigger), bukan agregat ulang tiap load
+ringkasan = baca_sql("""
+    SELECT total_omzet, total_spend, active_projects, idle_tailors, low_stock_count
+    FROM dashboard_summary WHERE id = 1
+""").iloc[0]
+total_omzet = ringkasan["total_omzet"]
+total_spend = ringkasan["total_spend"]
 net_profit = total_omzet - total_spend
 
-active_projects = c.execute("SELECT COUNT(*) FROM projects WHERE status='ongoing'").fetchone()[0]
-idle_tailors = c.execute("SELECT COUNT(*) FROM tailors WHERE status='idle'").fetchone()[0]
-low_stock_items = c.execute("SELECT COUNT(DISTINCT fabric_type) FROM inventory GROUP BY fabric_type HAVING SUM(CASE WHEN direction='IN' THEN amount ELSE -amount END) < 10").fetchone()
-low_stock_count = low_stock_items[0] if low_stock_items else 0
+active_projects = int(ringkasan["active_projects"])
+idle_tailors = int(ringkasan["idle_tailors"])
+low_stock_count = int(ringkasan["low_stock_count"])
 
 col1, col2, col3, col4, col5 = st.columns(5)
 col1.metric("💰 Net Profit", f"Rp {net_profit:,.0f}")
@@ -162,7 +162,7 @@ with col_chart1:
     FROM projects 
     ORDER BY id DESC LIMIT 10
     """
-    df_finance = pd.read_sql_query(query_finance, conn)
+    df_finance = baca_sql(query_finance)
     
     if not df_finance.empty:
         st.bar_chart(df_finance.set_index("project_name"), color=["#36A2EB", "#FF6384"], stack=False)
@@ -171,7 +171,7 @@ with col_chart1:
 
 with col_chart2:
     st.subheader("📊 Status Produksi")
-    df_status = pd.read_sql_query("SELECT status, COUNT(*) as count FROM projects GROUP BY status", conn)
+    df_status = baca_sql(QUERY_STATUS_PROJECT)
     
     if not df_status.empty:
         st.dataframe(df_status.style.background_gradient(cmap="Blues"), use_container_width=True, hide_index=True)
@@ -184,9 +184,9 @@ st.subheader("🕒 Aktivitas Terkini")
 tab_a, tab_b = st.tabs(["Project Baru", "Transaksi Material"])
 
 with tab_a:
-    df_recent_proj = pd.read_sql_query("SELECT project_name, customer_name, status, deadline FROM projects ORDER BY id DESC LIMIT 5", conn)
+    df_recent_proj = baca_sql("SELECT project_name, customer_name, status, deadline FROM projects ORDER BY id DESC LIMIT 5")
     st.dataframe(df_recent_proj, use_container_width=True, hide_index=True)
 
 with tab_b:
-    df_recent_buy = pd.read_sql_query("SELECT item, amount, unit, price, date FROM purchases ORDER BY date DESC LIMIT 5", conn)
+    df_recent_buy = baca_sql(QUERY_PEMBELIAN_TERAKHIR)
     st.dataframe(df_recent_buy, use_container_width=True, hide_index=True)
\ No newline at end of file
@@ -1,130 +1,985 @@
 import pandas as pd
 import numpy as np
 import os
-from datetime import date
-from sklearn.preprocessing import MinMaxScaler
-from db import get_connection
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+from db import buka_koneksi, pool
+from db_init import ALPHA_SPEED
+from capacity import QUERY_BEBAN_PER_HARI
+from import_capabilities import KAPABILITAS_CSV
+from profiling import tahap
+from normalisasi import minmax
 
-def hitung_rekomendasi(jenis_project, jumlah_pcs, tgl_deadline):
+map_kapabilitas = {
+    "Seragam Sekolah": ["Seragam Hem Putih (Pcs/hari)", "Seragam Hem Pramuka (Pcs/hari)"],
+    "Seragam Pramuka": ["Seragam Hem Pramuka (Pcs/hari)", "Celana Pramuka Seragam (Pcs/hari)"],
+    "Rok Seragam": ["Rok Seragam (Pcs/hari)"],
+    "Kemeja/Batik": ["Kemeja Kerja (Pcs/hari)"],
+    "Custom/Gamis/Sulit": ["Custom (Sulit) (Pcs/hari)"]
+}
+
+# projects.clothes_type -> kategori di map_kapabilitas
+map_clothes_type = {
+    "seragam sekolah": "Seragam Sekolah",
+    "seragam pramuka": "Seragam Pramuka",
+    "rok": "Rok Seragam",
+    "kemeja/batik": "Kemeja/Batik",
+    "custom/gamis/sulit": "Custom/Gamis/Sulit",
+}
+
+
+def _rata_rata_speed(df, kolom_kapabilitas):
+    """Rata-rata speed per baris untuk kolom kategori (NaN diabaikan, kosong -> 0)."""
+    if not kolom_kapabilitas:
+        return np.zeros(len(df))
+    arr = df[kolom_kapabilitas].to_numpy(dtype=float)
+    valid = ~np.isnan(arr)
+    jumlah = np.where(valid, arr, 0.0).sum(axis=1)
+    banyak = valid.sum(axis=1)
+    return np.divide(jumlah, banyak, out=np.zeros(len(df)), where=banyak > 0)
+
+
+def _speed_terukur(df, jenis_project, prior):
     """
-    Sistem Alokasi Penjahit Cerdas Berbasis Deadline & Kapasitas Real
+    Speed kategori setelah digabung dengan speed terukur dari assignment selesai
+    (tailor_speed, EWMA): (1-ALPHA)^n * prior + ewma_obs. Tanpa observasi = prior.
     """
-    
-    # ... (BAGIAN SETUP DATA SAMA SEPERTI SEBELUMNYA) ...
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    csv_path = os.path.join(current_dir, 'DATA_FINAL_CLUSTERED.csv')
-    
-    try:
-        df = pd.read_csv(csv_path)
-    except FileNotFoundError:
-        return pd.DataFrame(), "⚠️ Error: File CSV tidak ditemukan!"
-
-    conn = get_connection()
-    df_db = pd.read_sql_query("SELECT name AS Nama, status FROM tailors", conn)
-    conn.close()
-    
-    df = pd.merge(df, df_db, on='Nama', how='left')
-    df['status'] = df['status'].fillna('idle')
-
-    scaler = MinMaxScaler()
-
-    map_kapabilitas = {
-        "Seragam Sekolah": ["Seragam Hem Putih (Pcs/hari)", "Seragam Hem Pramuka (Pcs/hari)"],
-        "Seragam Pramuka": ["Seragam Hem Pramuka (Pcs/hari)", "Celana Pramuka Seragam (Pcs/hari)"],
-        "Rok Seragam": ["Rok Seragam (Pcs/hari)"],
-        "Kemeja/Batik": ["Kemeja Kerja (Pcs/hari)"],
-        "Custom/Gamis/Sulit": ["Custom (Sulit) (Pcs/hari)"]
-    }
-    kolom_kapabilitas = map_kapabilitas.get(jenis_project, [])
-
-    # ... (BAGIAN HITUNG DEADLINE & SKOR SAMA SEPERTI SEBELUMNYA) ...
-    today = date.today()
-    sisa_hari = (tgl_deadline - today).days
-    if sisa_hari <= 0:
-        sisa_hari = 1
-        pesan_waktu = "🔥 DEADLINE HARI INI!"
-    else:
-        pesan_waktu = f"⏳ Sisa Waktu: {sisa_hari} hari."
+    kolom_ewma, kolom_obs = f"EWMA {jenis_project}", f"Obs {jenis_project}"
+    if kolom_ewma not in df or kolom_obs not in df:
+        return prior
+    n_obs = df[kolom_obs].fillna(0).to_numpy(dtype=float)
+    ewma = df[kolom_ewma].fillna(0).to_numpy(dtype=float)
+    return (1 - ALPHA_SPEED) ** n_obs * prior + ewma
 
-    target_speed_per_hari = jumlah_pcs / sisa_hari
 
-    # Hitung Real Speed
-    if kolom_kapabilitas:
-        df['Real_Speed'] = df[kolom_kapabilitas].mean(axis=1).fillna(0)
-    else:
-        df['Real_Speed'] = 0
-
-    if jenis_project == "Custom/Gamis/Sulit":
-        df = df[df['Real_Speed'] > 0].copy()
-
-    df['Sanggup_Kejar_Deadline'] = df['Real_Speed'] >= (target_speed_per_hari * 0.9)
-
-    # Normalisasi & Skor (Sama)
-    df['Selisih_Usia'] = abs(df['Usia'] - 40)
-    df['Skor_Usia'] = 1 - scaler.fit_transform(df[['Selisih_Usia']])
-    df['Jarak_Norm'] = scaler.fit_transform(df[['Jarak Rumah ke Koperasi (Km)']])
-    
-    if jumlah_pcs < 20: df['Skor_Lokasi'] = 1 - df['Jarak_Norm'] 
-    elif jumlah_pcs > 50: df['Skor_Lokasi'] = df['Jarak_Norm'] * 0.5 + 0.5 
-    else: df['Skor_Lokasi'] = 0.5 
-
-    df['Skor_Attitude'] = ((df['Kerapian'] * 30) + (df['Komitmen'] * 25) + (df['Ketepatan Waktu'] * 20))
-    df['Skor_Kapabilitas'] = scaler.fit_transform(df[['Real_Speed']])
-
-    def hitung_match(row):
-        spec = str(row['Spesialis']).lower()
-        proj = jenis_project.lower()
-        if "seragam" in proj and "seragam" in spec: return 1.0
-        elif "semua" in spec: return 0.9
-        elif "rok" in proj and "rok" in spec: return 1.0
-        return 0.3
-    df['Skor_Spesialis'] = df.apply(hitung_match, axis=1)
+def _skor_spesialis(spesialis, jenis_project):
+    """Versi vektor dari aturan cocok spesialis vs jenis project."""
+    spec = pd.Series(spesialis).astype(str).str.lower()
+    proj = jenis_project.lower()
+    is_seragam = spec.str.contains("seragam", regex=False).to_numpy() & ("seragam" in proj)
+    is_semua = spec.str.contains("semua", regex=False).to_numpy()
+    is_rok = spec.str.contains("rok", regex=False).to_numpy() & ("rok" in proj)
+    return np.select([is_seragam, is_semua, is_rok], [1.0, 0.9, 1.0], default=0.3)
+
+
+_KOLOM_STATIS = [
+    ('posisi', np.int64),
+    ('real_speed', np.float64),
+    ('skor_kapabilitas', np.float64),
+    ('skor_usia', np.float64),
+    ('jarak_norm', np.float64),
+    ('skor_attitude', np.float64),
+    ('skor_spesialis', np.float64),
+    ('beban', np.float64),
+    ('penuh', np.bool_),
+]
+
+
+class RosterStatis:
+    """
+    Komponen skor yang TIDAK bergantung order (attitude, usia, jarak ternormalisasi,
+    Real_Speed per kategori, kecocokan spesialis). Dihitung sekali per versi roster
+    dan disimpan sebagai structured array per kategori, sehingga tiap request
+    cukup menggabungkan array ini dengan bagian yang bergantung order.
+
+    `real_speed` di tabel adalah kapasitas SISA (speed kategori dikurangi beban
+    pcs/hari dari assignment terbuka), jadi penjahit yang baru terisi sebagian
+    tetap bisa dapat kerja.
+    """
+
+    def __init__(self, df):
+        self.index = df.index
+        self.nama = df['Nama'].to_numpy()
+        self.status = df['status'].to_numpy(dtype=object)
+        if 'beban_per_hari' in df:
+            self.beban = df['beban_per_hari'].fillna(0).to_numpy(dtype=float)
+        else:
+            self.beban = np.zeros(len(df))
+        # Ditandai 'working' manual tanpa assignment terbuka -> dianggap tidak tersedia
+        self.diblokir = (self.status == 'working') & (self.beban <= 0)
+        self.jarak = df['Jarak Rumah ke Koperasi (Km)'].to_numpy(dtype=float)
+        self._selisih_usia = np.abs(df['Usia'].to_numpy(dtype=float) - 40)
+        self._attitude = (
+            (df['Kerapian'].to_numpy(dtype=float) * 30) +
+            (df['Komitmen'].to_numpy(dtype=float) * 25) +
+            (df['Ketepatan Waktu'].to_numpy(dtype=float) * 20)
+        )
+        self._spesialis = df['Spesialis'].to_numpy()
+        if 'Cluster_ID' in df:
+            self.cluster = df['Cluster_ID'].fillna(-1).to_numpy(dtype=np.int64)
+        else:
+            self.cluster = np.full(len(df), -1, dtype=np.int64)
+        self._indeks = {}
+        self._tabel = {
+            jenis: self._bangun(jenis, _speed_terukur(df, jenis, _rata_rata_speed(df, kolom)))
+            for jenis, kolom in map_kapabilitas.items()
+        }
+
+    def __len__(self):
+        return len(self.nama)
+
+    def _bangun(self, jenis_project, real_speed):
+        posisi = np.arange(len(real_speed))
+        if jenis_project == "Custom/Gamis/Sulit":
+            posisi = posisi[real_speed > 0]
+            real_speed = real_speed[posisi]
+
+        beban = self.beban[posisi]
+        sisa_speed = np.maximum(real_speed - beban, 0)
+
+        tabel = np.empty(len(posisi), dtype=_KOLOM_STATIS)
+        tabel['posisi'] = posisi
+        tabel['real_speed'] = sisa_speed
+        tabel['skor_kapabilitas'] = minmax(sisa_speed)
+        tabel['skor_usia'] = 1 - minmax(self._selisih_usia[posisi])
+        tabel['jarak_norm'] = minmax(self.jarak[posisi])
+        tabel['skor_attitude'] = self._attitude[posisi]
+        tabel['skor_spesialis'] = _skor_spesialis(self._spesialis[posisi], jenis_project)
+        tabel['beban'] = beban
+        tabel['penuh'] = self.diblokir[posisi] | ((beban > 0) & (sisa_speed <= 0))
+        return tabel
+
+    def tabel(self, jenis_project, cluster=None):
+        """
+        Structured array komponen statis untuk satu kategori project.
+        `cluster`: hanya baris penjahit di cluster tersebut (prefilter, skor
+        tetap sama seperti tanpa filter karena normalisasi memakai roster penuh).
+        """
+        if jenis_project not in self._tabel:
+            self._tabel[jenis_project] = self._bangun(jenis_project, np.zeros(len(self)))
+        if cluster is None:
+            return self._tabel[jenis_project]
+        kunci = (jenis_project, tuple(sorted(int(c) for c in cluster)))
+        if kunci not in self._tabel:
+            tabel = self._tabel[jenis_project]
+            self._tabel[kunci] = tabel[np.isin(self.cluster[tabel['posisi']], kunci[1])]
+        return self._tabel[kunci]
+
+    def indeks(self, jenis_project, cluster=None):
+        """IndeksBucket (pemangkasan kandidat) untuk tabel kategori, dibangun sekali per versi roster."""
+        kunci = (jenis_project, None if cluster is None else tuple(sorted(int(c) for c in cluster)))
+        if kunci not in self._indeks:
+            tabel = self.tabel(jenis_project, cluster)
+            self._indeks[kunci] = IndeksBucket(tabel, self.cluster[tabel['posisi']])
+        return self._indeks[kunci]
+
+
+def _sisa_hari(tgl_deadline):
+    """Sisa hari ke deadline (minimal 1 hari)."""
+    sisa_hari = (tgl_deadline - date.today()).days
+    return sisa_hari if sisa_hari > 0 else 1
+
 
+def _pesan(jumlah_pcs, sisa_hari, target_speed_per_hari):
     if target_speed_per_hari > 8:
-        bobot_speed = 40
-        bobot_attitude = 15
         mode_msg = "🚀 Mode: **HIGH SPEED** (Target Tinggi)"
     else:
-        bobot_speed = 15
-        bobot_attitude = 40
         mode_msg = "💎 Mode: **QUALITY FOCUS** (Target Santai)"
+    return f"""
+    {mode_msg}
+    - Target: **{jumlah_pcs} pcs** dalam **{sisa_hari} hari**
+    - Speed Min: **{target_speed_per_hari:.1f} pcs/hari**
+    """
 
-    df['FINAL_SCORE'] = (
-        (df['Skor_Kapabilitas'] * bobot_speed) +
-        (df['Skor_Attitude'] * bobot_attitude) +
-        (df['Skor_Lokasi'] * 15) +
-        (df['Skor_Usia'] * 10) +
-        (df['Skor_Spesialis'] * 20)
+
+def _skor_matriks(statis, tabel, jumlah_pcs, sisa_hari):
+    """
+    Skor untuk banyak order sekaligus dalam satu kategori.
+    `jumlah_pcs` & `sisa_hari` berbentuk (m,). Return (final_score, sanggup) berbentuk (m, n).
+    """
+    jumlah_pcs = np.asarray(jumlah_pcs, dtype=float)[:, None]
+    target_speed_per_hari = jumlah_pcs / np.asarray(sisa_hari, dtype=float)[:, None]
+
+    sanggup = tabel['real_speed'][None, :] >= (target_speed_per_hari * 0.9)
+
+    jarak_norm = tabel['jarak_norm'][None, :]
+    skor_lokasi = np.where(
+        jumlah_pcs < 20, 1 - jarak_norm,
+        np.where(jumlah_pcs > 50, jarak_norm * 0.5 + 0.5, 0.5)
     )
 
-    def penalti_status(row):
-        if row['status'] == 'working': return 10000 
-        return 0
-    
-    def penalti_ketidaksanggupan(row):
-        if not row['Sanggup_Kejar_Deadline']: return 5000 
-        return 0
+    high_speed = target_speed_per_hari > 8
+    bobot_speed = np.where(high_speed, 40, 15)
+    bobot_attitude = np.where(high_speed, 15, 40)
 
-    df['FINAL_SCORE'] = df['FINAL_SCORE'] - df.apply(penalti_status, axis=1)
-    df['FINAL_SCORE'] = df['FINAL_SCORE'] - df.apply(penalti_ketidaksanggupan, axis=1)
+    statis_tetap = (
+        (tabel['skor_usia'] * 10) +
+        (tabel['skor_spesialis'] * 20) -
+        np.where(tabel['penuh'], 10000, 0)
+    )
+    final_score = (
+        (tabel['skor_kapabilitas'][None, :] * bobot_speed) +
+        (tabel['skor_attitude'][None, :] * bobot_attitude) +
+        (skor_lokasi * 15) +
+        statis_tetap[None, :]
+    )
+    final_score -= np.where(sanggup, 0, 5000)
+    return final_score, sanggup
 
-    # --- PERUBAHAN UTAMA DISINI: HAPUS .head(10) ---
-    # Kita kembalikan SEMUA penjahit yang ada agar algoritma tim bisa mencari sampai bawah
-    df_sorted = df.sort_values(by='FINAL_SCORE', ascending=False)
 
-    pesan_final = f"""
-    {mode_msg}
-    - Target: **{jumlah_pcs} pcs** dalam **{sisa_hari} hari**
-    - Speed Min: **{target_speed_per_hari:.1f} pcs/hari**
+def _urutan_teratas(final_score, k=None):
+    """
+    Indeks k skor tertinggi, urut menurun. Hasilnya sama persis dengan k baris
+    pertama argsort stabil (skor sama -> urutan roster), tapi tanpa mengurutkan
+    seluruh roster: argpartition O(n) lalu hanya k kandidat yang diurutkan.
+    """
+    n = len(final_score)
+    if k is None or k >= n:
+        return np.argsort(-final_score, kind='stable')
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+    batas = -np.partition(-final_score, k - 1)[k - 1]
+    lebih = np.flatnonzero(final_score > batas)
+    # Skor yang sama dengan batas: ambil yang paling awal di roster
+    sama = np.flatnonzero(final_score == batas)[:k - len(lebih)]
+    pilihan = np.sort(np.concatenate((lebih, sama)))
+    return pilihan[np.argsort(-final_score[pilihan], kind='stable')]
+
+
+def _bingkai_hasil(statis, tabel, final_score, sanggup, urutan):
+    """DataFrame hasil untuk baris `urutan` (indeks ke tabel kategori)."""
+    baris = tabel['posisi'][urutan]
+    return pd.DataFrame({
+        'Nama': statis.nama[baris],
+        'Status': statis.status[baris],
+        'Sanggup?': sanggup[urutan],
+        'Max Speed (Pcs/Hari)': tabel['real_speed'][urutan],
+        'Beban (Pcs/Hari)': tabel['beban'][urutan],
+        'Tersedia?': ~tabel['penuh'][urutan] & (tabel['real_speed'][urutan] > 0),
+        'Jarak (Km)': statis.jarak[baris],
+        'Attitude': tabel['skor_attitude'][urutan],
+        'FINAL_SCORE': final_score[urutan],
+    }, index=statis.index[baris])
+
+
+def _hasil_terurut(statis, tabel, final_score, sanggup, top_k=None):
+    """DataFrame hasil untuk satu order (baris skor 1 dimensi), opsional hanya top-k."""
+    urutan = _urutan_teratas(final_score, top_k)
+    return _bingkai_hasil(statis, tabel, final_score, sanggup, urutan)
+
+
+def _jumlah_band(n):
+    """Jumlah band speed per kategori: ~akar(n) supaya bucket & isi bucket sama-sama kecil."""
+    return int(np.clip(round(np.sqrt(n) / 2), 1, 256))
+
+
+class IndeksBucket:
+    """
+    Indeks pemangkasan kandidat untuk satu tabel kategori: baris dikelompokkan
+    per (penuh?, band speed, Cluster_ID) dan tiap bucket menyimpan nilai maks/min
+    komponen skornya. Dari situ batas_atas() memberi skor tertinggi yang MUNGKIN
+    dicapai tiap bucket untuk suatu order, jadi bucket yang batasnya di bawah
+    skor ke-k saat ini bisa dilewati tanpa dihitung.
+    """
+
+    def __init__(self, tabel, cluster_baris):
+        n = len(tabel)
+        speed = tabel['real_speed']
+        tepi = np.unique(np.quantile(speed, np.linspace(0, 1, _jumlah_band(n) + 1)[1:-1])) if n else np.array([])
+        band = np.searchsorted(tepi, speed, side='right')
+        cluster = cluster_baris - cluster_baris.min() if n else cluster_baris
+        kunci = (tabel['penuh'].astype(np.int64) * (len(tepi) + 1) + band) * (int(cluster.max(initial=0)) + 1) + cluster
+
+        # Baris tiap bucket berurutan & tetap urut posisi (argsort stabil)
+        self.urutan = np.argsort(kunci, kind='stable')
+        kunci_urut = kunci[self.urutan]
+        self.awal = np.flatnonzero(np.r_[True, kunci_urut[1:] != kunci_urut[:-1]]) if n else np.array([], dtype=np.int64)
+        self.akhir = np.r_[self.awal[1:], n].astype(np.int64)
+        self.bucket_baris = np.empty(n, dtype=np.int64)
+        self.bucket_baris[self.urutan] = np.repeat(np.arange(len(self.awal)), self.akhir - self.awal)
+
+        def maks(nilai):
+            return np.maximum.reduceat(nilai[self.urutan], self.awal) if n else np.array([])
+
+        def minim(nilai):
+            return np.minimum.reduceat(nilai[self.urutan], self.awal) if n else np.array([])
+
+        self.maks_kapabilitas = maks(tabel['skor_kapabilitas'])
+        self.maks_attitude = maks(tabel['skor_attitude'])
+        self.maks_tetap = maks(tabel['skor_usia'] * 10 + tabel['skor_spesialis'] * 20)
+        self.min_jarak = minim(tabel['jarak_norm'])
+        self.maks_jarak = maks(tabel['jarak_norm'])
+        self.maks_speed = maks(speed)
+        self.penuh = tabel['penuh'][self.urutan][self.awal] if n else np.array([], dtype=bool)
+
+    def __len__(self):
+        return len(self.awal)
+
+    def baris(self, b):
+        """Indeks baris tabel (urut posisi) di bucket b."""
+        return self.urutan[self.awal[b]:self.akhir[b]]
+
+    def batas_atas(self, jumlah_pcs, sisa_hari):
+        """Skor maksimum yang mungkin per bucket untuk satu order (rumus sama dengan _skor_matriks)."""
+        target = jumlah_pcs / sisa_hari
+        bobot_speed, bobot_attitude = (40, 15) if target > 8 else (15, 40)
+        if jumlah_pcs < 20:
+            lokasi = 1 - self.min_jarak
+        elif jumlah_pcs > 50:
+            lokasi = self.maks_jarak * 0.5 + 0.5
+        else:
+            lokasi = np.full(len(self), 0.5)
+        batas = (self.maks_kapabilitas * bobot_speed + self.maks_attitude * bobot_attitude +
+                 lokasi * 15 + self.maks_tetap - np.where(self.penuh, 10000, 0) -
+                 np.where(self.maks_speed >= target * 0.9, 0, 5000))
+        # Toleransi pembulatan: urutan penjumlahan beda dengan skor asli
+        return batas + 1e-6
+
+
+class _PenilaiMalas:
+    """
+    Skor satu order yang dihitung per bucket sesuai kebutuhan. Bucket dinilai
+    dari batas atas tertinggi; berhenti kalau batas bucket berikutnya sudah di
+    bawah skor ke-k (baris yang belum dinilai tidak mungkin masuk top-k, jadi
+    hasil tetap exact). Kalau yang diminta hampir semua baris, semua dinilai
+    sekaligus dalam satu operasi vektor.
+
+    Satu penilai bisa dipakai bersama beberapa sesi (lewat CacheHasil), jadi
+    penilaian dijaga lock; skor yang sudah dihitung tidak pernah berubah.
+    """
+
+    def __init__(self, statis, tabel, indeks, jumlah_pcs, sisa_hari):
+        n = len(tabel)
+        self.statis = statis
+        self.tabel = tabel
+        self.indeks = indeks
+        self.jumlah_pcs = jumlah_pcs
+        self.sisa_hari = sisa_hari
+        # Hanya baris yang sudah dinilai yang pernah dibaca, jadi tidak perlu diisi
+        self.final = np.empty(n)
+        self.sanggup = np.empty(n, dtype=bool)
+        self._dinilai = np.zeros(len(indeks), dtype=bool)
+        self._semua = n == 0
+        self._baris_dinilai = []
+        self._baris_cache = None
+        self._batas = indeks.batas_atas(jumlah_pcs, sisa_hari)
+        self._urut_bucket = np.argsort(-self._batas, kind='stable')
+        self._lock = threading.RLock()
+
+    @property
+    def nbytes(self):
+        """Perkiraan memori milik penilai ini (tabel & indeks milik RosterStatis)."""
+        # final + sanggup + daftar baris dinilai (paling banyak satu int64 per baris)
+        return self.final.nbytes + self.sanggup.nbytes + 8 * len(self.tabel) + self._batas.nbytes * 3
+
+    def _nilai(self, baris):
+        with tahap("skor vektor", len(baris)):
+            final, sanggup = _skor_matriks(self.statis, self.tabel[baris], [self.jumlah_pcs], [self.sisa_hari])
+        self.final[baris] = final[0]
+        self.sanggup[baris] = sanggup[0]
+
+    def nilai_semua(self):
+        with self._lock:
+            self._nilai_semua()
+
+    def _nilai_semua(self):
+        if self._semua:
+            return
+        if not self._dinilai.any():
+            # Belum ada yang dinilai: satu operasi vektor atas seluruh tabel tanpa salin
+            with tahap("skor vektor", len(self.tabel)):
+                final, sanggup = _skor_matriks(self.statis, self.tabel, [self.jumlah_pcs], [self.sisa_hari])
+            self.final, self.sanggup = final[0], sanggup[0]
+        else:
+            self._nilai(np.flatnonzero(~self._dinilai[self.indeks.bucket_baris]))
+        self._dinilai[:] = True
+        self._semua = True
+        self._baris_cache = None
+
+    def baris_dinilai(self):
+        """Baris yang sudah punya skor, urut posisi tabel."""
+        with self._lock:
+            if self._semua:
+                return np.arange(len(self.tabel))
+            if self._baris_cache is None:
+                self._baris_cache = np.sort(np.concatenate(self._baris_dinilai)) if self._baris_dinilai \
+                    else np.array([], dtype=np.int64)
+            return self._baris_cache
+
+    def pastikan(self, k, di_view=None, n_view=None):
+        """Pastikan k skor tertinggi (di view `di_view`, bool per baris) sudah dinilai."""
+        with self._lock:
+            self._pastikan(k, di_view, n_view)
+
+    def _pastikan(self, k, di_view, n_view):
+        if self._semua:
+            return
+        n_view = len(self.tabel) if n_view is None else n_view
+        if k * 4 >= n_view:
+            self._nilai_semua()
+            return
+
+        baris = self.baris_dinilai()
+        if di_view is not None:
+            baris = baris[di_view[baris]]
+        terbaik = np.sort(self.final[baris])[-k:]
+        bucket_relevan = None if di_view is None else np.bincount(
+            self.indeks.bucket_baris[di_view], minlength=len(self.indeks)) > 0
+        with tahap("pangkas bucket") as t:
+            dinilai = 0
+            for b in self._urut_bucket:
+                if self._dinilai[b] or (bucket_relevan is not None and not bucket_relevan[b]):
+                    continue
+                if len(terbaik) >= k and self._batas[b] < terbaik[0]:
+                    break
+                baris_b = self.indeks.baris(b)
+                self._nilai(baris_b)
+                self._dinilai[b] = True
+                self._baris_dinilai.append(baris_b)
+                self._baris_cache = None
+                dinilai += 1
+                baru = self.final[baris_b if di_view is None else baris_b[di_view[baris_b]]]
+                terbaik = np.sort(np.concatenate((terbaik, baru)))[-k:]
+            t["baris"] = dinilai
+        if self._dinilai.all():
+            self._semua = True
+
+
+class HasilRekomendasi:
+    """
+    Hasil skor satu order yang diurutkan secara malas: hanya array skor per
+    penjahit yang disimpan (komponen roster dipakai bersama lewat RosterStatis),
+    skor dihitung per bucket lewat IndeksBucket, dan DataFrame dibuat untuk
+    baris yang diminta saja.
+
+    - teratas(k): k kandidat terbaik (bucket yang tidak mungkin masuk dilewati)
+    - berikutnya(k): k kandidat setelah yang terakhir diambil ("next k")
+    - tersedia(): tampilan yang hanya berisi penjahit yang masih punya kapasitas
+    """
+
+    def __init__(self, penilai, pesan, pilihan=None):
+        self.statis = penilai.statis
+        self.pesan = pesan
+        self._penilai = penilai
+        self._tabel = penilai.tabel
+        # pilihan: indeks ke tabel kategori yang termasuk tampilan ini (None = semua)
+        self._pilihan = pilihan
+        self._di_view = None
+        if pilihan is not None:
+            self._di_view = np.zeros(len(self._tabel), dtype=bool)
+            self._di_view[pilihan] = True
+        self._urutan = np.array([], dtype=np.int64)
+        self._kursor = 0
+
+    def __len__(self):
+        return len(self._tabel) if self._pilihan is None else len(self._pilihan)
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    @property
+    def speed(self):
+        """Sisa speed tiap kandidat di tampilan ini (urutan roster, bukan skor)."""
+        speed = self._tabel['real_speed']
+        return speed if self._pilihan is None else speed[self._pilihan]
+
+    def _pastikan(self, k):
+        """Pastikan minimal k peringkat teratas sudah diketahui urutannya (indeks ke tabel)."""
+        k = min(k, len(self))
+        if k > len(self._urutan):
+            # Tumbuh dua kali lipat supaya pengambilan "next k" beruntun tetap murah
+            tumbuh = min(len(self), max(k, 2 * len(self._urutan)))
+            with tahap(f"urut top-{tumbuh}", len(self)):
+                self._penilai.pastikan(tumbuh, self._di_view, len(self))
+                baris = self._penilai.baris_dinilai()
+                if self._di_view is not None:
+                    baris = baris[self._di_view[baris]]
+                self._urutan = baris[_urutan_teratas(self._penilai.final[baris], tumbuh)]
+        return self._urutan[:k]
+
+    def peringkat(self, mulai, selesai):
+        """DataFrame peringkat [mulai, selesai) urut FINAL_SCORE menurun."""
+        urutan = self._pastikan(selesai)[mulai:]
+        with tahap("bangun DataFrame hasil", len(urutan)):
+            return _bingkai_hasil(self.statis, self._tabel, self._penilai.final, self._penilai.sanggup, urutan)
+
+    def teratas(self, k):
+        return self.peringkat(0, k)
+
+    def berikutnya(self, k):
+        """k kandidat berikutnya setelah pengambilan sebelumnya (kosong kalau habis)."""
+        df = self.peringkat(self._kursor, self._kursor + k)
+        self._kursor += len(df)
+        return df
+
+    def speed_maks_setelah(self, k):
+        """Speed terbesar di antara kandidat di luar k peringkat teratas."""
+        if k >= len(self):
+            return 0.0
+        speed = self._tabel['real_speed'].copy()
+        if self._di_view is not None:
+            speed[~self._di_view] = -np.inf
+        speed[self._pastikan(k)] = -np.inf
+        return float(speed.max())
+
+    def tersedia(self):
+        """Tampilan baru yang hanya berisi penjahit yang masih punya sisa kapasitas."""
+        tabel = self._tabel
+        mask = ~tabel['penuh'] & (tabel['real_speed'] > 0)
+        if self._pilihan is not None:
+            pilihan = self._pilihan[mask[self._pilihan]]
+        else:
+            pilihan = np.flatnonzero(mask)
+        return HasilRekomendasi(self._penilai, self.pesan, pilihan)
+
+
+def skor_dari_statis(statis, jenis_project, jumlah_pcs, tgl_deadline, top_k=None):
+    """
+    Gabungkan komponen statis dengan bagian yang bergantung order
+    (target speed vs deadline, bobot speed/attitude, skor lokasi, penalti).
+    Return: (DataFrame terurut berdasarkan FINAL_SCORE, pesan)
+    """
+    hasil = hasil_dari_statis(statis, jenis_project, jumlah_pcs, tgl_deadline)
+    return hasil.teratas(len(hasil) if top_k is None else top_k), hasil.pesan
+
+
+def hasil_dari_statis(statis, jenis_project, jumlah_pcs, tgl_deadline, cluster=None):
+    """
+    Seperti skor_dari_statis tapi mengembalikan HasilRekomendasi (belum diurutkan).
+    `cluster`: list Cluster_ID; hanya penjahit di cluster itu yang diskor.
+    """
+    return HasilRekomendasi(*penilai_dari_statis(statis, jenis_project, jumlah_pcs, tgl_deadline, cluster))
+
+
+def penilai_dari_statis(statis, jenis_project, jumlah_pcs, tgl_deadline, cluster=None):
+    """(_PenilaiMalas, pesan) untuk satu order; bisa dibungkus beberapa HasilRekomendasi."""
+    tabel = statis.tabel(jenis_project, cluster)
+    sisa_hari = _sisa_hari(tgl_deadline)
+    penilai = _PenilaiMalas(statis, tabel, statis.indeks(jenis_project, cluster), jumlah_pcs, sisa_hari)
+    return penilai, _pesan(jumlah_pcs, sisa_hari, jumlah_pcs / sisa_hari)
+
+
+# Batas elemen matriks order x penjahit per potongan (menjaga memori tetap kecil)
+BATCH_MAKS_ELEMEN = 2_000_000
+
+
+def skor_batch_dari_statis(statis, orders, top_k=None):
+    """
+    Versi batch dari skor_dari_statis. `orders` adalah DataFrame dengan kolom
+    jenis_project, jumlah_pcs, tgl_deadline. Order dengan kategori sama dihitung
+    bersama sebagai satu matriks (order x penjahit).
+    Return: list (DataFrame terurut, pesan) dengan urutan sama seperti `orders`.
+    `top_k` membatasi tiap DataFrame ke k kandidat teratas.
+    """
+    hasil = [None] * len(orders)
+    jenis_arr = orders['jenis_project'].to_numpy()
+    pcs_arr = orders['jumlah_pcs'].to_numpy()
+    sisa_arr = np.array([_sisa_hari(d) for d in orders['tgl_deadline']], dtype=int)
+
+    for jenis in pd.unique(jenis_arr):
+        tabel = statis.tabel(jenis)
+        idx = np.flatnonzero(jenis_arr == jenis)
+        potong = max(1, BATCH_MAKS_ELEMEN // max(1, len(tabel)))
+        for mulai in range(0, len(idx), potong):
+            bagian = idx[mulai:mulai + potong]
+            final_score, sanggup = _skor_matriks(statis, tabel, pcs_arr[bagian], sisa_arr[bagian])
+            for baris, i in enumerate(bagian):
+                df_sorted = _hasil_terurut(statis, tabel, final_score[baris], sanggup[baris], top_k)
+                hasil[i] = (df_sorted, _pesan(pcs_arr[i], sisa_arr[i], pcs_arr[i] / sisa_arr[i]))
+    return hasil
+
+
+def hitung_skor(df, jenis_project, jumlah_pcs, tgl_deadline):
+    """
+    Mesin skor kolumnar: semua komponen skor dihitung sebagai operasi array
+    NumPy atas seluruh roster sekaligus (tanpa df.apply per baris).
+
+    `df` adalah roster dengan kolom seperti QUERY_ROSTER (kolom CSV + status DB).
+    Return: (DataFrame terurut berdasarkan FINAL_SCORE, pesan)
+    """
+    return skor_dari_statis(RosterStatis(df), jenis_project, jumlah_pcs, tgl_deadline)
+
+
+def bagi_tugas(speeds, total_pcs, maks_per_orang):
+    """
+    Bagi `total_pcs` ke anggota tim secara proporsional terhadap speed,
+    dengan batas `maks_per_orang` per orang (capped water-filling).
+
+    Hasilnya identik dengan loop lama "+1 per putaran": jatah ideal dibulatkan
+    ke bawah, lalu sisa pcs dibagi satu per satu berputar mulai dari yang
+    tercepat, melewati orang yang sudah mentok batas. Di sini jumlah putaran
+    penuh dicari dengan binary search, jadi O(n log n) berapapun jumlah pcs.
+    Kalau total batas < total_pcs, sisanya memang tidak terbagi.
+    """
+    speeds = np.asarray(speeds, dtype=float)
+    n = len(speeds)
+    if n == 0:
+        return []
+
+    total_speed = speeds.sum()
+    porsi = speeds / total_speed if total_speed > 0 else np.full(n, 1 / n)
+    alokasi = np.floor(np.minimum(porsi * total_pcs, maks_per_orang)).astype(np.int64)
+
+    sisa = int(total_pcs - alokasi.sum())
+    if sisa <= 0:
+        return alokasi.tolist()
+
+    # Ruang tersisa per orang sampai batas
+    ruang = np.maximum(np.ceil(maks_per_orang - alokasi), 0).astype(np.int64)
+    if sisa >= ruang.sum():
+        return (alokasi + ruang).tolist()
+
+    # Cari t = jumlah putaran penuh terbesar dengan sum(min(ruang, t)) <= sisa
+    ruang_urut = np.sort(ruang)
+    kumulatif = np.concatenate(([0], np.cumsum(ruang_urut)))
+
+    def terpakai(t):
+        k = np.searchsorted(ruang_urut, t, side='right')
+        return kumulatif[k] + t * (n - k)
+
+    lo, hi = 0, int(ruang_urut[-1])
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if terpakai(mid) <= sisa:
+            lo = mid
+        else:
+            hi = mid - 1
+    t = lo
+
+    alokasi += np.minimum(ruang, t)
+    sisa -= int(terpakai(t))
+
+    # Putaran terakhir (tidak penuh): urut speed tertinggi dulu
+    urutan = np.argsort(-speeds, kind='stable')
+    masih_ada_ruang = urutan[ruang[urutan] > t]
+    alokasi[masih_ada_ruang[:sisa]] += 1
+    return alokasi.tolist()
+
+
+# Nilai atribut (Kerapian/Komitmen/Ketepatan Waktu, skala 0-1) untuk penjahit
+# yang belum punya baris tailor_attributes: di tengah, tidak diuntungkan/dirugikan
+ATRIBUT_NETRAL = 0.5
+
+
+def _query_roster():
+    """
+    Satu query roster: SEMUA tailors + atribut + kapabilitas (di-pivot ke kolom
+    speed seperti CSV) + speed terukur per kategori dari tailor_speed + beban
+    pcs/hari untuk :hari (QUERY_BEBAN_PER_HARI). Semua join lewat tailor_id.
+
+    Penjahit tanpa atribut memakai ATRIBUT_NETRAL & tanpa cluster (-1); tanpa
+    kapabilitas sama sekali memakai speed_clothes_per_day untuk semua jenis
+    kecuali Custom (belum terbukti sanggup).
+    """
+    kolom_speed = ",\n        ".join(
+        f"MAX(CASE WHEN c.clothes_type = '{jenis}' THEN c.pcs_per_day END) AS \"{kolom}\""
+        if jenis == "custom" else
+        f"CASE WHEN COUNT(c.tailor_id) = 0 THEN t.speed_clothes_per_day "
+        f"ELSE MAX(CASE WHEN c.clothes_type = '{jenis}' THEN c.pcs_per_day END) END AS \"{kolom}\""
+        for kolom, jenis in KAPABILITAS_CSV.items()
+    )
+    kolom_terukur = ",\n        ".join(
+        f"(SELECT s.{isi} FROM tailor_speed s WHERE s.tailor_id = t.id AND s.clothes_type = '{clothes_type}') "
+        f"AS \"{nama} {kategori}\""
+        for clothes_type, kategori in map_clothes_type.items()
+        for isi, nama in (("ewma_obs", "EWMA"), ("n_obs", "Obs"))
+    )
+    return f"""
+    SELECT
+        t.id AS tailor_id,
+        TRIM(t.name) AS "Nama",
+        t.age AS "Usia",
+        t.distance_km AS "Jarak Rumah ke Koperasi (Km)",
+        t.specialty AS "Spesialis",
+        COALESCE(t.status, 'idle') AS status,
+        COALESCE(a.kerapian, {ATRIBUT_NETRAL}) AS "Kerapian",
+        COALESCE(a.komitmen, {ATRIBUT_NETRAL}) AS "Komitmen",
+        COALESCE(a.ketepatan_waktu, {ATRIBUT_NETRAL}) AS "Ketepatan Waktu",
+        a.cluster_id AS "Cluster_ID",
+        {kolom_speed},
+        {kolom_terukur},
+        COALESCE(MAX(b.beban_per_hari), 0.0) AS beban_per_hari
+    FROM tailors t
+    LEFT JOIN tailor_attributes a ON a.tailor_id = t.id
+    LEFT JOIN tailor_capabilities c ON c.tailor_id = t.id
+    LEFT JOIN ({QUERY_BEBAN_PER_HARI}) b ON b.tailor_id = t.id
+    GROUP BY t.id
+    ORDER BY t.id
+    """
+
+
+QUERY_ROSTER = _query_roster()
+
+
+class _ProfilStore:
+    """
+    Cache roster penjahit per proses, dibaca dari DB dengan satu query
+    (QUERY_ROSTER) tanpa parse CSV dan tanpa join nama.
+
+    Roster hanya dibaca ulang kalau `PRAGMA data_version` berubah (ada commit
+    dari koneksi lain) atau ganti hari (beban per hari ikut berubah), dan
+    komponen statis hanya dihitung ulang kalau isinya benar-benar beda.
+    Hanya membaca: import CSV kapabilitas adalah aksi admin (import_capabilities.py
+    atau tombol di halaman Tailors), bukan efek samping membaca rekomendasi.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conn = None
+        self._data_version = None
+        self._hari = None
+        self._roster = None
+        self._statis = None
+        # Naik tiap kali RosterStatis dibangun ulang; bagian dari kunci CacheHasil
+        self.versi = 0
+
+    def _koneksi(self):
+        # Koneksi khusus: data_version hanya berubah untuk commit dari koneksi LAIN
+        if self._conn is None:
+            pool()  # skema dimigrasi sekali per proses di sini
+            self._conn = buka_koneksi()
+        return self._conn
+
+    def roster(self):
+        """Roster dari DB (read-only, jangan diubah in-place)."""
+        with self._lock:
+            with tahap("cek versi DB"):
+                conn = self._koneksi()
+                versi = conn.execute("PRAGMA data_version").fetchone()[0]
+            hari = date.today()
+            if versi == self._data_version and hari == self._hari and self._roster is not None:
+                return self._roster
+            self._data_version = versi
+            self._hari = hari
+
+            with tahap("baca roster (SQL)") as t:
+                df = pd.read_sql_query(QUERY_ROSTER, conn, params={"hari": hari.isoformat()})
+                t["baris"] = len(df)
+            if self._roster is None or not df.equals(self._roster):
+                self._roster = df
+                self._statis = None
+            return self._roster
+
+    def snapshot(self):
+        """Pasangan (roster, RosterStatis) dari versi roster yang sama."""
+        return self.snapshot_berversi()[1:]
+
+    def snapshot_berversi(self):
+        """(versi, roster, RosterStatis) yang dibaca bersamaan."""
+        roster = self.roster()
+        with self._lock:
+            if self._statis is None or self._statis[0] is not roster:
+                with tahap("komponen statis (scaling)", len(roster)):
+                    self._statis = (roster, RosterStatis(roster))
+                self.versi += 1
+            return (self.versi,) + self._statis
+
+    def statis(self):
+        """Komponen skor statis untuk versi roster saat ini."""
+        return self.snapshot()[1]
+
+    def reset(self):
+        """Buang semua cache (mis. setelah ganti file DB)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+            self._data_version = self._hari = None
+            self._roster = None
+            self._statis = None
+            self.versi += 1
+
+
+class CacheHasil:
     """
+    Cache hasil skor bersama untuk semua sesi di proses ini (LRU).
 
-    rename_dict = {
-        'Real_Speed': 'Max Speed (Pcs/Hari)',
-        'Jarak Rumah ke Koperasi (Km)': 'Jarak (Km)',
-        'status': 'Status',
-        'Sanggup_Kejar_Deadline': 'Sanggup?'
-    }
-    
-    cols = ['Nama', 'status', 'Sanggup_Kejar_Deadline', 'Real_Speed', 'Jarak Rumah ke Koperasi (Km)', 'FINAL_SCORE']
-    
-    return df_sorted[cols].rename(columns=rename_dict), pesan_final
\ No newline at end of file
+    Kunci: (versi roster, hari ini, jenis, pcs, deadline, cluster). Versi roster
+    sudah mencakup perubahan penjahit & assignment (beban), jadi entri lama
+    tidak pernah terpakai lagi dan langsung dibuang saat versi naik. Yang
+    disimpan hanya penilai (array skor); tiap sesi membungkusnya dengan
+    HasilRekomendasi sendiri, jadi sesi memegang referensi, bukan salinan.
+    Entri terlama dibuang kalau total memori melewati `maks_mb` atau jumlah
+    entri melewati `maks_entri`.
+    """
+
+    def __init__(self, maks_mb=64, maks_entri=256):
+        self.maks_bytes = int(maks_mb * 2**20)
+        self.maks_entri = maks_entri
+        self._lock = threading.Lock()
+        self._entri = OrderedDict()
+        self._bytes = 0
+        self._versi = None
+        self.hit = self.miss = self.dibuang = 0
+
+    def _buang_terlama(self):
+        _, (penilai, _) = self._entri.popitem(last=False)
+        self._bytes -= penilai.nbytes
+        self.dibuang += 1
+
+    def ambil(self, versi, statis, jenis_project, jumlah_pcs, tgl_deadline, cluster=None):
+        """(penilai, pesan) dari cache, atau dihitung & disimpan kalau belum ada."""
+        kunci = (date.today(), jenis_project, int(jumlah_pcs), tgl_deadline,
+                 None if cluster is None else tuple(sorted(cluster)))
+        with self._lock:
+            if self._versi is None or versi > self._versi:
+                self._entri.clear()
+                self._bytes = 0
+                self._versi = versi
+            entri = self._entri.get(kunci) if versi == self._versi else None
+            if entri is not None:
+                self._entri.move_to_end(kunci)
+                self.hit += 1
+                return entri
+            self.miss += 1
+
+        # Hitung di luar lock supaya sesi lain tidak menunggu
+        with tahap("cache hasil: hitung baru"):
+            entri = penilai_dari_statis(statis, jenis_project, jumlah_pcs, tgl_deadline, cluster)
+        ukuran = entri[0].nbytes
+        with self._lock:
+            if versi != self._versi or ukuran > self.maks_bytes:
+                return entri
+            if kunci not in self._entri:
+                self._entri[kunci] = entri
+                self._bytes += ukuran
+                while self._bytes > self.maks_bytes or len(self._entri) > self.maks_entri:
+                    self._buang_terlama()
+            return self._entri[kunci]
+
+    def statistik(self):
+        with self._lock:
+            return {"entri": len(self._entri), "mb": self._bytes / 2**20, "hit": self.hit,
+                    "miss": self.miss, "dibuang": self.dibuang}
+
+    def kosongkan(self):
+        with self._lock:
+            self._entri.clear()
+            self._bytes = 0
+
+
+_store = _ProfilStore()
+_cache_hasil = CacheHasil(maks_mb=float(os.environ.get("KOPERASI_CACHE_HASIL_MB", 64)))
+
+
+def snapshot_roster():
+    """(roster, RosterStatis) versi terbaru dari cache proses (read-only)."""
+    return _store.snapshot()
+
+
+def kapasitas_tersedia(jenis_project):
+    """
+    Penjahit yang masih punya sisa kapasitas untuk satu kategori project, sama
+    seperti yang dipakai Smart Allocation (speed kapabilitas/EWMA dikurangi beban).
+    Return: DataFrame (tailor_id, Nama, sisa, beban) urut sisa terbesar dulu.
+    """
+    roster, statis = snapshot_roster()
+    tabel = statis.tabel(jenis_project)
+    tabel = tabel[~tabel['penuh'] & (tabel['real_speed'] > 0)]
+    df = pd.DataFrame({
+        'tailor_id': roster['tailor_id'].to_numpy()[tabel['posisi']],
+        'Nama': statis.nama[tabel['posisi']],
+        'sisa': tabel['real_speed'],
+        'beban': tabel['beban'],
+    })
+    return df.sort_values('sisa', ascending=False, kind='stable', ignore_index=True)
+
+
+def hitung_rekomendasi(jenis_project, jumlah_pcs, tgl_deadline, top_k=None):
+    """
+    Sistem Alokasi Penjahit Cerdas Berbasis Deadline & Kapasitas Real
+    `top_k`: hanya kembalikan k kandidat teratas (tanpa sort seluruh roster).
+    """
+    statis = _store.statis()
+
+    # Default: kembalikan SEMUA penjahit agar algoritma tim bisa mencari sampai bawah
+    return skor_dari_statis(statis, jenis_project, jumlah_pcs, tgl_deadline, top_k)
+
+
+def cari_rekomendasi(jenis_project, jumlah_pcs, tgl_deadline, cluster=None):
+    """
+    Versi malas hitung_rekomendasi untuk halaman: Return (HasilRekomendasi, pesan).
+    Peringkat diambil sebagian-sebagian (teratas / berikutnya) sesuai kebutuhan.
+    `cluster`: prefilter Cluster_ID (None = semua penjahit).
+    """
+    versi, _, statis = _store.snapshot_berversi()
+
+    # Penilai dipakai bersama antar sesi; pembungkusnya (kursor, urutan) per sesi
+    penilai, pesan = _cache_hasil.ambil(versi, statis, jenis_project, jumlah_pcs, tgl_deadline, cluster)
+    return HasilRekomendasi(penilai, pesan), pesan
+
+
+def statistik_cache_hasil():
+    """Jumlah entri, memori (MB), hit/miss, dan entri yang dibuang dari cache hasil bersama."""
+    return _cache_hasil.statistik()
+
+
+def _normalisasi_orders(orders):
+    """Terima list of dict / list of tuple / DataFrame, jadikan DataFrame order standar."""
+    if isinstance(orders, pd.DataFrame):
+        df = orders.copy()
+    elif orders and not isinstance(orders[0], dict):
+        df = pd.DataFrame(list(orders), columns=['jenis_project', 'jumlah_pcs', 'tgl_deadline'])
+    else:
+        df = pd.DataFrame(list(orders))
+
+    kurang = {'jenis_project', 'jumlah_pcs', 'tgl_deadline'} - set(df.columns)
+    if kurang:
+        raise ValueError(f"Kolom order kurang: {', '.join(sorted(kurang))}")
+    df = df.reset_index(drop=True)
+    df['jumlah_pcs'] = df['jumlah_pcs'].astype(int)
+    df['tgl_deadline'] = pd.to_datetime(df['tgl_deadline']).dt.date
+    return df
+
+
+def hitung_rekomendasi_batch(orders, top_k=None):
+    """
+    Hitung rekomendasi untuk banyak order sekaligus.
+    `orders`: DataFrame / list of dict (jenis_project, jumlah_pcs, tgl_deadline)
+    atau list of tuple dengan urutan yang sama.
+    Return: list (df_hasil, pesan) sesuai urutan order, sama seperti hitung_rekomendasi.
+    """
+    df_orders = _normalisasi_orders(orders)
+    statis = _store.statis()
+
+    return skor_batch_dari_statis(statis, df_orders, top_k)
+
+
+# Rentang default sapuan deadline (hari dari hari ini)
+SAPU_HARI_MAKS = 90
+
+
+def sapu_dari_statis(statis, jenis_project, jumlah_pcs, hari_maks=SAPU_HARI_MAKS, maks_per_orang=None):
+    """
+    Sensitivitas deadline: untuk setiap deadline hari ini .. +hari_maks hitung
+    tim terkecil (penjahit tersedia tercepat) yang mengejar target, sekaligus.
+    Speed diurutkan sekali; tiap deadline cukup satu searchsorted di cumsum.
+    """
+    tabel = statis.tabel(jenis_project)
+    tersedia = ~tabel['penuh'] & (tabel['real_speed'] > 0)
+    kum_speed = np.cumsum(np.sort(tabel['real_speed'][tersedia])[::-1])
+    n = len(kum_speed)
+
+    offset = np.arange(hari_maks + 1)
+    sisa_hari = np.maximum(offset, 1)
+    target = jumlah_pcs / sisa_hari
+
+    # Tim terkecil: k speed tercepat pertama yang jumlahnya >= target
+    k = np.searchsorted(kum_speed, target - 1e-9) + 1
+    if maks_per_orang:
+        k = np.maximum(k, -(-jumlah_pcs // max(1, int(maks_per_orang))))
+    terkejar = k <= n
+    k = np.minimum(k, n)
+    kapasitas = kum_speed[k - 1] if n else np.zeros(len(k))
+    estimasi = np.divide(jumlah_pcs, kapasitas, out=np.full(len(k), np.nan), where=kapasitas > 0)
+
+    return pd.DataFrame({
+        'Deadline': [date.today() + timedelta(days=int(h)) for h in offset],
+        'Sisa Hari': sisa_hari,
+        'Target (Pcs/Hari)': target,
+        'Min Penjahit': np.where(terkejar, k, np.nan) if n else np.full(len(k), np.nan),
+        'Kapasitas Tim (Pcs/Hari)': kapasitas,
+        'Estimasi Selesai (Hari)': estimasi,
+        'Terkejar?': terkejar if n else np.zeros(len(k), dtype=bool),
+    })
+
+
+def sapu_deadline(jenis_project, jumlah_pcs, hari_maks=SAPU_HARI_MAKS, maks_per_orang=None):
+    """
+    Kurva deadline vs tim minimum untuk satu order (pakai roster cache proses).
+    Baris pertama dengan Terkejar? = True adalah deadline paling cepat yang aman.
+    """
+    statis = _store.statis()
+    return sapu_dari_statis(statis, jenis_project, jumlah_pcs, hari_maks, maks_per_orang)
@@ -0,0 +1,123 @@
+# benchmark_allocation.py (Script untuk mengukur kecepatan mesin skor alokasi)
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+
+from allocation import RosterStatis, hitung_skor, map_kapabilitas, skor_dari_statis
+
+KOLOM_SPEED = [
+    "Seragam Hem Putih (Pcs/hari)",
+    "Seragam Hem Pramuka (Pcs/hari)",
+    "Rok Seragam (Pcs/hari)",
+    "Celana Pramuka Seragam (Pcs/hari)",
+    "Kemeja Kerja (Pcs/hari)",
+    "Custom (Sulit) (Pcs/hari)",
+]
+
+
+def buat_roster_sintetis(n, seed=0):
+    """Roster acak dengan kolom yang sama seperti DATA_FINAL_CLUSTERED.csv + status DB."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Nama": [f"Penjahit {i}" for i in range(n)],
+        "Jarak Rumah ke Koperasi (Km)": rng.uniform(0.5, 20, n).round(1),
+        "Usia": rng.integers(20, 70, n),
+        "Kerapian": rng.integers(0, 2, n),
+        "Ketepatan Waktu": rng.integers(0, 2, n),
+        "Komitmen": rng.integers(0, 2, n),
+        "Spesialis": rng.choice(["Seragam", "Semua", "Hanya bisa mengerjakan rok, atasan dan celana"], n),
+    })
+    for kolom in KOLOM_SPEED:
+        df[kolom] = rng.integers(0, 30, n)
+    df["status"] = rng.choice(["idle", "working"], n, p=[0.8, 0.2])
+    return df
+
+
+def hitung_skor_lama(df, jenis_project, jumlah_pcs, tgl_deadline):
+    """Referensi: implementasi lama (df.apply per baris) untuk pembanding."""
+    try:
+        from sklearn.preprocessing import MinMaxScaler
+        scaler = MinMaxScaler()
+        fit = scaler.fit_transform
+    except ImportError:
+        fit = lambda x: ((x - x.min()) / ((x.max() - x.min()) or 1)).to_numpy()
+
+    df = df.copy()
+    kolom_kapabilitas = map_kapabilitas.get(jenis_project, [])
+    sisa_hari = max(1, (tgl_deadline - date.today()).days)
+    target_speed_per_hari = jumlah_pcs / sisa_hari
+
+    df['Real_Speed'] = df[kolom_kapabilitas].mean(axis=1).fillna(0)
+    if jenis_project == "Custom/Gamis/Sulit":
+        df = df[df['Real_Speed'] > 0].copy()
+    df['Sanggup_Kejar_Deadline'] = df['Real_Speed'] >= (target_speed_per_hari * 0.9)
+
+    df['Selisih_Usia'] = abs(df['Usia'] - 40)
+    df['Skor_Usia'] = 1 - fit(df[['Selisih_Usia']])
+    df['Jarak_Norm'] = fit(df[['Jarak Rumah ke Koperasi (Km)']])
+    if jumlah_pcs < 20: df['Skor_Lokasi'] = 1 - df['Jarak_Norm']
+    elif jumlah_pcs > 50: df['Skor_Lokasi'] = df['Jarak_Norm'] * 0.5 + 0.5
+    else: df['Skor_Lokasi'] = 0.5
+    df['Skor_Attitude'] = ((df['Kerapian'] * 30) + (df['Komitmen'] * 25) + (df['Ketepatan Waktu'] * 20))
+    df['Skor_Kapabilitas'] = fit(df[['Real_Speed']])
+
+    def hitung_match(row):
+        spec = str(row['Spesialis']).lower()
+        proj = jenis_project.lower()
+        if "seragam" in proj and "seragam" in spec: return 1.0
+        elif "semua" in spec: return 0.9
+        elif "rok" in proj and "rok" in spec: return 1.0
+        return 0.3
+    df['Skor_Spesialis'] = df.apply(hitung_match, axis=1)
+
+    bobot_speed, bobot_attitude = (40, 15) if target_speed_per_hari > 8 else (15, 40)
+    df['FINAL_SCORE'] = (
+        (df['Skor_Kapabilitas'] * bobot_speed) +
+        (df['Skor_Attitude'] * bobot_attitude) +
+        (df['Skor_Lokasi'] * 15) +
+        (df['Skor_Usia'] * 10) +
+        (df['Skor_Spesialis'] * 20)
+    )
+    df['FINAL_SCORE'] = df['FINAL_SCORE'] - df.apply(lambda r: 10000 if r['status'] == 'working' else 0, axis=1)
+    df['FINAL_SCORE'] = df['FINAL_SCORE'] - df.apply(lambda r: 0 if r['Sanggup_Kejar_Deadline'] else 5000, axis=1)
+    return df.sort_values(by='FINAL_SCORE', ascending=False)
+
+
+def ukur(fungsi, ulang):
+    """Waktu terbaik (detik) dari beberapa kali ulang."""
+    terbaik = float("inf")
+    hasil = None
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        hasil = fungsi()
+        terbaik = min(terbaik, time.perf_counter() - mulai)
+    return terbaik, hasil
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark mesin skor hitung_rekomendasi")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--jenis", default="Seragam Sekolah", choices=list(map_kapabilitas))
+    parser.add_argument("--pcs", type=int, default=300)
+    parser.add_argument("--hari", type=int, default=14)
+    args = parser.parse_args()
+
+    deadline = date.today() + timedelta(days=args.hari)
+    print(f"{'Roster':>10} | {'Lama (s)':>10} | {'Vektor (s)':>10} | {'Statis (s)':>10} | {'Speedup':>8} | Skor sama?")
+    print("-" * 75)
+    for n in args.sizes:
+        roster = buat_roster_sintetis(n)
+        t_lama, lama = ukur(lambda: hitung_skor_lama(roster, args.jenis, args.pcs, deadline), args.repeat)
+        t_baru, (baru, _) = ukur(lambda: hitung_skor(roster, args.jenis, args.pcs, deadline), args.repeat)
+        # Per request dengan komponen statis yang sudah dihitung (seperti di _ProfilStore)
+        statis = RosterStatis(roster)
+        t_statis, _ = ukur(lambda: skor_dari_statis(statis, args.jenis, args.pcs, deadline), args.repeat)
+        sama = np.allclose(lama['FINAL_SCORE'].to_numpy(), baru['FINAL_SCORE'].to_numpy())
+        print(f"{n:>10,} | {t_lama:>10.4f} | {t_baru:>10.4f} | {t_statis:>10.4f} | {t_lama / t_statis:>7.1f}x | {'✅' if sama else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+# benchmark_suite.py (Benchmark per tahap + cek regresi ranking alokasi)
+#
+# Contoh:
+#   python benchmark_suite.py                          # 1k, 10k, 100k + cek golden
+#   python benchmark_suite.py --sizes 1000 1000000     # sampai 1 juta penjahit
+#   python benchmark_suite.py --perbarui-golden        # simpan ranking sekarang sebagai golden
+#   python benchmark_suite.py --json hasil_bench.json  # simpan angka untuk dibandingkan
+import argparse
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+
+from allocation import (RosterStatis, IndeksBucket, map_kapabilitas, skor_dari_statis, hasil_dari_statis,
+                        skor_batch_dari_statis, sapu_dari_statis, bagi_tugas, SAPU_HARI_MAKS)
+from team_optimizer import pilih_tim_bertahap
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_golden.json')
+GOLDEN_SIZES = [1_000, 10_000]
+GOLDEN_TOP = 20
+
+# Distribusi kira-kira mengikuti DATA_FINAL_CLUSTERED.csv (113 penjahit)
+SPEED_CSV = {
+    "Seragam Hem Putih (Pcs/hari)": ([0, 2, 3, 5, 10, 15, 25], [0.1, 0.2, 0.2, 0.25, 0.15, 0.06, 0.04]),
+    "Seragam Hem Pramuka (Pcs/hari)": ([0, 1, 2, 3, 5, 10], [0.15, 0.25, 0.3, 0.15, 0.1, 0.05]),
+    "Rok Seragam (Pcs/hari)": ([0, 2, 3, 5, 10, 20, 30], [0.1, 0.2, 0.2, 0.25, 0.15, 0.06, 0.04]),
+    "Celana Pramuka Seragam (Pcs/hari)": ([0, 2, 3, 5, 10, 20, 30], [0.1, 0.2, 0.2, 0.25, 0.15, 0.06, 0.04]),
+    "Kemeja Kerja (Pcs/hari)": ([0, 1, 2, 3], [0.2, 0.5, 0.2, 0.1]),
+    "Custom (Sulit) (Pcs/hari)": ([0, 1, 2], [0.85, 0.1, 0.05]),
+}
+SPESIALIS_CSV = (["Seragam", "Semua", "Hanya bisa mengerjakan rok, atasan dan celana"], [0.37, 0.36, 0.27])
+
+
+def buat_roster_seperti_csv(n, seed=0):
+    """Roster sintetis dengan kolom & sebaran mirip DATA_FINAL_CLUSTERED.csv + status/beban DB."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "No.": np.arange(1, n + 1),
+        "Kode Penjahit": [f"{i // 100:02d}.{i % 100:02d}" for i in range(n)],
+        "Nama": [f"Penjahit {i}" for i in range(n)],
+        "Jarak Rumah ke Koperasi (Km)": rng.gamma(2.0, 3.2, n).clip(0.3, 25).round(1),
+        "Usia": rng.normal(51, 9, n).clip(20, 75).astype(int),
+        "Kerapian": (rng.random(n) < 0.76).astype(int),
+        "Ketepatan Waktu": (rng.random(n) < 0.92).astype(int),
+        "Quantity": (rng.random(n) < 0.36).astype(int),
+        "Komitmen": (rng.random(n) < 0.94).astype(int),
+        "Spesialis": rng.choice(SPESIALIS_CSV[0], n, p=SPESIALIS_CSV[1]),
+    })
+    for kolom, (nilai, peluang) in SPEED_CSV.items():
+        df[kolom] = rng.choice(nilai, n, p=peluang)
+    df["Cluster_ID"] = rng.integers(0, 3, n)
+    df["tailor_id"] = np.arange(1, n + 1)
+    df["status"] = rng.choice(["idle", "working"], n, p=[0.75, 0.25])
+    # Beban berjalan (pcs/hari) untuk yang working; sebagian tanpa data beban (diblokir)
+    beban = rng.choice([0.0, 1.0, 2.0, 5.0, 50.0], n, p=[0.2, 0.3, 0.3, 0.15, 0.05])
+    df["beban_per_hari"] = np.where(df["status"] == "working", beban, 0.0)
+    return df
+
+
+def buat_order_campuran(m, seed=0):
+    """Campuran order untuk kelima kategori map_kapabilitas; deadline dalam hari dari hari ini."""
+    rng = np.random.default_rng(seed)
+    jenis = list(map_kapabilitas)
+    return pd.DataFrame({
+        "jenis_project": [jenis[i % len(jenis)] for i in range(m)],
+        "jumlah_pcs": rng.choice([10, 30, 60, 150, 300, 1000, 5000], m),
+        "hari": rng.integers(1, 60, m),
+    })
+
+
+def _deadline(hari):
+    return date.today() + timedelta(days=int(hari))
+
+
+def ukur_tahap(fungsi, ulang):
+    """(waktu terbaik detik, peak memori MB, hasil). Memori diukur di run terpisah."""
+    terbaik = float("inf")
+    hasil = None
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        hasil = fungsi()
+        terbaik = min(terbaik, time.perf_counter() - mulai)
+    tracemalloc.start()
+    fungsi()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return terbaik, peak / 2**20, hasil
+
+
+def _min_anggota(pcs):
+    """Batas default halaman untuk tim: maksimal setengah order per orang."""
+    return math.ceil(pcs / max(1, int(pcs / 2)))
+
+
+def jalankan_tahap(roster, orders, ulang):
+    """Ukur tiap tahap alokasi untuk satu roster. Return list dict baris laporan."""
+    n = len(roster)
+    baris = []
+
+    def catat(tahap, fungsi, jumlah_baris):
+        t, mem, hasil = ukur_tahap(fungsi, ulang)
+        baris.append({"roster": n, "tahap": tahap, "baris": jumlah_baris, "detik": t, "peak_mb": mem})
+        return hasil
+
+    statis = catat("RosterStatis", lambda: RosterStatis(roster), n)
+    catat("IndeksBucket (5 kategori)",
+          lambda: [IndeksBucket(statis.tabel(j), statis.cluster[statis.tabel(j)['posisi']]) for j in map_kapabilitas], n)
+    o = orders.iloc[0]
+    catat("skor 1 order (sort penuh)",
+          lambda: skor_dari_statis(statis, o.jenis_project, int(o.jumlah_pcs), _deadline(o.hari)), n)
+    catat("skor 1 order (top-10)",
+                  lambda: hasil_dari_statis(statis, o.jenis_project, int(o.jumlah_pcs), _deadline(o.hari)).teratas(10), 10)
+
+    catat("skor cluster 0 (top-10)",
+          lambda: hasil_dari_statis(statis, o.jenis_project, int(o.jumlah_pcs), _deadline(o.hari),
+                                    cluster=[0]).teratas(10), int((roster["Cluster_ID"] == 0).sum()))
+
+    orders_batch = orders.assign(tgl_deadline=[_deadline(h) for h in orders["hari"]])
+    catat(f"batch {len(orders)} order (top-10)",
+          lambda: skor_batch_dari_statis(statis, orders_batch, top_k=10), len(orders) * n)
+
+    hasil = hasil_dari_statis(statis, o.jenis_project, int(o.jumlah_pcs), _deadline(o.hari))
+    target = int(o.jumlah_pcs) / max(1, int(o.hari))
+    team, _ = catat("tim (pilih_tim_bertahap)",
+                    lambda: pilih_tim_bertahap(hasil.tersedia(), target, _min_anggota(int(o.jumlah_pcs))),
+                    len(hasil.tersedia()))
+    catat("bagi_tugas", lambda: bagi_tugas(team['Max Speed (Pcs/Hari)'].to_numpy(), int(o.jumlah_pcs),
+                                           max(1, int(o.jumlah_pcs) // 2)), len(team))
+    catat(f"sapu deadline {SAPU_HARI_MAKS + 1} hari",
+          lambda: sapu_dari_statis(statis, o.jenis_project, int(o.jumlah_pcs)), n)
+    return baris
+
+
+def ranking_golden(n, orders):
+    """Ranking top-N, skor, dan tim untuk tiap order pada roster sintetis berukuran n."""
+    statis = RosterStatis(buat_roster_seperti_csv(n))
+    hasil_order = []
+    for o in orders.itertuples(index=False):
+        pcs = int(o.jumlah_pcs)
+        hasil = hasil_dari_statis(statis, o.jenis_project, pcs, _deadline(o.hari))
+        top = hasil.teratas(GOLDEN_TOP)
+        team, info = pilih_tim_bertahap(hasil.tersedia(), pcs / max(1, int(o.hari)), _min_anggota(pcs),
+                                        budget_detik=10)
+        hasil_order.append({
+            "jenis_project": o.jenis_project, "jumlah_pcs": pcs, "hari": int(o.hari),
+            "top": [int(i) for i in top.index],
+            "skor": [round(float(s), 6) for s in top["FINAL_SCORE"]],
+            "tim": [int(i) for i in team.index] if info["optimal"] else None,
+        })
+    return hasil_order
+
+
+def cek_golden(orders, perbarui):
+    """Bandingkan ranking sekarang dengan golden. Return True kalau sama / baru diperbarui."""
+    sekarang = {str(n): ranking_golden(n, orders) for n in GOLDEN_SIZES}
+    if perbarui or not os.path.exists(GOLDEN_PATH):
+        with open(GOLDEN_PATH, "w") as f:
+            json.dump(sekarang, f, indent=1)
+        print(f"Golden disimpan ke {GOLDEN_PATH}")
+        return True
+
+    with open(GOLDEN_PATH) as f:
+        golden = json.load(f)
+    beda = []
+    for n, daftar in golden.items():
+        for lama, baru in zip(daftar, sekarang.get(n, [])):
+            label = f"n={n} {lama['jenis_project']} {lama['jumlah_pcs']} pcs/{lama['hari']} hari"
+            if lama["top"] != baru["top"]:
+                beda.append(f"{label}: urutan top-{GOLDEN_TOP} berubah")
+            elif not np.allclose(lama["skor"], baru["skor"], atol=1e-6):
+                beda.append(f"{label}: skor berubah")
+            elif lama["tim"] is not None and baru["tim"] is not None and lama["tim"] != baru["tim"]:
+                beda.append(f"{label}: tim berubah")
+        if len(daftar) != len(sekarang.get(n, [])):
+            beda.append(f"n={n}: jumlah order golden berbeda")
+    for b in beda:
+        print(f"❌ {b}")
+    print("✅ Ranking sama dengan golden" if not beda else f"❌ {len(beda)} perbedaan dari golden")
+    return not beda
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark & regresi ranking alokasi penjahit")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--orders", type=int, default=50, help="jumlah order campuran (kelima kategori)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="simpan hasil pengukuran ke file JSON")
+    parser.add_argument("--perbarui-golden", action="store_true")
+    parser.add_argument("--tanpa-golden", action="store_true")
+    args = parser.parse_args()
+
+    orders = buat_order_campuran(args.orders)
+    laporan = []
+    print(f"{'Roster':>10} | {'Tahap':<30} | {'Baris':>12} | {'Waktu (ms)':>11} | {'Peak (MB)':>9}")
+    print("-" * 85)
+    for n in args.sizes:
+        roster = buat_roster_seperti_csv(n)
+        for b in jalankan_tahap(roster, orders, args.repeat):
+            laporan.append(b)
+            print(f"{n:>10,} | {b['tahap']:<30} | {b['baris']:>12,} | {b['detik'] * 1000:>11.2f} | {b['peak_mb']:>9.1f}")
+        del roster
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(laporan, f, indent=1)
+
+    if not args.tanpa_golden:
+        golden_ok = cek_golden(buat_order_campuran(25, seed=1), args.perbarui_golden)
+        sys.exit(0 if golden_ok else 1)
+
+
+if __name__ == "__main__":
+    main()
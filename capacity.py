@@ -0,0 +1,19 @@
+from db_init import TANPA_DEADLINE
+
+# Beban kerja terbuka per penjahit dalam pcs/hari untuk tanggal :hari, dari tabel
+# tailor_load. Tiap (penjahit, deadline) menyumbang open_pcs / sisa hari ke
+# deadline (minimal 1 hari, jadi yang telat dianggap harus selesai hari ini);
+# tanpa deadline tidak dihitung per hari. Satu-satunya rumus beban: roster
+# allocation.py (Smart Allocation, Assignments, Rencana Global) memakai query ini.
+# Kolom: tailor_id, open_pcs, beban_per_hari
+QUERY_BEBAN_PER_HARI = f"""
+    SELECT
+        l.tailor_id,
+        SUM(l.open_pcs) AS open_pcs,
+        SUM(CASE
+            WHEN l.deadline = '{TANPA_DEADLINE}' OR julianday(l.deadline) IS NULL THEN 0.0
+            ELSE l.open_pcs * 1.0 / MAX(1, CAST(julianday(l.deadline) - julianday(:hari) AS INTEGER))
+        END) AS beban_per_hari
+    FROM tailor_load l
+    GROUP BY l.tailor_id
+"""
@@ -0,0 +1,92 @@
+# cek_bagi_tugas.py (Cek allocation.bagi_tugas identik dengan loop lama "+1 per putaran")
+#
+# Contoh:
+#   python cek_bagi_tugas.py                      # 20000 kasus acak, seed 0
+#   python cek_bagi_tugas.py --kasus 100000 --seed 3
+#   python cek_bagi_tugas.py -v                   # tampilkan detail kasus yang beda
+#
+# Kasus acak mencakup batas pecahan (mis. 3.5 pcs), batas lebih besar dari total
+# pcs, batas yang membuat pcs tidak habis terbagi, speed pecahan/kembar/nol.
+# Tim dengan total speed 0 dilewati: loop lama gagal (bagi nol) di situ.
+# Keluar dengan kode 1 kalau ada kasus yang hasilnya beda.
+import argparse
+import sys
+
+import numpy as np
+
+from allocation import bagi_tugas
+
+
+def bagi_tugas_lama(speeds, total_pcs, maks_per_orang):
+    """Loop asli halaman Smart Allocation sebelum dipindah ke allocation.bagi_tugas."""
+    total_speed_team = sum(speeds)
+    temp_allocations = []
+    for s in speeds:
+        ideal_share = (s / total_speed_team) * total_pcs
+        capped_share = min(ideal_share, maks_per_orang)
+        temp_allocations.append(capped_share)
+
+    allocations = [int(x) for x in temp_allocations]
+
+    remaining_pcs = total_pcs - sum(allocations)
+    sorted_indices = sorted(range(len(speeds)), key=lambda k: speeds[k], reverse=True)
+
+    while remaining_pcs > 0:
+        distributed = False
+        for idx in sorted_indices:
+            if remaining_pcs <= 0: break
+            if allocations[idx] < maks_per_orang:
+                allocations[idx] += 1
+                remaining_pcs -= 1
+                distributed = True
+        if not distributed: break
+    return allocations
+
+
+def kasus_acak(rng):
+    n = int(rng.integers(1, 9))
+    speeds = [float(x) for x in rng.choice([0.0, 1.0, 2.5, 3.0, 3.0, 4.75, 7.5, 10.0, 12.3], n)]
+    total_pcs = int(rng.integers(0, 300))
+    jenis = rng.integers(0, 4)
+    if jenis == 0:
+        maks = float(rng.integers(1, 60))                        # batas bulat
+    elif jenis == 1:
+        maks = float(rng.integers(1, 60)) + float(rng.choice([0.25, 0.5, 0.75]))  # batas pecahan
+    elif jenis == 2:
+        maks = float(total_pcs + rng.integers(1, 50))            # batas > total pcs
+    else:
+        maks = max(total_pcs / n * float(rng.uniform(0.3, 1.2)), 0.5)  # sering tidak habis terbagi
+    return speeds, total_pcs, maks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cek bagi_tugas identik dengan loop lama")
+    parser.add_argument("--kasus", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-v", "--verbose", action="store_true", help="tampilkan detail kasus yang beda")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    gagal = dicek = 0
+    for i in range(args.kasus):
+        speeds, total_pcs, maks = kasus_acak(rng)
+        if sum(speeds) == 0:
+            continue
+        dicek += 1
+        lama = bagi_tugas_lama(speeds, total_pcs, maks)
+        baru = bagi_tugas(speeds, total_pcs, maks)
+        if lama == baru:
+            continue
+        gagal += 1
+        print(f"❌ Kasus {i}: speeds={speeds} pcs={total_pcs} maks={maks}")
+        if args.verbose:
+            print(f"      lama: {lama}")
+            print(f"      baru: {baru}")
+
+    print(f"\n✅ {dicek} kasus identik dengan loop lama" if not gagal
+          else f"\n❌ {gagal} dari {dicek} kasus beda dengan loop lama")
+    sys.exit(1 if gagal else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+# cek_konkurensi.py (Uji beban banyak admin sekaligus: penulis & pembaca paralel di salinan DB)
+#
+# Contoh:
+#   python cek_konkurensi.py                              # profil wal vs bawaan, 8 penulis, 8 pembaca
+#   python cek_konkurensi.py --profil wal --penulis 16 --pembaca 32 --transaksi 200
+#
+# DB asli tidak disentuh: tiap profil memakai salinan koperasi.db di folder sementara.
+# Keluar dengan kode 1 kalau ada error "database is locked" yang lolos dari retry,
+# atau jumlah baris hasil tulis tidak sesuai.
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+import db
+from db import atur_profil, jalankan_tulis, pool, PROFIL_PENYIMPANAN
+
+PENANDA = "cek_konkurensi"
+
+# Query baca yang mirip dashboard & halaman inventory
+QUERY_BACA = [
+    "SELECT COUNT(*), COALESCE(SUM(price), 0) FROM purchases",
+    """SELECT fabric_type, SUM(CASE WHEN direction='IN' THEN amount ELSE -amount END)
+       FROM inventory GROUP BY fabric_type""",
+    "SELECT status, COUNT(*) FROM projects GROUP BY status",
+]
+
+
+def _catat_pembelian(conn):
+    # Sama seperti form Purchases: pembelian + stok masuk dalam satu transaksi
+    conn.execute("""
+        INSERT INTO purchases (project_id, supplier_id, item, amount, unit, price, date)
+        VALUES (NULL, NULL, ?, 1, 'meter', 1000, DATE('now'))
+    """, (PENANDA,))
+    conn.execute("""
+        INSERT INTO inventory (fabric_type, amount, direction, reason, project_id)
+        VALUES (?, 1, 'IN', 'purchase', NULL)
+    """, (PENANDA,))
+
+
+def jalankan_profil(profil, sumber, n_penulis, n_pembaca, n_transaksi):
+    """Jalankan satu putaran beban untuk satu profil. Return dict hasil."""
+    folder = tempfile.mkdtemp(prefix="koperasi_konkurensi_")
+    path = os.path.join(folder, "koperasi.db")
+    shutil.copy(sumber, path)
+    atur_profil(profil)
+    db.DB_NAME = path
+    p = pool(path)
+
+    error, selesai_baca = [], [0]
+    waktu_tulis = []
+    lock = threading.Lock()
+    berhenti = threading.Event()
+
+    def penulis():
+        for _ in range(n_transaksi):
+            mulai = time.perf_counter()
+            try:
+                jalankan_tulis(_catat_pembelian)
+            except sqlite3.Error as e:
+                with lock:
+                    error.append(f"tulis: {e}")
+                continue
+            with lock:
+                waktu_tulis.append(time.perf_counter() - mulai)
+
+    def pembaca():
+        while not berhenti.is_set():
+            conn = p.ambil()
+            try:
+                for q in QUERY_BACA:
+                    conn.execute(q).fetchall()
+                with lock:
+                    selesai_baca[0] += 1
+            except sqlite3.Error as e:
+                with lock:
+                    error.append(f"baca: {e}")
+            finally:
+                conn.close()
+
+    thread_baca = [threading.Thread(target=pembaca) for _ in range(n_pembaca)]
+    thread_tulis = [threading.Thread(target=penulis) for _ in range(n_penulis)]
+    mulai = time.perf_counter()
+    for t in thread_baca + thread_tulis:
+        t.start()
+    for t in thread_tulis:
+        t.join()
+    durasi = time.perf_counter() - mulai
+    berhenti.set()
+    for t in thread_baca:
+        t.join()
+
+    conn = p.ambil()
+    jumlah_beli = conn.execute("SELECT COUNT(*) FROM purchases WHERE item = ?", (PENANDA,)).fetchone()[0]
+    jumlah_stok = conn.execute("SELECT COUNT(*) FROM inventory WHERE fabric_type = ?", (PENANDA,)).fetchone()[0]
+    journal = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.close()
+    statistik = p.statistik()
+    p.tutup_semua()
+    shutil.rmtree(folder, ignore_errors=True)
+
+    waktu_tulis.sort()
+    return {
+        "profil": profil,
+        "journal": journal,
+        "durasi": durasi,
+        "tulis": len(waktu_tulis),
+        "tulis_per_detik": len(waktu_tulis) / durasi if durasi else 0.0,
+        "baca_per_detik": selesai_baca[0] / durasi if durasi else 0.0,
+        "p95_tulis_ms": waktu_tulis[int(0.95 * (len(waktu_tulis) - 1))] * 1000 if waktu_tulis else 0.0,
+        "ulang_tulis": statistik["ulang_tulis"],
+        "error": error,
+        "baris_ok": jumlah_beli == jumlah_stok == n_penulis * n_transaksi,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uji penulis & pembaca paralel per profil penyimpanan")
+    parser.add_argument("--profil", nargs="+", default=["wal", "bawaan"], choices=list(PROFIL_PENYIMPANAN))
+    parser.add_argument("--penulis", type=int, default=8)
+    parser.add_argument("--pembaca", type=int, default=8)
+    parser.add_argument("--transaksi", type=int, default=100, help="transaksi tulis per penulis")
+    parser.add_argument("--db", default=db.DB_NAME, help="DB sumber yang disalin")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"❌ Error: {args.db} tidak ditemukan!")
+        sys.exit(1)
+
+    print(f"{args.penulis} penulis x {args.transaksi} transaksi, {args.pembaca} pembaca\n")
+    print(f"{'Profil':<8} | {'Journal':<7} | {'Tulis/dtk':>9} | {'p95 tulis (ms)':>14} | "
+          f"{'Baca/dtk':>9} | {'Retry':>5} | {'Error':>5}")
+    print("-" * 76)
+    gagal = False
+    for profil in args.profil:
+        h = jalankan_profil(profil, args.db, args.penulis, args.pembaca, args.transaksi)
+        print(f"{h['profil']:<8} | {h['journal']:<7} | {h['tulis_per_detik']:>9.0f} | {h['p95_tulis_ms']:>14.1f} | "
+              f"{h['baca_per_detik']:>9.0f} | {h['ulang_tulis']:>5} | {len(h['error']):>5}")
+        for e in sorted(set(h['error']))[:5]:
+            print(f"   ❌ {e}")
+        if not h['baris_ok']:
+            print("   ❌ Jumlah baris pembelian/stok tidak sesuai jumlah transaksi")
+        gagal |= bool(h['error']) or not h['baris_ok']
+
+    print("\n✅ Tidak ada error lock" if not gagal else "\n❌ Ada transaksi yang gagal")
+    sys.exit(1 if gagal else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# cek_pareto.py (Cek front_pareto_tim terhadap brute force semua tim di roster kecil)
+#
+# Contoh:
+#   python cek_pareto.py                     # 300 roster acak, seed 0
+#   python cek_pareto.py --kasus 2000 --seed 7
+#   python cek_pareto.py -v                  # tampilkan detail kasus yang beda
+#
+# Jarak & speed sengaja berupa pecahan (0.7, 1.1, ...) supaya rata-rata kena
+# selisih pembulatan float. Grid jarak 0 (exact) dan batas label besar, jadi
+# frontier harus sama persis dengan brute force.
+# Keluar dengan kode 1 kalau ada kasus yang frontier-nya beda.
+import argparse
+import itertools
+import sys
+
+import numpy as np
+import pandas as pd
+
+from team_optimizer import (front_pareto_tim, _k_minimum,
+                            KOLOM_SPEED, KOLOM_SKOR, KOLOM_JARAK, KOLOM_ATTITUDE)
+
+DESIMAL = 6
+
+
+def roster_acak(rng):
+    n = int(rng.integers(1, 11))
+    return pd.DataFrame({
+        KOLOM_SPEED: rng.choice([1.5, 2.0, 3.5, 4.0, 5.25, 7.0], n),
+        KOLOM_JARAK: rng.choice([0.1, 0.2, 0.3, 0.7, 1.1, 2.5, 3.3], n),
+        KOLOM_ATTITUDE: rng.choice([1.0, 2.0, 3.0, 3.5, 4.0, 5.0], n),
+        KOLOM_SKOR: rng.random(n),
+    }, index=rng.permutation(100)[:n])
+
+
+def _triple(speed, jarak, att):
+    return (round(speed, DESIMAL), round(jarak, DESIMAL), round(att, DESIMAL))
+
+
+def front_brute_force(candidates, target_speed, min_anggota, ekstra_anggota):
+    """Himpunan (kapasitas, rata-rata jarak, rata-rata attitude) tim yang tidak didominasi."""
+    speeds = candidates[KOLOM_SPEED].to_numpy(dtype=float)
+    jarak = candidates[KOLOM_JARAK].to_numpy(dtype=float)
+    att = candidates[KOLOM_ATTITUDE].to_numpy(dtype=float)
+    n = len(candidates)
+    k_min = _k_minimum(speeds, target_speed, min_anggota)
+    semua = set()
+    for m in range(k_min, min(n, k_min + ekstra_anggota) + 1):
+        for tim in itertools.combinations(range(n), m):
+            tim = list(tim)
+            if speeds[tim].sum() >= target_speed - 1e-9:
+                semua.add(_triple(speeds[tim].sum(), jarak[tim].mean(), att[tim].mean()))
+
+    def didominasi(p, q):
+        return q != p and q[0] >= p[0] and q[1] <= p[1] and q[2] >= p[2]
+
+    return {p for p in semua if not any(didominasi(p, q) for q in semua)}
+
+
+def cek_kasus(rng):
+    """Return (front optimizer, front brute force, anggota valid) untuk satu roster acak."""
+    candidates = roster_acak(rng)
+    target = float(rng.choice([2.0, 5.0, 7.5, 10.0, 15.0]))
+    min_anggota = int(rng.integers(1, 4))
+    ekstra = int(rng.integers(0, 3))
+    df, _ = front_pareto_tim(candidates, target, min_anggota, ekstra_anggota=ekstra,
+                             grid_jarak=0, maks_label=10**6)
+    hasil = set()
+    anggota_ok = True
+    for baris in df.itertuples(index=False):
+        tim = candidates.loc[baris.anggota]
+        # Nilai di baris harus sesuai anggota timnya
+        anggota_ok &= _triple(baris[1], baris[2], baris[3]) == _triple(
+            tim[KOLOM_SPEED].sum(), tim[KOLOM_JARAK].mean(), tim[KOLOM_ATTITUDE].mean())
+        hasil.add(_triple(baris[1], baris[2], baris[3]))
+    info = f"n={len(candidates)} target={target} min={min_anggota} ekstra={ekstra}"
+    return hasil, front_brute_force(candidates, target, min_anggota, ekstra), anggota_ok, info
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cek frontier Pareto tim terhadap brute force")
+    parser.add_argument("--kasus", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-v", "--verbose", action="store_true", help="tampilkan detail kasus yang beda")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    gagal = 0
+    for i in range(args.kasus):
+        hasil, benar, anggota_ok, info = cek_kasus(rng)
+        if hasil == benar and anggota_ok:
+            continue
+        gagal += 1
+        print(f"❌ Kasus {i} ({info}): {len(hasil)} tim vs {len(benar)} brute force")
+        if args.verbose:
+            for p in sorted(hasil - benar):
+                print(f"      lebih: {p}")
+            for p in sorted(benar - hasil):
+                print(f"      kurang: {p}")
+            if not anggota_ok:
+                print("      nilai baris tidak sesuai anggota tim")
+
+    print(f"\n✅ {args.kasus} kasus sama dengan brute force" if not gagal
+          else f"\n❌ {gagal} dari {args.kasus} kasus beda dengan brute force")
+    sys.exit(1 if gagal else 0)
+
+
+if __name__ == "__main__":
+    main()
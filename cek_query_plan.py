@@ -0,0 +1,87 @@
+# cek_query_plan.py (Cek EXPLAIN QUERY PLAN query utama halaman: harus memakai index, bukan scan penuh)
+#
+# Contoh:
+#   python cek_query_plan.py                  # skema baru hasil migrasi di DB sementara
+#   python cek_query_plan.py --db koperasi.db # salinan DB sungguhan (dimigrasi dulu, file asli tidak diubah)
+#   python cek_query_plan.py -v               # tampilkan plan lengkap
+#
+# Keluar dengan kode 1 kalau ada query yang tidak memakai index yang diharapkan.
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+from db_init import jalankan_migrasi, MIGRASI
+from global_allocator import QUERY_PROJECT_TERBUKA
+from query_halaman import (QUERY_PROJECTS, QUERY_PROJECT_ONGOING, QUERY_PURCHASES, QUERY_STOK_KAIN,
+                           QUERY_RIWAYAT_INVENTORY, QUERY_BELANJA_SUPPLIER, QUERY_RIWAYAT_PENJAHIT,
+                           QUERY_PROJECT_ONGOING_TUGAS, QUERY_KUOTA_TERPAKAI, QUERY_STATUS_PROJECT,
+                           QUERY_PEMBELIAN_TERAKHIR)
+
+# (nama, query yang dijalankan halaman, parameter, index yang wajib muncul di plan)
+QUERY_HALAMAN = [
+    ("Projects: daftar + total belanja", QUERY_PROJECTS, (), ["idx_purchases_project"]),
+    ("Purchases/Inventory: project ongoing", QUERY_PROJECT_ONGOING, (), ["idx_projects_status"]),
+    ("Purchases: daftar pembelian", QUERY_PURCHASES, (), ["idx_purchases_date"]),
+    ("Suppliers: total belanja per supplier", QUERY_BELANJA_SUPPLIER, (), ["idx_purchases_supplier"]),
+    ("Inventory: stok akhir per kain", QUERY_STOK_KAIN, (), ["idx_inventory_fabric"]),
+    ("Inventory: riwayat", QUERY_RIWAYAT_INVENTORY, (), ["idx_inventory_created"]),
+    ("Dashboard: status produksi", QUERY_STATUS_PROJECT, (), ["idx_projects_status"]),
+    ("Dashboard: pembelian terakhir", QUERY_PEMBELIAN_TERAKHIR, (), ["idx_purchases_date"]),
+    ("Tailors: riwayat kerja penjahit", QUERY_RIWAYAT_PENJAHIT, (1,), ["idx_assignments_tailor"]),
+    ("Assignments: project ongoing", QUERY_PROJECT_ONGOING_TUGAS, (), ["idx_projects_status"]),
+    ("Assignments: kuota terpakai project", QUERY_KUOTA_TERPAKAI, (1,), ["idx_assignments_project"]),
+    ("Global Allocation: project terbuka", QUERY_PROJECT_TERBUKA, (),
+     ["idx_projects_status", "idx_assignments_project"]),
+]
+
+
+def rencana(conn, sql, params):
+    return [baris[3] for baris in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def cek(conn, verbose=False):
+    """Return daftar pesan kegagalan (kosong kalau semua query memakai index yang diharapkan)."""
+    gagal = []
+    for nama, sql, params, indeks in QUERY_HALAMAN:
+        plan = rencana(conn, sql, params)
+        kurang = [i for i in indeks if not any(i in langkah for langkah in plan)]
+        print(f"{'✅' if not kurang else '❌'} {nama}")
+        if verbose or kurang:
+            for langkah in plan:
+                print(f"      {langkah}")
+        if kurang:
+            gagal.append(f"{nama}: tidak memakai {', '.join(kurang)}")
+    return gagal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cek query utama halaman memakai index")
+    parser.add_argument("--db", help="DB yang disalin lalu dimigrasi (default: skema kosong baru)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="tampilkan plan semua query")
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp(prefix="koperasi_plan_")
+    path = os.path.join(folder, "koperasi.db")
+    try:
+        if args.db:
+            if not os.path.exists(args.db):
+                print(f"❌ Error: {args.db} tidak ditemukan!")
+                sys.exit(1)
+            shutil.copy(args.db, path)
+        conn = sqlite3.connect(path)
+        versi = jalankan_migrasi(conn)
+        print(f"Skema versi {versi} (migrasi terakhir: {MIGRASI[-1][0]})\n")
+        gagal = cek(conn, args.verbose)
+        conn.close()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    print("\n✅ Semua query memakai index" if not gagal else f"\n❌ {len(gagal)} query masih scan penuh")
+    sys.exit(1 if gagal else 0)
+
+
+if __name__ == "__main__":
+    main()
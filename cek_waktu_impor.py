@@ -0,0 +1,78 @@
+# cek_waktu_impor.py (Cek anggaran waktu impor modul alokasi, dijalankan di interpreter baru)
+#
+# Contoh:
+#   python cek_waktu_impor.py                 # cek semua modul terhadap ANGGARAN_MS
+#   python cek_waktu_impor.py --ulang 10      # ambil waktu terbaik dari 10 kali
+#
+# Waktu diukur SETELAH numpy & pandas diimpor (di proses Streamlit keduanya sudah
+# dimuat), jadi yang terukur hanya biaya modul aplikasi dan dependensi tambahannya.
+# Exit code 1 kalau ada modul yang melewati anggaran atau ikut memuat library berat.
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Anggaran per modul (ms), sudah termasuk modul aplikasi yang diimpornya
+ANGGARAN_MS = {
+    "normalisasi": 5,
+    "profiling": 20,
+    "allocation": 60,
+    "team_optimizer": 30,
+    "global_allocator": 80,
+    "clustering": 60,
+}
+# Tidak boleh ikut termuat saat mengimpor modul alokasi
+LIBRARY_BERAT = ["sklearn", "scipy", "plotly", "altair", "matplotlib", "streamlit"]
+
+_SKRIP = """
+import json, sys, time
+import numpy, pandas
+mulai = time.perf_counter()
+import {modul}
+detik = time.perf_counter() - mulai
+print(json.dumps({{"ms": detik * 1000, "berat": [m for m in {berat!r} if m in sys.modules]}}))
+"""
+
+
+def ukur_impor(modul, ulang=5):
+    """(waktu impor terbaik dalam ms, library berat yang ikut termuat) di interpreter baru."""
+    folder = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=folder + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    terbaik, berat = float("inf"), []
+    for _ in range(ulang):
+        keluaran = subprocess.run(
+            [sys.executable, "-c", _SKRIP.format(modul=modul, berat=LIBRARY_BERAT)],
+            cwd=folder, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        hasil = json.loads(keluaran.strip().splitlines()[-1])
+        terbaik = min(terbaik, hasil["ms"])
+        berat = hasil["berat"]
+    return terbaik, berat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cek anggaran waktu impor modul alokasi")
+    parser.add_argument("--ulang", type=int, default=5)
+    parser.add_argument("modul", nargs="*", help="default: semua modul di ANGGARAN_MS")
+    args = parser.parse_args()
+
+    gagal = []
+    print(f"{'Modul':<18} | {'Impor (ms)':>10} | {'Anggaran':>8} | Library berat")
+    print("-" * 60)
+    for modul in args.modul or ANGGARAN_MS:
+        ms, berat = ukur_impor(modul, args.ulang)
+        anggaran = ANGGARAN_MS.get(modul, float("inf"))
+        tanda = "✅" if ms <= anggaran and not berat else "❌"
+        print(f"{modul:<18} | {ms:>10.1f} | {anggaran:>8} | {', '.join(berat) or '-'} {tanda}")
+        if tanda == "❌":
+            gagal.append(modul)
+
+    if gagal:
+        print(f"❌ Melewati anggaran / memuat library berat: {', '.join(gagal)}")
+        sys.exit(1)
+    print("✅ Semua modul dalam anggaran")
+
+
+if __name__ == "__main__":
+    main()
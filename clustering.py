@@ -0,0 +1,292 @@
+# clustering.py (Clustering penjahit inkremental: mini-batch k-means berbasis NumPy)
+#
+# Menggantikan kolom Cluster_ID statis di DATA_FINAL_CLUSTERED.csv:
+# - penjahit baru / yang diedit langsung ditempatkan ke centroid terdekat
+#   (centroid ikut bergeser seperti update mini-batch k-means), tanpa fit ulang
+# - kalau drift melewati batas, fit ulang seluruh roster dijalankan di background
+# Hasilnya disimpan di tailor_attributes.cluster_id, model di cluster_centroids & cluster_model.
+import itertools
+import json
+import threading
+import numpy as np
+import pandas as pd
+from db import baca_sql, jalankan_tulis
+from import_capabilities import KAPABILITAS_CSV
+from normalisasi import parameter_standar
+
+JUMLAH_CLUSTER = 3
+# Label per peringkat centroid (terbaik, tengah, terburuk), sama seperti Kategori_ML di CSV.
+# Nomor cluster tidak bermakna: setelah fit ulang, ID hanya urutan hasil k-means.
+LABEL_TERBAIK = "Elite Team (Cepat & Banyak)"
+LABEL_TENGAH = "Standar / Rapi"
+LABEL_TERBURUK = "Perlu Bimbingan"
+
+# Fit ulang kalau rata-rata jarak² penjahit baru > BATAS_DRIFT x rata-rata saat fit,
+# atau penjahit yang ditempatkan sejak fit > BATAS_UBAH x jumlah saat fit
+BATAS_DRIFT = 1.5
+BATAS_UBAH = 0.2
+MIN_SAMPEL_DRIFT = 5
+
+KOLOM_ATRIBUT = ['kerapian', 'komitmen', 'ketepatan_waktu', 'quantity']
+FITUR = list(KAPABILITAS_CSV.values()) + KOLOM_ATRIBUT
+
+
+def _query_fitur(satu=False):
+    kolom_speed = ",\n        ".join(
+        f"COALESCE(MAX(CASE WHEN c.clothes_type = '{jenis}' THEN c.pcs_per_day END), 0) AS \"{jenis}\""
+        for jenis in KAPABILITAS_CSV.values()
+    )
+    kolom_atribut = ", ".join(f"COALESCE(a.{k}, 0) AS {k}" for k in KOLOM_ATRIBUT)
+    return f"""
+    SELECT a.tailor_id, a.cluster_id, {kolom_atribut},
+        {kolom_speed}
+    FROM tailor_attributes a
+    LEFT JOIN tailor_capabilities c ON c.tailor_id = a.tailor_id
+    {"WHERE a.tailor_id = ?" if satu else ""}
+    GROUP BY a.tailor_id
+    ORDER BY a.tailor_id
+    """
+
+
+def muat_fitur(conn, tailor_id=None):
+    """DataFrame fitur clustering (tailor_id, cluster_id, FITUR...) dari DB."""
+    params = (tailor_id,) if tailor_id is not None else ()
+    return pd.read_sql_query(_query_fitur(tailor_id is not None), conn, params=params)
+
+
+def _kmeans_pp(X, k, rng):
+    """Inisialisasi k-means++."""
+    centroid = [X[rng.integers(len(X))]]
+    for _ in range(1, k):
+        d2 = ((X[:, None, :] - np.array(centroid)[None]) ** 2).sum(-1).min(1)
+        total = d2.sum()
+        idx = rng.choice(len(X), p=d2 / total) if total > 0 else rng.integers(len(X))
+        centroid.append(X[idx])
+    return np.array(centroid, dtype=float)
+
+
+def _terdekat(X, centroid):
+    """(indeks centroid terdekat, jarak²) untuk tiap baris X."""
+    d2 = ((X[:, None, :] - centroid[None]) ** 2).sum(-1)
+    label = d2.argmin(1)
+    return label, d2[np.arange(len(X)), label]
+
+
+def minibatch_kmeans(X, k, init=None, batch=64, iterasi=100, seed=0):
+    """
+    Mini-batch k-means (Sculley 2010): tiap iterasi ambil sampel acak, pindahkan
+    centroid terdekat dengan learning rate 1/jumlah. Return (centroid, jumlah, label, inertia).
+    """
+    X = np.asarray(X, dtype=float)
+    rng = np.random.default_rng(seed)
+    k = min(k, len(X))
+    centroid = np.array(init, dtype=float) if init is not None else _kmeans_pp(X, k, rng)
+    jumlah = np.zeros(len(centroid))
+    for _ in range(iterasi):
+        sampel = X[rng.integers(len(X), size=min(batch, len(X)))]
+        label, _ = _terdekat(sampel, centroid)
+        for x, c in zip(sampel, label):
+            jumlah[c] += 1
+            centroid[c] += (x - centroid[c]) / jumlah[c]
+    label, d2 = _terdekat(X, centroid)
+    return centroid, np.bincount(label, minlength=len(centroid)), label, float(d2.sum())
+
+
+def _samakan_id(centroid_baru, centroid_lama):
+    """Urutan centroid baru supaya ID cluster lama tetap (jarak total terkecil)."""
+    k = len(centroid_baru)
+    if centroid_lama is None or len(centroid_lama) != k or k > 7:
+        return np.arange(k)
+    terbaik = min(itertools.permutations(range(k)),
+                  key=lambda p: sum(((centroid_baru[p[i]] - centroid_lama[i]) ** 2).sum() for i in range(k)))
+    return np.array(terbaik)
+
+
+class ModelCluster:
+    """Centroid + standardisasi fitur + penghitung drift sejak fit terakhir."""
+
+    def __init__(self, mean, std, centroid, jumlah, inertia_per_titik, n_fit, n_baru=0, jarak_baru=0.0):
+        self.mean = np.asarray(mean, dtype=float)
+        self.std = np.asarray(std, dtype=float)
+        self.centroid = np.asarray(centroid, dtype=float)
+        self.jumlah = np.asarray(jumlah, dtype=float)
+        self.inertia_per_titik = inertia_per_titik
+        self.n_fit = n_fit
+        self.n_baru = n_baru
+        self.jarak_baru = jarak_baru
+
+    def standardisasi(self, X):
+        return (np.asarray(X, dtype=float) - self.mean) / self.std
+
+    def drift(self):
+        """Rasio rata-rata jarak² penempatan baru terhadap rata-rata saat fit."""
+        if self.n_baru == 0 or not self.inertia_per_titik:
+            return 0.0
+        return (self.jarak_baru / self.n_baru) / self.inertia_per_titik
+
+    def perlu_latih_ulang(self):
+        if self.n_baru < MIN_SAMPEL_DRIFT:
+            return False
+        return self.drift() > BATAS_DRIFT or self.n_baru > BATAS_UBAH * max(1, self.n_fit)
+
+
+def label_dari_centroid(model):
+    """
+    {cluster_id: label} menurut peringkat centroid: rata-rata z speed semua jenis
+    pakaian + rata-rata z atribut (kerapian, komitmen, ketepatan, quantity).
+    Tertinggi LABEL_TERBAIK, terendah LABEL_TERBURUK, sisanya LABEL_TENGAH.
+    """
+    n_speed = len(KAPABILITAS_CSV)
+    skor = model.centroid[:, :n_speed].mean(axis=1) + model.centroid[:, n_speed:].mean(axis=1)
+    urutan = np.argsort(-skor, kind='stable')
+    label = {int(i): LABEL_TENGAH for i in urutan}
+    label[int(urutan[-1])] = LABEL_TERBURUK
+    label[int(urutan[0])] = LABEL_TERBAIK
+    return label
+
+
+def _simpan_model(conn, model):
+    c = conn.cursor()
+    label = label_dari_centroid(model)
+    c.execute("DELETE FROM cluster_centroids")
+    c.executemany(
+        "INSERT INTO cluster_centroids (cluster_id, label, jumlah, centroid) VALUES (?, ?, ?, ?)",
+        [(i, label[i], int(model.jumlah[i]), json.dumps(model.centroid[i].tolist()))
+         for i in range(len(model.centroid))]
+    )
+    c.execute("""
+        INSERT INTO cluster_model (id, mean, std, inertia_per_titik, n_fit, n_baru, jarak_baru, fitted_at)
+        VALUES (1, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(id) DO UPDATE SET mean = excluded.mean, std = excluded.std,
+            inertia_per_titik = excluded.inertia_per_titik, n_fit = excluded.n_fit,
+            n_baru = excluded.n_baru, jarak_baru = excluded.jarak_baru, fitted_at = excluded.fitted_at
+    """, (json.dumps(model.mean.tolist()), json.dumps(model.std.tolist()), model.inertia_per_titik,
+          model.n_fit, model.n_baru, model.jarak_baru))
+
+
+def muat_model(conn):
+    """
+    Model tersimpan, atau dibangun dari cluster_id yang sudah ada (mis. hasil
+    import CSV, belum disimpan sampai ditulis tetapkan_cluster/latih_ulang).
+    Hanya membaca; None kalau belum ada model maupun cluster_id.
+    """
+    c = conn.cursor()
+    info = c.execute("SELECT mean, std, inertia_per_titik, n_fit, n_baru, jarak_baru FROM cluster_model WHERE id = 1").fetchone()
+    if info is not None:
+        baris = c.execute("SELECT jumlah, centroid FROM cluster_centroids ORDER BY cluster_id").fetchall()
+        return ModelCluster(json.loads(info[0]), json.loads(info[1]), [json.loads(b[1]) for b in baris],
+                            [b[0] for b in baris], info[2], info[3], info[4], info[5])
+
+    return _model_dari_cluster_id(muat_fitur(conn))
+
+
+def _model_dari_cluster_id(df):
+    """Model dari cluster_id yang sudah ada di fitur `df`; None kalau belum ada sama sekali."""
+    if df.empty:
+        return None
+    X = df[FITUR].to_numpy(dtype=float)
+    mean, std = parameter_standar(X)
+    Z = (X - mean) / std
+    ada = df['cluster_id'].notna().to_numpy()
+    if ada.any():
+        # Pertahankan Cluster_ID offline: centroid = rata-rata tiap cluster lama
+        label = df['cluster_id'].to_numpy()[ada].astype(int)
+        k = int(label.max()) + 1
+        centroid = np.array([Z[ada][label == i].mean(0) if (label == i).any() else Z.mean(0) for i in range(k)])
+        _, d2 = _terdekat(Z[ada], centroid)
+        return ModelCluster(mean, std, centroid, np.bincount(label, minlength=k), float(d2.mean()), int(ada.sum()))
+    return None
+
+
+def latih_ulang(conn):
+    """
+    Fit ulang mini-batch k-means untuk seluruh roster dan tulis cluster_id semua
+    penjahit. Tidak commit: jalankan lewat jalankan_tulis(latih_ulang).
+    """
+    df = muat_fitur(conn)
+    if df.empty:
+        return None
+    X = df[FITUR].to_numpy(dtype=float)
+    mean, std = parameter_standar(X)
+    Z = (X - mean) / std
+
+    lama = None
+    c = conn.cursor()
+    baris = c.execute("SELECT centroid FROM cluster_centroids ORDER BY cluster_id").fetchall()
+    info = c.execute("SELECT mean, std FROM cluster_model WHERE id = 1").fetchone()
+    if baris and info is not None:
+        # Centroid lama dipindah ke ruang standardisasi baru untuk inisialisasi & penyamaan ID
+        asli = np.array([json.loads(b[0]) for b in baris]) * np.array(json.loads(info[1])) + np.array(json.loads(info[0]))
+        lama = (asli - mean) / std
+
+    k = JUMLAH_CLUSTER if lama is None else len(lama)
+    centroid, jumlah, label, inertia = minibatch_kmeans(Z, k, init=lama)
+    urutan = _samakan_id(centroid, lama)
+    balik = np.argsort(urutan)
+    centroid, jumlah, label = centroid[urutan], jumlah[urutan], balik[label]
+
+    model = ModelCluster(mean, std, centroid, jumlah, inertia / len(Z), len(Z))
+    _simpan_model(conn, model)
+    c.executemany("UPDATE tailor_attributes SET cluster_id = ? WHERE tailor_id = ?",
+                  [(int(l), int(t)) for l, t in zip(label, df['tailor_id'])])
+    return model
+
+
+_lock_latar = threading.Lock()
+
+
+def latih_ulang_latar():
+    """Jalankan latih_ulang di thread background (satu per proses). Return True kalau dimulai."""
+    if not _lock_latar.acquire(blocking=False):
+        return False
+
+    def kerja():
+        try:
+            jalankan_tulis(latih_ulang)
+        finally:
+            _lock_latar.release()
+
+    threading.Thread(target=kerja, name="latih-ulang-cluster", daemon=True).start()
+    return True
+
+
+def tetapkan_cluster(conn, tailor_id, baru=True):
+    """
+    Tempatkan satu penjahit (baru / diedit) ke cluster terdekat tanpa fit ulang.
+    Untuk penjahit baru, centroid ikut bergeser (update mini-batch). Fit ulang
+    dijalankan di background kalau drift sudah melewati batas. Tidak commit:
+    panggil di dalam transaksi jalankan_tulis (bersama insert/update penjahitnya).
+    Return: cluster_id (None kalau penjahit belum punya atribut)
+    """
+    model = muat_model(conn) or latih_ulang(conn)
+    df = muat_fitur(conn, tailor_id)
+    if model is None or df.empty:
+        return None
+
+    z = model.standardisasi(df[FITUR].to_numpy(dtype=float))
+    label, d2 = _terdekat(z, model.centroid)
+    cluster = int(label[0])
+    if baru:
+        model.jumlah[cluster] += 1
+        model.centroid[cluster] += (z[0] - model.centroid[cluster]) / model.jumlah[cluster]
+    model.n_baru += 1
+    model.jarak_baru += float(d2[0])
+
+    _simpan_model(conn, model)
+    conn.execute("UPDATE tailor_attributes SET cluster_id = ? WHERE tailor_id = ?", (cluster, tailor_id))
+
+    if model.perlu_latih_ulang():
+        latih_ulang_latar()
+    return cluster
+
+
+def label_cluster():
+    """
+    {cluster_id: label} dari model tersimpan, atau dari centroid cluster_id hasil
+    import. Lewat baca_sql, jadi rerun halaman tanpa perubahan dilayani dari cache.
+    """
+    df = baca_sql("SELECT cluster_id, label FROM cluster_centroids ORDER BY cluster_id")
+    if not df.empty:
+        return dict(zip(df['cluster_id'].astype(int), df['label']))
+    model = _model_dari_cluster_id(baca_sql(_query_fitur()))
+    return label_dari_centroid(model) if model is not None else {}
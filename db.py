@@ -1,8 +1,485 @@
+import os
+import random
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from db_init import jalankan_migrasi
 
 DB_NAME = "koperasi.db"
 
-def get_connection():
-    conn = sqlite3.connect(DB_NAME, check_same_thread=False)
+# Profil penyimpanan (PRAGMA per koneksi). Pilih lewat env KOPERASI_DB_PROFIL,
+# tiap nilai bisa ditimpa env KOPERASI_DB_<PRAGMA>, mis. KOPERASI_DB_CACHE_SIZE=-65536.
+# - wal: banyak admin sekaligus; pembaca tidak memblokir penulis (default)
+# - aman: WAL tapi fsync tiap commit (tahan mati listrik di tengah transaksi)
+# - bawaan: rollback journal seperti sebelumnya, hanya ditambah busy_timeout
+PROFIL_PENYIMPANAN = {
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -32768,        # KiB (negatif) -> 32 MB per koneksi
+        "mmap_size": 268435456,      # 256 MB
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,        # ms
+    },
+    "aman": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -32768,
+        "mmap_size": 0,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "bawaan": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+    },
+}
+_profil = None
+
+# Batas koneksi per file DB per proses, dan berapa lama menunggu kalau semua sedang dipakai
+POOL_MAKS = int(os.environ.get("KOPERASI_POOL_MAKS", 16))
+POOL_TUNGGU_DETIK = float(os.environ.get("KOPERASI_POOL_TUNGGU", 10))
+
+# Batas memori cache hasil query baca (baca_sql), dipakai bersama semua sesi
+CACHE_QUERY_MB = float(os.environ.get("KOPERASI_CACHE_QUERY_MB", 64))
+
+
+class KoneksiPool(sqlite3.Connection):
+    """
+    Koneksi milik PoolKoneksi: close() mengembalikannya ke pool, bukan menutup.
+    Tetap subclass sqlite3.Connection supaya pandas.read_sql_query dll. jalan biasa.
+    """
+
+    _pool = None
+
+    def close(self):
+        if self._pool is None:
+            super().close()
+        else:
+            self._pool.kembalikan(self)
+
+    def tutup(self):
+        """Benar-benar tutup koneksi (dipakai pool)."""
+        self._pool = None
+        super().close()
+
+
+def atur_profil(profil):
+    """Ganti profil penyimpanan untuk koneksi BARU: nama di PROFIL_PENYIMPANAN atau dict PRAGMA."""
+    global _profil
+    _profil = dict(PROFIL_PENYIMPANAN[profil] if isinstance(profil, str) else profil)
+
+
+def profil_penyimpanan():
+    """PRAGMA yang dipakai koneksi baru (profil aktif + timpaan env)."""
+    if _profil is None:
+        atur_profil(os.environ.get("KOPERASI_DB_PROFIL", "wal"))
+    profil = dict(_profil)
+    for pragma in list(profil):
+        nilai = os.environ.get(f"KOPERASI_DB_{pragma.upper()}")
+        if nilai is not None:
+            profil[pragma] = nilai
+    return profil
+
+
+def terapkan_profil(conn, profil):
+    for pragma, nilai in profil.items():
+        try:
+            conn.execute(f"PRAGMA {pragma} = {nilai}").fetchall()
+        except sqlite3.OperationalError:
+            # Mis. journal_mode=WAL di file system yang tidak mendukung: tetap jalan dengan mode lama
+            pass
+
+
+def buka_koneksi(path=None, factory=sqlite3.Connection, **kwargs):
+    """Koneksi baru di luar pool (mis. untuk yang butuh PRAGMA data_version sendiri)."""
+    profil = profil_penyimpanan()
+    timeout = int(profil.get("busy_timeout", 5000)) / 1000
+    conn = sqlite3.connect(path or DB_NAME, check_same_thread=False, factory=factory, timeout=timeout, **kwargs)
+    terapkan_profil(conn, profil)
     conn.row_factory = sqlite3.Row
     return conn
+
+
+def _terkunci(error):
+    pesan = str(error).lower()
+    return "locked" in pesan or "busy" in pesan
+
+
+def jalankan_tulis(fungsi, *args, percobaan=6, jeda_awal=0.05, jeda_maks=2.0, **kwargs):
+    """
+    Jalankan `fungsi(conn, *args, **kwargs)` sebagai satu transaksi tulis
+    (BEGIN IMMEDIATE ... COMMIT) dengan koneksi dari pool. Kalau DB sedang
+    dikunci penulis lain lebih lama dari busy_timeout, transaksi di-rollback dan
+    diulang dengan jeda eksponensial + jitter. Return hasil `fungsi`.
+    """
+    p = pool()
+    for ke in range(percobaan):
+        conn = p.ambil()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            hasil = fungsi(conn, *args, **kwargs)
+            conn.commit()
+            return hasil
+        except sqlite3.OperationalError as e:
+            if conn.in_transaction:
+                conn.rollback()
+            if not _terkunci(e) or ke == percobaan - 1:
+                raise
+            p.catat_ulang_tulis()
+            time.sleep(min(jeda_maks, jeda_awal * 2 ** ke) * random.uniform(0.5, 1.5))
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+
+class PoolKoneksi:
+    """
+    Pool koneksi SQLite per proses, dibatasi `maks` koneksi, aman dipakai
+    banyak thread/sesi Streamlit.
+
+    - ambil(): pakai koneksi menganggur (dicek dulu dengan SELECT 1), buat baru
+      kalau belum mencapai batas, atau tunggu sampai ada yang kembali.
+    - close() pada koneksi mengembalikannya: transaksi yang belum di-commit
+      di-rollback dan row_factory dikembalikan ke sqlite3.Row. Pemakai wajib
+      mengembalikan sendiri; paling aman lewat `with koneksi() as conn:`,
+      baca_sql atau jalankan_tulis.
+    """
+
+    def __init__(self, path, maks=POOL_MAKS, tunggu_detik=POOL_TUNGGU_DETIK):
+        self.path = path
+        self.maks = maks
+        self.tunggu_detik = tunggu_detik
+        self._cond = threading.Condition()
+        self._menganggur = []
+        self._dipinjam = []
+        self.dibuat = self.dibuang = 0
+        self.jumlah_ambil = self.jumlah_tunggu = 0
+        self.total_tunggu = self.maks_tunggu = 0.0
+        self.ulang_tulis = 0
+        self._pengawas = None
+
+    def pengawas(self):
+        with self._cond:
+            if self._pengawas is None:
+                self._pengawas = _Pengawas(self.path)
+            return self._pengawas
+
+    def _buat(self):
+        conn = buka_koneksi(self.path, factory=KoneksiPool)
+        conn._pool = self
+        self.dibuat += 1
+        return conn
+
+    def _bersihkan(self, conn):
+        """Siapkan koneksi untuk peminjam berikutnya. Return False kalau rusak."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _buang(self, conn):
+        self.dibuang += 1
+        try:
+            conn.tutup()
+        except sqlite3.Error:
+            pass
+
+    def _sehat(self, conn):
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def ambil(self):
+        mulai = time.perf_counter()
+        tenggat = mulai + self.tunggu_detik
+        with self._cond:
+            self.jumlah_ambil += 1
+            menunggu = False
+            while True:
+                while self._menganggur:
+                    conn = self._menganggur.pop()
+                    if self._sehat(conn):
+                        break
+                    self._buang(conn)
+                else:
+                    conn = None
+                if conn is None and len(self._dipinjam) < self.maks:
+                    conn = self._buat()
+                if conn is not None:
+                    break
+
+                sisa = tenggat - time.perf_counter()
+                if sisa <= 0:
+                    raise sqlite3.OperationalError(
+                        f"Pool koneksi penuh ({self.maks} dipakai) setelah menunggu {self.tunggu_detik:g} detik")
+                menunggu = True
+                self._cond.wait(sisa)
+
+            self._dipinjam.append(conn)
+            if menunggu:
+                tunggu = time.perf_counter() - mulai
+                self.jumlah_tunggu += 1
+                self.total_tunggu += tunggu
+                self.maks_tunggu = max(self.maks_tunggu, tunggu)
+            return conn
+
+    def kembalikan(self, conn):
+        with self._cond:
+            for i, c in enumerate(self._dipinjam):
+                if c is conn:
+                    del self._dipinjam[i]
+                    break
+            else:
+                return  # sudah dikembalikan
+            if self._bersihkan(conn):
+                self._menganggur.append(conn)
+            else:
+                self._buang(conn)
+            self._cond.notify()
+
+    def catat_ulang_tulis(self):
+        """Hitung satu transaksi tulis yang diulang karena DB terkunci (lihat jalankan_tulis)."""
+        with self._cond:
+            self.ulang_tulis += 1
+
+    def statistik(self):
+        with self._cond:
+            return {
+                "maks": self.maks,
+                "dipinjam": len(self._dipinjam),
+                "menganggur": len(self._menganggur),
+                "dibuat": self.dibuat,
+                "dibuang": self.dibuang,
+                "jumlah_ambil": self.jumlah_ambil,
+                "jumlah_tunggu": self.jumlah_tunggu,
+                "rata_tunggu_ms": self.total_tunggu / self.jumlah_tunggu * 1000 if self.jumlah_tunggu else 0.0,
+                "maks_tunggu_ms": self.maks_tunggu * 1000,
+                "ulang_tulis": self.ulang_tulis,
+            }
+
+    def tutup_semua(self):
+        """Tutup koneksi menganggur (koneksi yang sedang dipinjam ditutup saat dikembalikan)."""
+        with self._cond:
+            for conn in self._menganggur:
+                conn.tutup()
+            self._menganggur.clear()
+            for conn in self._dipinjam:
+                conn._pool = None
+            self._dipinjam.clear()
+            if self._pengawas is not None:
+                self._pengawas.tutup()
+                self._pengawas = None
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def pool(path=None):
+    """Pool untuk file DB `path` (default DB_NAME), dibuat sekali per proses."""
+    path = os.path.abspath(path or DB_NAME)
+    with _pools_lock:
+        if path not in _pools:
+            # Sekali per proses per file: pastikan skema sudah versi terbaru
+            conn = buka_koneksi(path)
+            try:
+                jalankan_migrasi(conn)
+            finally:
+                conn.close()
+            _pools[path] = PoolKoneksi(path)
+        return _pools[path]
+
+
+def get_connection():
+    """Pinjam koneksi dari pool; WAJIB dikembalikan dengan close(). Lebih aman pakai koneksi()."""
+    return pool().ambil()
+
+
+@contextmanager
+def koneksi(path=None):
+    """
+    `with koneksi() as conn:` pinjam koneksi pool dan kembalikan saat blok selesai
+    (juga kalau error). Yang belum di-commit di-rollback saat dikembalikan.
+    """
+    conn = pool(path).ambil()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+class _Pengawas:
+    """
+    Koneksi khusus per file DB yang tidak pernah menulis, jadi PRAGMA data_version-nya
+    berubah tiap ada commit dari koneksi/proses lain. Tanpa cache statement supaya
+    authorizer selalu terpanggil saat mencari tabel yang dibaca query.
+    """
+
+    def __init__(self, path):
+        self._conn = buka_koneksi(path, cached_statements=0)
+        self._lock = threading.Lock()
+        self._data_version = None
+        self._versi = {}
+        self._tabel_query = {}
+
+    def tutup(self):
+        with self._lock:
+            self._conn.close()
+
+    def status(self):
+        """(data_version, {tabel: versi perubahan}); tabel perubahan dibaca ulang hanya kalau ada commit."""
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version != self._data_version:
+                try:
+                    self._versi = dict(self._conn.execute("SELECT nama, versi FROM perubahan_tabel").fetchall())
+                except sqlite3.OperationalError:
+                    self._versi = {}
+                self._data_version = data_version
+            return data_version, self._versi
+
+    def tabel_dibaca(self, sql, params):
+        """Nama tabel yang dibaca `sql` (lewat authorizer saat prepare EXPLAIN), diingat per SQL."""
+        with self._lock:
+            if sql not in self._tabel_query:
+                tabel = set()
+
+                def catat(aksi, arg1, *_):
+                    if aksi == sqlite3.SQLITE_READ and arg1:
+                        tabel.add(arg1)
+                    return sqlite3.SQLITE_OK
+
+                self._conn.set_authorizer(catat)
+                try:
+                    self._conn.execute(f"EXPLAIN {sql}", params or ()).fetchall()
+                finally:
+                    self._conn.set_authorizer(None)
+                self._tabel_query[sql] = frozenset(tabel)
+            return self._tabel_query[sql]
+
+
+def _kunci_params(params):
+    if params is None:
+        return ()
+    if isinstance(params, dict):
+        return tuple(sorted(params.items()))
+    return tuple(params)
+
+
+class CacheQuery:
+    """
+    Cache DataFrame hasil query baca, kunci (file DB, SQL, params), LRU dibatasi
+    `maks_mb` & `maks_entri`. Entri tetap dipakai selama tabel yang dibaca query
+    tidak berubah:
+    - data_version pengawas sama seperti saat entri dicek terakhir: tidak ada
+      commit sama sekali, langsung dipakai tanpa query
+    - kalau berubah, bandingkan penghitung perubahan_tabel (dijaga trigger) untuk
+      tabel yang dibaca query saja. Query yang membaca tabel tanpa penghitung
+      dibatalkan oleh commit apa pun.
+    Versi dicatat SEBELUM query dijalankan, jadi commit di tengah-tengah paling
+    buruk membuat entri dihitung ulang, tidak pernah basi.
+    """
+
+    def __init__(self, maks_mb=64, maks_entri=512):
+        self.maks_bytes = int(maks_mb * 2**20)
+        self.maks_entri = maks_entri
+        self._lock = threading.Lock()
+        self._entri = OrderedDict()  # kunci -> [df, bytes, data_version, {tabel: versi} | None]
+        self._bytes = 0
+        self.hit = self.miss = self.basi = self.dibuang = 0
+
+    def _hapus(self, kunci):
+        entri = self._entri.pop(kunci)
+        self._bytes -= entri[1]
+
+    def _masih_valid(self, entri, data_version, versi):
+        if entri[2] == data_version:
+            return True
+        if entri[3] is None or any(versi.get(t) != v for t, v in entri[3].items()):
+            return False
+        entri[2] = data_version
+        return True
+
+    def ambil(self, p, sql, params=None):
+        """DataFrame hasil `sql` (SALINAN, boleh diubah pemanggil) dari cache atau DB lewat pool `p`."""
+        import pandas as pd
+
+        kunci = (p.path, sql, _kunci_params(params))
+        pengawas = p.pengawas()
+        data_version, versi = pengawas.status()
+        with self._lock:
+            entri = self._entri.get(kunci)
+            if entri is not None:
+                if self._masih_valid(entri, data_version, versi):
+                    self._entri.move_to_end(kunci)
+                    self.hit += 1
+                    return entri[0].copy()
+                self._hapus(kunci)
+                self.basi += 1
+            self.miss += 1
+
+        tabel = pengawas.tabel_dibaca(sql, params)
+        dependensi = {t: versi[t] for t in tabel} if all(t in versi for t in tabel) else None
+        conn = p.ambil()
+        try:
+            df = pd.read_sql_query(sql, conn, params=params)
+        finally:
+            conn.close()
+
+        ukuran = int(df.memory_usage(index=True, deep=True).sum())
+        with self._lock:
+            if ukuran <= self.maks_bytes:
+                if kunci in self._entri:
+                    self._hapus(kunci)
+                self._entri[kunci] = [df, ukuran, data_version, dependensi]
+                self._bytes += ukuran
+                while self._bytes > self.maks_bytes or len(self._entri) > self.maks_entri:
+                    self._hapus(next(iter(self._entri)))
+                    self.dibuang += 1
+        return df.copy()
+
+    def statistik(self):
+        with self._lock:
+            return {"entri": len(self._entri), "mb": self._bytes / 2**20, "hit": self.hit,
+                    "miss": self.miss, "basi": self.basi, "dibuang": self.dibuang}
+
+    def kosongkan(self):
+        with self._lock:
+            self._entri.clear()
+            self._bytes = 0
+
+
+_cache_query = CacheQuery(maks_mb=CACHE_QUERY_MB)
+
+
+def baca_sql(sql, params=None, path=None):
+    """
+    Pengganti pd.read_sql_query(sql, conn, params=params) untuk halaman: lewat pool
+    dan cache bersama, rerun tanpa tulis dilayani dari memori. Jangan dipakai
+    untuk query yang hasilnya bergantung waktu (DATE('now') dll.).
+    """
+    return _cache_query.ambil(pool(path), sql, params)
+
+
+def statistik_cache_query():
+    return _cache_query.statistik()
+
+
+def statistik_pool():
+    """Metrik semua pool di proses ini: {path: dict statistik}."""
+    with _pools_lock:
+        daftar = list(_pools.items())
+    return {path: p.statistik() for path, p in daftar}
@@ -1,10 +1,274 @@
 # db_init.py (Script untuk inisialisasi database)
+import os
 import sqlite3
 
-def init_db():
-    conn = sqlite3.connect('koperasi.db')
-    c = conn.cursor()
+def create_assignment_drafts(c):
+    # Draft rencana alokasi global (belum jadi assignment sungguhan)
+    c.execute('''CREATE TABLE IF NOT EXISTS assignment_drafts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        plan_id TEXT,
+        project_id INTEGER,
+        tailor_id INTEGER,
+        amount_assigned INTEGER,
+        est_speed REAL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(project_id) REFERENCES projects(id),
+        FOREIGN KEY(tailor_id) REFERENCES tailors(id)
+    )''')
+
+# Deadline pengganti untuk assignment yang project-nya tidak punya deadline / sudah dihapus
+TANPA_DEADLINE = '9999-12-31'
+
+def create_tailor_load(c):
+    # Beban terbuka per penjahit per deadline (assignment berstatus 'assigned').
+    # Dijaga trigger, jadi selalu sinkron dengan tabel assignments.
+    baru = c.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='tailor_load'").fetchone() is None
+    c.execute('''CREATE TABLE IF NOT EXISTS tailor_load (
+        tailor_id INTEGER NOT NULL,
+        deadline DATE NOT NULL,
+        open_pcs INTEGER NOT NULL,
+        PRIMARY KEY (tailor_id, deadline)
+    )''')
+
+    deadline_new = f"COALESCE((SELECT deadline FROM projects WHERE id = NEW.project_id), '{TANPA_DEADLINE}')"
+    deadline_old = f"COALESCE((SELECT deadline FROM projects WHERE id = OLD.project_id), '{TANPA_DEADLINE}')"
+    tambah = f'''
+        INSERT INTO tailor_load (tailor_id, deadline, open_pcs)
+        SELECT NEW.tailor_id, {deadline_new}, NEW.amount_assigned WHERE NEW.status = 'assigned'
+        ON CONFLICT(tailor_id, deadline) DO UPDATE SET open_pcs = open_pcs + excluded.open_pcs;'''
+    kurang = f'''
+        UPDATE tailor_load SET open_pcs = open_pcs - OLD.amount_assigned
+        WHERE OLD.status = 'assigned' AND tailor_id = OLD.tailor_id AND deadline = {deadline_old};'''
+    bersih = "DELETE FROM tailor_load WHERE open_pcs <= 0;"
+
+    c.execute(f"CREATE TRIGGER IF NOT EXISTS trg_load_assign_insert AFTER INSERT ON assignments BEGIN {tambah} END")
+    c.execute(f"CREATE TRIGGER IF NOT EXISTS trg_load_assign_update AFTER UPDATE ON assignments BEGIN {kurang} {tambah} {bersih} END")
+    c.execute(f"CREATE TRIGGER IF NOT EXISTS trg_load_assign_delete AFTER DELETE ON assignments BEGIN {kurang} {bersih} END")
+
+    # Deadline project berubah / project dihapus -> pindahkan beban penjahitnya
+    per_tailor = "SELECT SUM(a.amount_assigned) FROM assignments a WHERE a.project_id = OLD.id AND a.status = 'assigned' AND a.tailor_id = tailor_load.tailor_id"
+    lepas = f'''
+        UPDATE tailor_load SET open_pcs = open_pcs - ({per_tailor})
+        WHERE deadline = COALESCE(OLD.deadline, '{TANPA_DEADLINE}')
+          AND tailor_id IN (SELECT tailor_id FROM assignments WHERE project_id = OLD.id AND status = 'assigned');'''
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_load_project_deadline AFTER UPDATE OF deadline ON projects
+        WHEN OLD.deadline IS NOT NEW.deadline BEGIN {lepas}
+        INSERT INTO tailor_load (tailor_id, deadline, open_pcs)
+        SELECT tailor_id, COALESCE(NEW.deadline, '{TANPA_DEADLINE}'), SUM(amount_assigned) FROM assignments
+        WHERE project_id = NEW.id AND status = 'assigned' GROUP BY tailor_id
+        ON CONFLICT(tailor_id, deadline) DO UPDATE SET open_pcs = open_pcs + excluded.open_pcs;
+        {bersih} END''')
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_load_project_delete AFTER DELETE ON projects BEGIN {lepas}
+        INSERT INTO tailor_load (tailor_id, deadline, open_pcs)
+        SELECT tailor_id, '{TANPA_DEADLINE}', SUM(amount_assigned) FROM assignments
+        WHERE project_id = OLD.id AND status = 'assigned' GROUP BY tailor_id
+        ON CONFLICT(tailor_id, deadline) DO UPDATE SET open_pcs = open_pcs + excluded.open_pcs;
+        {bersih} END''')
+
+    if baru:
+        # Isi awal dari assignment yang sudah ada
+        c.execute(f'''INSERT INTO tailor_load (tailor_id, deadline, open_pcs)
+            SELECT a.tailor_id, COALESCE(p.deadline, '{TANPA_DEADLINE}'), SUM(a.amount_assigned)
+            FROM assignments a LEFT JOIN projects p ON p.id = a.project_id
+            WHERE a.status = 'assigned'
+            GROUP BY a.tailor_id, COALESCE(p.deadline, '{TANPA_DEADLINE}')
+            HAVING SUM(a.amount_assigned) > 0''')
+
+def create_tailor_capabilities(c):
+    # Kemampuan penjahit per jenis pakaian (pcs/hari), pengganti kolom speed di CSV
+    c.execute('''CREATE TABLE IF NOT EXISTS tailor_capabilities (
+        tailor_id INTEGER NOT NULL,
+        clothes_type TEXT NOT NULL,
+        pcs_per_day REAL NOT NULL,
+        PRIMARY KEY (tailor_id, clothes_type),
+        FOREIGN KEY(tailor_id) REFERENCES tailors(id)
+    )''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_capabilities_type ON tailor_capabilities(clothes_type, pcs_per_day)")
+
+    # Atribut penilaian penjahit (dari DATA_FINAL_CLUSTERED.csv)
+    c.execute('''CREATE TABLE IF NOT EXISTS tailor_attributes (
+        tailor_id INTEGER PRIMARY KEY,
+        kode_penjahit TEXT,
+        kerapian INTEGER,
+        komitmen INTEGER,
+        ketepatan_waktu INTEGER,
+        quantity INTEGER,
+        cluster_id INTEGER,
+        FOREIGN KEY(tailor_id) REFERENCES tailors(id)
+    )''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_attributes_cluster ON tailor_attributes(cluster_id)")
+
+# Bobot observasi terbaru pada estimasi speed EWMA (tailor_speed)
+ALPHA_SPEED = 0.3
+
+def create_tailor_speed(c):
+    # Speed terukur per penjahit x jenis pakaian (projects.clothes_type), dijaga trigger.
+    # ewma_obs = jumlah ALPHA*(1-ALPHA)^k * observasi; estimasi speed untuk prior
+    # (speed kapabilitas) = (1-ALPHA)^n_obs * prior + ewma_obs, jadi prior tetap bisa diubah.
+    baru = c.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='tailor_speed'").fetchone() is None
+    c.execute('''CREATE TABLE IF NOT EXISTS assignment_times (
+        assignment_id INTEGER PRIMARY KEY,
+        assigned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        submitted_at TIMESTAMP
+    )''')
+    c.execute('''CREATE TABLE IF NOT EXISTS tailor_speed (
+        tailor_id INTEGER NOT NULL,
+        clothes_type TEXT NOT NULL,
+        ewma_obs REAL NOT NULL,
+        n_obs INTEGER NOT NULL,
+        last_speed REAL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (tailor_id, clothes_type),
+        FOREIGN KEY(tailor_id) REFERENCES tailors(id)
+    )''')
+
+    c.execute('''CREATE TRIGGER IF NOT EXISTS trg_times_assign_insert AFTER INSERT ON assignments BEGIN
+        INSERT OR IGNORE INTO assignment_times (assignment_id) VALUES (NEW.id); END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS trg_times_assign_delete AFTER DELETE ON assignments BEGIN
+        DELETE FROM assignment_times WHERE assignment_id = OLD.id; END''')
 
+    # Selesai dikerjakan (assigned -> submitted, atau langsung paid): satu observasi
+    # pcs / hari kerja sejak ditugaskan (assignment lama: sejak tanggal order project)
+    durasi = '''MAX(1.0, julianday('now') - julianday(COALESCE(
+            (SELECT assigned_at FROM assignment_times WHERE assignment_id = NEW.id),
+            (SELECT order_date FROM projects WHERE id = NEW.project_id))))'''
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_speed_assign_submit AFTER UPDATE OF status ON assignments
+        WHEN OLD.status = 'assigned' AND NEW.status IN ('submitted', 'paid')
+         AND (SELECT clothes_type FROM projects WHERE id = NEW.project_id) IS NOT NULL BEGIN
+        UPDATE assignment_times SET submitted_at = CURRENT_TIMESTAMP WHERE assignment_id = NEW.id;
+        INSERT INTO tailor_speed (tailor_id, clothes_type, ewma_obs, n_obs, last_speed)
+        SELECT NEW.tailor_id, LOWER(p.clothes_type), {ALPHA_SPEED} * NEW.amount_assigned / {durasi}, 1,
+               NEW.amount_assigned / {durasi}
+        FROM projects p WHERE p.id = NEW.project_id
+        ON CONFLICT(tailor_id, clothes_type) DO UPDATE SET
+            ewma_obs = (1 - {ALPHA_SPEED}) * ewma_obs + {ALPHA_SPEED} * excluded.last_speed,
+            n_obs = n_obs + 1,
+            last_speed = excluded.last_speed,
+            updated_at = CURRENT_TIMESTAMP;
+        END''')
+
+    if baru:
+        # Isi awal dari assignment yang sudah selesai, urut id; tanpa waktu submit,
+        # durasinya rentang order -> deadline project
+        for tailor_id, clothes_type, speed in c.execute('''
+                SELECT a.tailor_id, LOWER(p.clothes_type),
+                       a.amount_assigned / MAX(1.0, julianday(p.deadline) - julianday(p.order_date))
+                FROM assignments a JOIN projects p ON p.id = a.project_id
+                WHERE a.status IN ('submitted', 'paid') AND p.clothes_type IS NOT NULL
+                  AND julianday(p.deadline) IS NOT NULL AND julianday(p.order_date) IS NOT NULL
+                ORDER BY a.id''').fetchall():
+            c.execute(f'''INSERT INTO tailor_speed (tailor_id, clothes_type, ewma_obs, n_obs, last_speed)
+                VALUES (?, ?, {ALPHA_SPEED} * ?, 1, ?)
+                ON CONFLICT(tailor_id, clothes_type) DO UPDATE SET
+                    ewma_obs = (1 - {ALPHA_SPEED}) * ewma_obs + {ALPHA_SPEED} * excluded.last_speed,
+                    n_obs = n_obs + 1, last_speed = excluded.last_speed''',
+                (tailor_id, clothes_type, speed, speed))
+
+def create_cluster_model(c):
+    # Model clustering penjahit (mini-batch k-means), dipakai clustering.py
+    c.execute('''CREATE TABLE IF NOT EXISTS cluster_centroids (
+        cluster_id INTEGER PRIMARY KEY,
+        label TEXT,
+        jumlah INTEGER,
+        centroid TEXT -- JSON list, ruang fitur terstandardisasi
+    )''')
+    c.execute('''CREATE TABLE IF NOT EXISTS cluster_model (
+        id INTEGER PRIMARY KEY CHECK(id = 1),
+        mean TEXT,
+        std TEXT,
+        inertia_per_titik REAL,
+        n_fit INTEGER,
+        n_baru INTEGER DEFAULT 0,
+        jarak_baru REAL DEFAULT 0,
+        fitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )''')
+
+# Kain dihitung "stok menipis" kalau stok akhirnya (IN - OUT) di bawah batas ini
+BATAS_STOK_MENIPIS = 10
+
+def create_dashboard_summary(c):
+    # Metrik Dashboard dalam satu baris (id=1), dijaga trigger: baca tetap murah
+    # berapa pun panjang riwayat. fabric_stock = stok akhir per kain (kunci '' untuk
+    # fabric_type NULL), n_baris = jumlah baris inventory kain itu.
+    baru = c.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='dashboard_summary'").fetchone() is None
+    c.execute('''CREATE TABLE IF NOT EXISTS fabric_stock (
+        fabric_type TEXT PRIMARY KEY,
+        stock REAL NOT NULL DEFAULT 0,
+        n_baris INTEGER NOT NULL DEFAULT 0
+    )''')
+    c.execute('''CREATE TABLE IF NOT EXISTS dashboard_summary (
+        id INTEGER PRIMARY KEY CHECK(id = 1),
+        total_omzet REAL NOT NULL DEFAULT 0,
+        total_spend REAL NOT NULL DEFAULT 0,
+        active_projects INTEGER NOT NULL DEFAULT 0,
+        idle_tailors INTEGER NOT NULL DEFAULT 0,
+        low_stock_count INTEGER NOT NULL DEFAULT 0
+    )''')
+
+    ubah = "UPDATE dashboard_summary SET"
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_summary_project_insert AFTER INSERT ON projects BEGIN
+        {ubah} total_omzet = total_omzet + COALESCE(NEW.price_per_item * NEW.amount, 0),
+            active_projects = active_projects + (COALESCE(NEW.status, '') = 'ongoing') WHERE id = 1; END''')
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_summary_project_update
+        AFTER UPDATE OF price_per_item, amount, status ON projects BEGIN
+        {ubah} total_omzet = total_omzet - COALESCE(OLD.price_per_item * OLD.amount, 0)
+                                         + COALESCE(NEW.price_per_item * NEW.amount, 0),
+            active_projects = active_projects - (COALESCE(OLD.status, '') = 'ongoing')
+                                              + (COALESCE(NEW.status, '') = 'ongoing') WHERE id = 1; END''')
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_summary_project_delete AFTER DELETE ON projects BEGIN
+        {ubah} total_omzet = total_omzet - COALESCE(OLD.price_per_item * OLD.amount, 0),
+            active_projects = active_projects - (COALESCE(OLD.status, '') = 'ongoing') WHERE id = 1; END''')
+
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_summary_purchase_insert AFTER INSERT ON purchases BEGIN
+        {ubah} total_spend = total_spend + COALESCE(NEW.price, 0) WHERE id = 1; END''')
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_summary_purchase_update AFTER UPDATE OF price ON purchases BEGIN
+        {ubah} total_spend = total_spend - COALESCE(OLD.price, 0) + COALESCE(NEW.price, 0) WHERE id = 1; END''')
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_summary_purchase_delete AFTER DELETE ON purchases BEGIN
+        {ubah} total_spend = total_spend - COALESCE(OLD.price, 0) WHERE id = 1; END''')
+
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_summary_tailor_insert AFTER INSERT ON tailors BEGIN
+        {ubah} idle_tailors = idle_tailors + (COALESCE(NEW.status, '') = 'idle') WHERE id = 1; END''')
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_summary_tailor_update AFTER UPDATE OF status ON tailors BEGIN
+        {ubah} idle_tailors = idle_tailors - (COALESCE(OLD.status, '') = 'idle')
+                                           + (COALESCE(NEW.status, '') = 'idle') WHERE id = 1; END''')
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_summary_tailor_delete AFTER DELETE ON tailors BEGIN
+        {ubah} idle_tailors = idle_tailors - (COALESCE(OLD.status, '') = 'idle') WHERE id = 1; END''')
+
+    # Inventory: keluarkan kontribusi "menipis" kain yang berubah, ubah stoknya, lalu hitung lagi.
+    # Semua lewat primary key fabric_stock, tanpa scan riwayat.
+    def menipis(tanda, baris):
+        return (f"{ubah} low_stock_count = low_stock_count {tanda} (SELECT COUNT(*) FROM fabric_stock "
+                f"WHERE fabric_type = IFNULL({baris}.fabric_type, '') AND stock < {BATAS_STOK_MENIPIS}) WHERE id = 1;")
+    def mutasi(baris):
+        return f"(CASE WHEN {baris}.direction='IN' THEN COALESCE({baris}.amount, 0) ELSE -COALESCE({baris}.amount, 0) END)"
+    masuk = f'''{menipis('-', 'NEW')}
+        INSERT INTO fabric_stock (fabric_type, stock, n_baris) VALUES (IFNULL(NEW.fabric_type, ''), {mutasi('NEW')}, 1)
+        ON CONFLICT(fabric_type) DO UPDATE SET stock = stock + excluded.stock, n_baris = n_baris + 1;
+        {menipis('+', 'NEW')}'''
+    keluar = f'''{menipis('-', 'OLD')}
+        UPDATE fabric_stock SET stock = stock - {mutasi('OLD')}, n_baris = n_baris - 1
+        WHERE fabric_type = IFNULL(OLD.fabric_type, '');
+        DELETE FROM fabric_stock WHERE fabric_type = IFNULL(OLD.fabric_type, '') AND n_baris <= 0;
+        {menipis('+', 'OLD')}'''
+    c.execute(f"CREATE TRIGGER IF NOT EXISTS trg_summary_inventory_insert AFTER INSERT ON inventory BEGIN {masuk} END")
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS trg_summary_inventory_update
+        AFTER UPDATE OF fabric_type, amount, direction ON inventory BEGIN {keluar} {masuk} END''')
+    c.execute(f"CREATE TRIGGER IF NOT EXISTS trg_summary_inventory_delete AFTER DELETE ON inventory BEGIN {keluar} END")
+
+    if baru:
+        # Isi awal dari data yang sudah ada
+        c.execute(f'''INSERT INTO fabric_stock (fabric_type, stock, n_baris)
+            SELECT IFNULL(fabric_type, ''), SUM({mutasi('inventory')}), COUNT(*)
+            FROM inventory GROUP BY IFNULL(fabric_type, '')''')
+        c.execute(f'''INSERT INTO dashboard_summary (id, total_omzet, total_spend, active_projects, idle_tailors, low_stock_count)
+            SELECT 1,
+                (SELECT COALESCE(SUM(price_per_item * amount), 0) FROM projects),
+                (SELECT COALESCE(SUM(price), 0) FROM purchases),
+                (SELECT COUNT(*) FROM projects WHERE status = 'ongoing'),
+                (SELECT COUNT(*) FROM tailors WHERE status = 'idle'),
+                (SELECT COUNT(*) FROM fabric_stock WHERE stock < {BATAS_STOK_MENIPIS})''')
+
+def _migrasi_skema_dasar(c):
     # 1. Tabel Admin (Login sederhana)
     c.execute('''CREATE TABLE IF NOT EXISTS admin (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -86,9 +350,104 @@ def init_db():
         FOREIGN KEY(tailor_id) REFERENCES tailors(id)
     )''')
 
-    conn.commit()
+def _migrasi_indeks_halaman(c):
+    # Kolom yang difilter/di-join halaman (lihat cek_query_plan.py)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_assignments_project ON assignments(project_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_assignments_tailor ON assignments(tailor_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_purchases_project ON purchases(project_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_purchases_supplier ON purchases(supplier_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_purchases_date ON purchases(date)")
+    # Covering: rekap stok per kain (GROUP BY fabric_type) cukup membaca index
+    c.execute("CREATE INDEX IF NOT EXISTS idx_inventory_fabric ON inventory(fabric_type, direction, amount)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_inventory_created ON inventory(created_at)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_projects_status ON projects(status, deadline)")
+
+def pantau_perubahan(c, tabel):
+    # Penghitung perubahan per tabel untuk cache query di db.py: naik tiap baris di-insert/update/delete
+    c.execute("INSERT OR IGNORE INTO perubahan_tabel (nama) VALUES (?)", (tabel,))
+    naik = f"UPDATE perubahan_tabel SET versi = versi + 1 WHERE nama = '{tabel}';"
+    for aksi in ("INSERT", "UPDATE", "DELETE"):
+        c.execute(f"CREATE TRIGGER IF NOT EXISTS trg_ubah_{tabel}_{aksi.lower()} AFTER {aksi} ON {tabel} BEGIN {naik} END")
+
+def _migrasi_penghitung_perubahan(c):
+    c.execute('''CREATE TABLE IF NOT EXISTS perubahan_tabel (
+        nama TEXT PRIMARY KEY,
+        versi INTEGER NOT NULL DEFAULT 0
+    )''')
+    for tabel in ['admin', 'tailors', 'suppliers', 'projects', 'purchases', 'inventory', 'assignments',
+                  'assignment_drafts', 'tailor_load', 'tailor_capabilities', 'tailor_attributes',
+                  'cluster_centroids', 'cluster_model', 'assignment_times', 'tailor_speed']:
+        pantau_perubahan(c, tabel)
+
+def _migrasi_ringkasan_dashboard(c):
+    create_dashboard_summary(c)
+    pantau_perubahan(c, 'dashboard_summary')
+    pantau_perubahan(c, 'fabric_stock')
+
+# Tabel turunan per penjahit yang ikut dihapus bersama baris tailors
+TABEL_PER_PENJAHIT = ['tailor_attributes', 'tailor_capabilities', 'tailor_speed', 'tailor_load', 'assignment_drafts']
+
+def _migrasi_hapus_penjahit(c):
+    # Hapus penjahit -> atribut, kapabilitas, speed terukur, beban & draft-nya ikut terhapus
+    hapus = " ".join(f"DELETE FROM {tabel} WHERE tailor_id = OLD.id;" for tabel in TABEL_PER_PENJAHIT)
+    c.execute(f"CREATE TRIGGER IF NOT EXISTS trg_tailor_hapus AFTER DELETE ON tailors BEGIN {hapus} END")
+    # Yatim dari penghapusan sebelum trigger ini ada
+    for tabel in TABEL_PER_PENJAHIT:
+        c.execute(f"DELETE FROM {tabel} WHERE tailor_id NOT IN (SELECT id FROM tailors)")
+
+def _migrasi_impor_kapabilitas_awal(c):
+    # DB lama belum punya atribut/kapabilitas penjahit: isi sekali dari CSV supaya
+    # rekomendasi tidak jatuh ke nilai netral. Import ulang tetap lewat halaman Tailors.
+    from import_capabilities import CSV_PATH, impor_kapabilitas
+    if c.execute("SELECT 1 FROM tailor_attributes LIMIT 1").fetchone() is None and os.path.exists(CSV_PATH):
+        impor_kapabilitas(c.connection, CSV_PATH)
+
+# Migrasi skema berurutan; nomor terakhir yang sudah diterapkan disimpan di PRAGMA user_version.
+# Jangan ubah migrasi yang sudah dirilis: tambahkan migrasi baru di akhir daftar.
+MIGRASI = [
+    (1, "skema dasar", _migrasi_skema_dasar),
+    (2, "draft assignment (rencana alokasi global)", create_assignment_drafts),
+    (3, "beban penjahit (kapasitas terpakai, dijaga trigger)", create_tailor_load),
+    (4, "kapabilitas & atribut penjahit (diisi lewat import_capabilities.py)", create_tailor_capabilities),
+    (5, "model cluster penjahit", create_cluster_model),
+    (6, "speed terukur penjahit (EWMA dari assignment yang selesai, dijaga trigger)", create_tailor_speed),
+    (7, "indeks filter & join halaman", _migrasi_indeks_halaman),
+    (8, "penghitung perubahan tabel (cache query)", _migrasi_penghitung_perubahan),
+    (9, "ringkasan dashboard (dijaga trigger)", _migrasi_ringkasan_dashboard),
+    (10, "hapus data turunan bersama penjahit", _migrasi_hapus_penjahit),
+    (11, "impor awal kapabilitas & atribut penjahit dari CSV", _migrasi_impor_kapabilitas_awal),
+]
+
+def versi_skema(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def jalankan_migrasi(conn):
+    """
+    Terapkan migrasi yang belum ada di DB, masing-masing dalam satu transaksi
+    (BEGIN IMMEDIATE, jadi proses lain yang migrasi bersamaan menunggu lalu
+    melewatinya). Return versi skema akhir.
+    """
+    if conn.in_transaction:
+        conn.commit()
+    for versi, _, fungsi in MIGRASI:
+        if versi_skema(conn) >= versi:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if versi_skema(conn) < versi:
+                fungsi(conn.cursor())
+                conn.execute(f"PRAGMA user_version = {versi}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return versi_skema(conn)
+
+def init_db():
+    conn = sqlite3.connect('koperasi.db')
+    versi = jalankan_migrasi(conn)
     conn.close()
-    print("Database berhasil dibuat!")
+    print(f"Database berhasil dibuat! (versi skema {versi})")
 
 if __name__ == "__main__":
     init_db()
\ No newline at end of file
@@ -0,0 +1,315 @@
+import os
+import numpy as np
+import pandas as pd
+from datetime import date, datetime
+from allocation import snapshot_roster, map_clothes_type, bagi_tugas
+from db import baca_sql, jalankan_tulis
+from db_init import TANPA_DEADLINE
+
+# Project tanpa deadline (NULL / bukan tanggal) memakai TANPA_DEADLINE seperti
+# tailor_load: diurutkan paling akhir dan target speed-nya praktis nol.
+QUERY_PROJECT_TERBUKA = f"""
+SELECT
+    p.id AS project_id,
+    p.project_name,
+    p.clothes_type,
+    p.amount,
+    COALESCE(date(p.deadline), '{TANPA_DEADLINE}') AS deadline,
+    p.amount - COALESCE(SUM(a.amount_assigned), 0) AS sisa_pcs
+FROM projects p
+LEFT JOIN assignments a ON a.project_id = p.id
+WHERE p.status = 'ongoing'
+GROUP BY p.id
+HAVING sisa_pcs > 0
+ORDER BY deadline
+"""
+
+
+def muat_project_terbuka():
+    """Project ongoing yang masih punya pcs belum dibagi + target speed-nya."""
+    df = baca_sql(QUERY_PROJECT_TERBUKA)
+    today = date.today()
+    df['sisa_hari'] = [max((date.fromisoformat(d) - today).days, 1) for d in df['deadline']]
+    df['target_speed'] = df['sisa_pcs'] / df['sisa_hari']
+    return df
+
+
+def _matriks_speed(roster, statis, projects):
+    """
+    Sisa kapasitas tiap penjahit untuk tiap project (t x p) sesuai kategori
+    project. Penjahit yang diblokir dilewati karena tidak bisa dibuatkan
+    assignment. Roster satu baris per tailor_id, jadi tidak perlu dedup.
+    """
+    kolom = {}
+    for jenis in set(map_clothes_type.get(c, c) for c in projects['clothes_type']):
+        tabel = statis.tabel(jenis)
+        v = np.zeros(len(roster))
+        v[tabel['posisi']] = tabel['real_speed']
+        kolom[jenis] = v
+
+    S = np.column_stack([kolom[map_clothes_type.get(c, c)] for c in projects['clothes_type']]) \
+        if len(projects) else np.zeros((len(roster), 0))
+
+    posisi = np.flatnonzero(~statis.diblokir)
+    return posisi, S[posisi]
+
+
+# Rencana eksak (MILP lewat scipy/HiGHS) dipakai kalau scipy ada dan ukurannya
+# masih wajar; selebihnya / kalau solver tidak selesai, pakai heuristik greedy.
+MILP_MAKS_PASANGAN = int(os.environ.get("KOPERASI_MILP_MAKS_PASANGAN", 200_000))
+MILP_BATAS_DETIK = float(os.environ.get("KOPERASI_MILP_BATAS_DETIK", 10))
+
+METODE_OPTIMAL = "Optimal (MILP)"
+METODE_HEURISTIK = "Heuristik (greedy)"
+
+
+def rencanakan(target_speed, S, isi_yang_telat=True):
+    """
+    Susun rencana gabungan penjahit -> project untuk memaksimalkan jumlah
+    project yang terkejar deadline: rencanakan_optimal kalau bisa, kalau tidak
+    rencanakan_heuristik (hasilnya belum tentu optimal).
+
+    Return: (tim per project: list of array indeks penjahit, terkejar: array bool,
+    metode: METODE_OPTIMAL / METODE_HEURISTIK)
+    """
+    hasil = rencanakan_optimal(target_speed, S, isi_yang_telat)
+    if hasil is not None:
+        return hasil + (METODE_OPTIMAL,)
+    return rencanakan_heuristik(target_speed, S, isi_yang_telat) + (METODE_HEURISTIK,)
+
+
+def _isi_yang_telat(tim, terkejar, bebas, target_speed, S):
+    # Tiap penjahit sisa ke project telat yang paling terbantu olehnya
+    telat = np.flatnonzero(~terkejar)
+    if not len(telat):
+        return
+    porsi = S[:, telat] / target_speed[telat]
+    for t in np.flatnonzero(bebas & (S[:, telat].max(axis=1) > 0)):
+        p = telat[int(np.argmax(porsi[t]))]
+        tim[p] = np.append(tim[p], t)
+        bebas[t] = False
+
+
+def rencanakan_optimal(target_speed, S, isi_yang_telat=True):
+    """
+    Rencana eksak sebagai MILP: x[t,p] = penjahit t ke project p (biner, hanya
+    pasangan dengan speed > 0), y[p] = project p terkejar.
+
+        maks  sum y[p] - eps * sum x[t,p]      (eps < 1 / jumlah penjahit)
+        s.t.  sum_p x[t,p] <= 1                tiap penjahit paling banyak satu project
+              sum_t S[t,p] x[t,p] >= target[p] * y[p]
+
+    Suku eps memilih, di antara rencana dengan jumlah project terkejar maksimum,
+    yang memakai penjahit paling sedikit supaya sisanya bisa membantu project
+    telat. Return (tim, terkejar) seperti rencanakan_heuristik, atau None kalau
+    scipy tidak ada, ukurannya melewati MILP_MAKS_PASANGAN, atau solver tidak
+    menemukan optimum dalam MILP_BATAS_DETIK.
+    """
+    try:
+        from scipy.optimize import Bounds, LinearConstraint, milp
+        from scipy.sparse import csr_array
+    except ImportError:
+        return None
+
+    target_speed = np.asarray(target_speed, dtype=float)
+    n_tailor, n_project = S.shape
+    if n_project == 0:
+        return [], np.zeros(0, dtype=bool)
+    t_idx, p_idx = np.nonzero(S > 0)
+    n_x = len(t_idx)
+    if n_x > MILP_MAKS_PASANGAN:
+        return None
+
+    kolom_y = n_x + np.arange(n_project)
+    c = np.concatenate([np.full(n_x, 1.0 / (n_tailor + 1)), -np.ones(n_project)])
+    per_tailor = csr_array((np.ones(n_x), (t_idx, np.arange(n_x))), shape=(n_tailor, n_x + n_project))
+    per_project = csr_array(
+        (np.concatenate([S[t_idx, p_idx], -target_speed]),
+         (np.concatenate([p_idx, np.arange(n_project)]), np.concatenate([np.arange(n_x), kolom_y]))),
+        shape=(n_project, n_x + n_project))
+    # Project yang tidak terkejar walau semua penjahit dipakai: y dikunci 0
+    batas_atas = np.ones(n_x + n_project)
+    batas_atas[kolom_y] = S.sum(axis=0) >= target_speed - 1e-9
+
+    hasil = milp(
+        c,
+        constraints=[LinearConstraint(per_tailor, -np.inf, 1),
+                     LinearConstraint(per_project, -1e-9, np.inf)],
+        integrality=np.ones(n_x + n_project),
+        bounds=Bounds(0, batas_atas),
+        options={"time_limit": MILP_BATAS_DETIK},
+    )
+    if hasil.status != 0 or hasil.x is None:
+        return None
+
+    x = hasil.x[:n_x] > 0.5
+    terkejar = hasil.x[kolom_y] > 0.5
+    tim = [np.array([], dtype=np.int64) for _ in range(n_project)]
+    bebas = np.ones(n_tailor, dtype=bool)
+    for p in np.flatnonzero(terkejar):
+        tim[p] = t_idx[x & (p_idx == p)].astype(np.int64)
+        bebas[tim[p]] = False
+
+    if isi_yang_telat:
+        _isi_yang_telat(tim, terkejar, bebas, target_speed, S)
+    return tim, terkejar
+
+
+def rencanakan_heuristik(target_speed, S, isi_yang_telat=True):
+    """
+    Heuristik greedy untuk masalah yang sama (bin covering, NP-hard), dipakai
+    kalau rencanakan_optimal tidak tersedia: project dengan kebutuhan paling
+    ringan relatif terhadap kapasitas kategorinya diproses dulu; tiap project
+    diisi penjahit tercepat, dan orang terakhir dipilih yang paling pas menutup
+    sisa kebutuhan (best fit) supaya kapasitas tidak terbuang. Project yang
+    tidak mungkin terkejar tidak mengambil penjahit dulu; sisa penjahit baru
+    dibagi ke project telat di akhir (kalau `isi_yang_telat`). Tidak menjamin
+    jumlah project terkejar maksimum.
+
+    Return: (tim per project: list of array indeks penjahit, terkejar: array bool)
+    """
+    target_speed = np.asarray(target_speed, dtype=float)
+    n_tailor, n_project = S.shape
+    bebas = np.ones(n_tailor, dtype=bool)
+    tim = [np.array([], dtype=np.int64) for _ in range(n_project)]
+    terkejar = np.zeros(n_project, dtype=bool)
+
+    supply = S.sum(axis=0)
+    beban_relatif = np.divide(target_speed, supply, out=np.full(n_project, np.inf), where=supply > 0)
+    for p in np.argsort(beban_relatif, kind='stable'):
+        kebutuhan = target_speed[p]
+        dipilih = []
+        speed_p = np.where(bebas, S[:, p], 0.0)
+        while kebutuhan > 1e-9:
+            cukup = speed_p >= kebutuhan
+            if cukup.any():
+                # Best fit: yang paling lambat di antara yang sudah cukup sendirian
+                t = int(np.flatnonzero(cukup)[np.argmin(speed_p[cukup])])
+            elif speed_p.max(initial=0) > 0:
+                t = int(np.argmax(speed_p))
+            else:
+                break
+            dipilih.append(t)
+            kebutuhan -= speed_p[t]
+            speed_p[t] = 0.0
+        if kebutuhan <= 1e-9:
+            terkejar[p] = True
+            tim[p] = np.array(dipilih, dtype=np.int64)
+            bebas[dipilih] = False
+
+    if isi_yang_telat:
+        _isi_yang_telat(tim, terkejar, bebas, target_speed, S)
+    return tim, terkejar
+
+
+def buat_rencana_global():
+    """
+    Rencana alokasi untuk SEMUA project ongoing sekaligus.
+    Return: (df_ringkasan per project, df_draft per penjahit, metode rencanakan)
+    """
+    projects = muat_project_terbuka()
+
+    roster, statis = snapshot_roster()
+    posisi, S = _matriks_speed(roster, statis, projects)
+    tim, terkejar, metode = rencanakan(projects['target_speed'].to_numpy(), S)
+
+    draft = []
+    ringkasan = []
+    for p, proj in enumerate(projects.itertuples(index=False)):
+        anggota = tim[p]
+        speeds = S[anggota, p]
+        jatah = bagi_tugas(speeds, int(proj.sisa_pcs), int(proj.sisa_pcs)) if len(anggota) else []
+        for t, speed, pcs in zip(anggota, speeds, jatah):
+            if pcs <= 0:
+                continue
+            baris = roster.iloc[posisi[t]]
+            draft.append({
+                'project_id': int(proj.project_id),
+                'Project': proj.project_name,
+                'tailor_id': int(baris['tailor_id']),
+                'Penjahit': baris['Nama'],
+                'Speed (Pcs/Hari)': float(speed),
+                'Jml Pcs': int(pcs),
+            })
+        kapasitas = float(speeds.sum())
+        ringkasan.append({
+            'project_id': int(proj.project_id),
+            'Project': proj.project_name,
+            'Jenis': proj.clothes_type,
+            'Sisa Pcs': int(proj.sisa_pcs),
+            'Sisa Hari': int(proj.sisa_hari),
+            'Target (Pcs/Hari)': float(proj.target_speed),
+            'Kapasitas Tim (Pcs/Hari)': kapasitas,
+            'Jml Penjahit': len(anggota),
+            'Estimasi Selesai (Hari)': proj.sisa_pcs / kapasitas if kapasitas > 0 else None,
+            'Terkejar?': bool(terkejar[p]),
+        })
+
+    kolom_draft = ['project_id', 'Project', 'tailor_id', 'Penjahit', 'Speed (Pcs/Hari)', 'Jml Pcs']
+    return pd.DataFrame(ringkasan), pd.DataFrame(draft, columns=kolom_draft), metode
+
+
+def simpan_draft(df_draft):
+    """Ganti draft aktif dengan rencana baru. Return plan_id."""
+    plan_id = datetime.now().strftime("%Y%m%d%H%M%S")
+    baris = [(plan_id, r['project_id'], r['tailor_id'], r['Jml Pcs'], r['Speed (Pcs/Hari)']) for _, r in df_draft.iterrows()]
+
+    def tulis(conn):
+        c = conn.cursor()
+        c.execute("DELETE FROM assignment_drafts")
+        c.executemany(
+            "INSERT INTO assignment_drafts (plan_id, project_id, tailor_id, amount_assigned, est_speed) VALUES (?, ?, ?, ?, ?)",
+            baris
+        )
+
+    jalankan_tulis(tulis)
+    return plan_id
+
+
+def muat_draft():
+    """Draft aktif lengkap dengan nama project & penjahit."""
+    return baca_sql("""
+        SELECT
+            d.id,
+            d.plan_id,
+            p.project_name AS "Project",
+            t.name AS "Penjahit",
+            d.amount_assigned AS "Jml Pcs",
+            d.est_speed AS "Speed (Pcs/Hari)",
+            d.created_at
+        FROM assignment_drafts d
+        JOIN projects p ON p.id = d.project_id
+        JOIN tailors t ON t.id = d.tailor_id
+        ORDER BY p.deadline, d.id
+    """)
+
+
+def terapkan_draft():
+    """
+    Jadikan draft aktif assignment sungguhan (status 'assigned') dan tandai
+    penjahitnya 'working'. Gagal (ValueError) kalau kuota project sudah berubah
+    sehingga draft melebihi sisa pcs.
+    """
+    return jalankan_tulis(_terapkan_draft)
+
+
+def _terapkan_draft(conn):
+    # Cek kuota & insert dalam satu transaksi tulis, jadi admin lain tidak bisa menyela di antaranya
+    c = conn.cursor()
+    lebih = c.execute("""
+        SELECT p.project_name
+        FROM (SELECT project_id, SUM(amount_assigned) AS draft FROM assignment_drafts GROUP BY project_id) d
+        JOIN projects p ON p.id = d.project_id
+        WHERE d.draft + (SELECT COALESCE(SUM(a.amount_assigned), 0) FROM assignments a WHERE a.project_id = d.project_id) > p.amount
+    """).fetchall()
+    if lebih:
+        raise ValueError(f"Draft melebihi sisa kuota: {', '.join(r[0] for r in lebih)}. Buat ulang rencana.")
+
+    jumlah = c.execute("SELECT COUNT(*) FROM assignment_drafts").fetchone()[0]
+    c.execute("""
+        INSERT INTO assignments (project_id, tailor_id, amount_assigned, status)
+        SELECT project_id, tailor_id, amount_assigned, 'assigned' FROM assignment_drafts
+    """)
+    c.execute("UPDATE tailors SET status='working' WHERE id IN (SELECT tailor_id FROM assignment_drafts)")
+    c.execute("DELETE FROM assignment_drafts")
+    return jumlah
@@ -0,0 +1,106 @@
+# import_capabilities.py (Script import kapabilitas & atribut penjahit dari CSV ke DB)
+import os
+import pandas as pd
+from db import jalankan_tulis
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'DATA_FINAL_CLUSTERED.csv')
+
+# Kolom speed di CSV -> clothes_type di tabel tailor_capabilities
+KAPABILITAS_CSV = {
+    "Seragam Hem Putih (Pcs/hari)": "hem putih",
+    "Seragam Hem Pramuka (Pcs/hari)": "hem pramuka",
+    "Rok Seragam (Pcs/hari)": "rok",
+    "Celana Pramuka Seragam (Pcs/hari)": "celana pramuka",
+    "Kemeja Kerja (Pcs/hari)": "kemeja",
+    "Custom (Sulit) (Pcs/hari)": "custom",
+}
+
+
+def rapikan_nama(nama):
+    """Buang spasi di ujung & spasi ganda (mis. ' Anis Syayidah Ulfa')."""
+    return " ".join(str(nama).split())
+
+
+def normalisasi_nama(nama):
+    """Kunci pencocokan nama: rapi dan huruf kecil."""
+    return rapikan_nama(nama).lower()
+
+
+def _specialty(spesialis):
+    # Sama seperti seed_tailors.py
+    spesialis_raw = str(spesialis).strip().lower()
+    if spesialis_raw == "hanya bisa mengerjakan rok, atasan dan celana":
+        return "atasan/rok/celana"
+    return spesialis_raw
+
+
+def impor_kapabilitas(conn, csv_path=CSV_PATH):
+    """
+    Isi/perbarui tailor_attributes & tailor_capabilities dari CSV.
+
+    Tiap baris CSV dicocokkan ke tailors lewat nama yang dinormalisasi. Nama
+    kembar (orang berbeda dengan Kode Penjahit berbeda) dipasangkan ke tailor
+    yang belum terpakai; kalau tidak ada, penjahit baru dibuat di tailors.
+    Import ulang memakai pasangan (nama, kode) yang sudah tersimpan.
+    Tidak commit: jalankan lewat jalankan_tulis(impor_kapabilitas).
+    Return: (jumlah baris diimpor, jumlah penjahit baru)
+    """
+    df = pd.read_csv(csv_path, dtype={'Kode Penjahit': str})
+    c = conn.cursor()
+
+    sudah = {}
+    for tailor_id, name, kode in c.execute(
+            "SELECT a.tailor_id, t.name, a.kode_penjahit FROM tailor_attributes a JOIN tailors t ON t.id = a.tailor_id"):
+        sudah[(normalisasi_nama(name), kode)] = tailor_id
+    terpakai = set(sudah.values())
+    per_nama = {}
+    for tailor_id, name in c.execute("SELECT id, name FROM tailors ORDER BY id"):
+        per_nama.setdefault(normalisasi_nama(name), []).append(tailor_id)
+
+    kolom_speed = [k for k in KAPABILITAS_CSV if k in df.columns]
+    atribut, kapabilitas = [], []
+    baru = 0
+    for row in df.to_dict('records'):
+        kunci = normalisasi_nama(row['Nama'])
+        kode = row.get('Kode Penjahit')
+        tailor_id = sudah.get((kunci, kode))
+        if tailor_id is None:
+            bebas = [i for i in per_nama.get(kunci, []) if i not in terpakai]
+            if bebas:
+                tailor_id = bebas[0]
+            else:
+                speeds = [row[k] for k in kolom_speed if pd.notna(row[k])]
+                c.execute("""
+                    INSERT INTO tailors
+                    (name, age, distance_km, speed_clothes_per_day, specialty, status, contact)
+                    VALUES (?, ?, ?, ?, ?, 'idle', '-')
+                """, (rapikan_nama(row['Nama']), int(row['Usia']), float(row['Jarak Rumah ke Koperasi (Km)']),
+                      sum(speeds) / len(speeds) if speeds else 5.0, _specialty(row['Spesialis'])))
+                tailor_id = c.lastrowid
+                baru += 1
+            terpakai.add(tailor_id)
+
+        atribut.append((tailor_id, kode, int(row['Kerapian']), int(row['Komitmen']),
+                        int(row['Ketepatan Waktu']), int(row.get('Quantity', 0)), int(row['Cluster_ID'])))
+        kapabilitas += [(tailor_id, KAPABILITAS_CSV[k], float(row[k])) for k in kolom_speed if pd.notna(row[k])]
+
+    c.executemany("""
+        INSERT INTO tailor_attributes (tailor_id, kode_penjahit, kerapian, komitmen, ketepatan_waktu, quantity, cluster_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(tailor_id) DO UPDATE SET
+            kode_penjahit = excluded.kode_penjahit, kerapian = excluded.kerapian, komitmen = excluded.komitmen,
+            ketepatan_waktu = excluded.ketepatan_waktu, quantity = excluded.quantity, cluster_id = excluded.cluster_id
+    """, atribut)
+    c.executemany("""
+        INSERT INTO tailor_capabilities (tailor_id, clothes_type, pcs_per_day) VALUES (?, ?, ?)
+        ON CONFLICT(tailor_id, clothes_type) DO UPDATE SET pcs_per_day = excluded.pcs_per_day
+    """, kapabilitas)
+    return len(atribut), baru
+
+
+if __name__ == "__main__":
+    if not os.path.exists(CSV_PATH):
+        print("❌ Error: File DATA_FINAL_CLUSTERED.csv tidak ditemukan!")
+    else:
+        jumlah, baru = jalankan_tulis(impor_kapabilitas)
+        print(f"✅ {jumlah} penjahit diimpor ({baru} penjahit baru dibuat di tabel tailors).")
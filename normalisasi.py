@@ -0,0 +1,28 @@
+# normalisasi.py (Scaling fitur ringan berbasis NumPy, pengganti sklearn.preprocessing)
+import numpy as np
+
+
+def minmax(nilai):
+    """
+    Min-max scaling 1 kolom ke [0, 1] (semantik sama dengan MinMaxScaler).
+    Kolom konstan menghasilkan 0 semua; NaN dibiarkan NaN.
+    """
+    nilai = np.asarray(nilai, dtype=float)
+    if nilai.size == 0:
+        return nilai
+    lo = np.nanmin(nilai)
+    rentang = np.nanmax(nilai) - lo
+    if rentang == 0:
+        rentang = 1.0
+    return (nilai - lo) / rentang
+
+
+def parameter_standar(X):
+    """
+    (mean, std) per kolom untuk z-score (semantik sama dengan StandardScaler).
+    Kolom konstan diberi std 1 supaya hasilnya 0, bukan NaN.
+    """
+    X = np.asarray(X, dtype=float)
+    mean, std = X.mean(0), X.std(0)
+    std[std == 0] = 1.0
+    return mean, std
@@ -1,46 +1,18 @@
 import streamlit as st
 import pandas as pd
-from db import get_connection
+from db import jalankan_tulis, baca_sql
+from query_halaman import QUERY_PROJECTS
 from datetime import date
-import plotly.express as px
-import altair as alt
 
 st.set_page_config(page_title="Projects", page_icon="📦", layout="wide")
 
 st.title("📦 Pusat Data Project")
 st.markdown("Monitor status produksi, target deadline, dan estimasi keuntungan.")
 
-conn = get_connection()
-conn.row_factory = None  # Reset agar pandas bisa membaca dengan benar
-c = conn.cursor()
-
 # =========================================
 # 1. LOAD DATA UTAMA
 # =========================================
-query_main = """
-SELECT 
-    p.id AS project_id,
-    p.project_name AS "Nama Project",
-    p.customer_name AS "Customer",
-    p.clothes_type AS "Jenis",
-    p.amount AS "Jumlah (pcs)",
-    p.order_date AS "Order Date",
-    p.deadline AS "Deadline",
-    p.status AS "Status",
-    p.notes AS "Catatan",
-    p.tailor_fee_per_item AS "Biaya Jahit / Item",
-    p.base_fee AS "Harga Dasar",
-    p.price_per_item AS "Harga Jual / Item",
-    -- Estimasi Biaya & Profit
-    (COALESCE(SUM(pc.price), 0) + p.base_fee + (p.amount * p.tailor_fee_per_item)) AS "Total Biaya",
-    (p.price_per_item * p.amount) AS "Total Pendapatan",
-    ((p.price_per_item * p.amount) - (COALESCE(SUM(pc.price), 0) + p.base_fee + (p.amount * p.tailor_fee_per_item))) AS "Total Keuntungan"
-FROM projects p
-LEFT JOIN purchases pc ON pc.project_id = p.id
-GROUP BY p.id
-ORDER BY p.id DESC;
-"""
-df_projects = pd.read_sql_query(query_main, conn)
+df_projects = baca_sql(QUERY_PROJECTS)
 df_projects["Biaya Jahit / Item"] = df_projects["Biaya Jahit / Item"].fillna(0.0)
 df_projects["Harga Dasar"] = df_projects["Harga Dasar"].fillna(0.0)
 df_projects["Total Biaya"] = df_projects["Total Biaya"].fillna(df_projects["Harga Dasar"] + (df_projects["Biaya Jahit / Item"] * df_projects["Jumlah (pcs)"]))
@@ -100,7 +72,8 @@ with tab1:
                 value_name="Nominal"
             )
 
-            # 3. Buat Chart dengan Altair
+            # 3. Buat Chart dengan Altair (diimpor di sini saja supaya halaman cepat terbuka)
+            import altair as alt
             chart = alt.Chart(source_melt).mark_bar().encode(
                 # Sumbu X: Nama Project
                 x=alt.X('Nama Project:N', axis=alt.Axis(labelAngle=-45, title=None)),
@@ -158,11 +131,10 @@ with tab2:
                 if not project_name or not customer_name:
                     st.warning("Nama project dan customer wajib diisi.")
                 else:
-                    c.execute("""
+                    jalankan_tulis(lambda tx: tx.execute("""
                         INSERT INTO projects (project_name, customer_name, clothes_type, amount, deadline, order_date, status, notes, tailor_fee_per_item, base_fee, price_per_item)
                         VALUES (?, ?, ?, ?, ?, DATE('now'), 'ongoing', ?, ?, ?, ?)
-                    """, (project_name, customer_name, clothes_type, amount, deadline, notes, tailor_fee, base_fee, price))
-                    conn.commit()
+                    """, (project_name, customer_name, clothes_type, amount, deadline, notes, tailor_fee, base_fee, price)))
                     st.success("Project berhasil ditambahkan!")
                     st.rerun()
 
@@ -208,8 +180,7 @@ with tab2:
             btn_update = st.form_submit_button("Update Data")
             
             if btn_update:
-                c.execute("UPDATE projects SET project_name=?, customer_name=?, deadline=?, status=?, clothes_type=?, base_fee=?, tailor_fee_per_item=?, price_per_item=?, amount=?, notes=? WHERE id=?", (project_name, customer_name, deadline, n_status, clothes_type, base_fee, tailor_fee, price, amount, notes, sel_id))
-                conn.commit()
+                jalankan_tulis(lambda tx: tx.execute("UPDATE projects SET project_name=?, customer_name=?, deadline=?, status=?, clothes_type=?, base_fee=?, tailor_fee_per_item=?, price_per_item=?, amount=?, notes=? WHERE id=?", (project_name, customer_name, deadline, n_status, clothes_type, base_fee, tailor_fee, price, amount, notes, sel_id)))
                 st.success("Update berhasil!")
                 st.rerun()
                     
@@ -217,14 +188,12 @@ with tab2:
     st.subheader("🗑️ Hapus / Selesai")
     if not df_projects.empty:
         if st.button("Tandai Selesai (Quick Action)"):
-            c.execute("UPDATE projects SET status='done' WHERE id=?", (sel_id,))
-            conn.commit()
+            jalankan_tulis(lambda tx: tx.execute("UPDATE projects SET status='done' WHERE id=?", (sel_id,)))
             st.rerun()
         
         st.warning("Hapus project bersifat permanen.")
         if st.button("Hapus Project"):
-            c.execute("DELETE FROM projects WHERE id=?", (sel_id,))
-            conn.commit()
+            jalankan_tulis(lambda tx: tx.execute("DELETE FROM projects WHERE id=?", (sel_id,)))
             st.error("Project dihapus.")
             st.rerun()
 
@@ -245,6 +214,8 @@ with tab3:
     if cal_df.empty:
         st.info("Belum ada project.")
     else:
+        # Plotly berat (beberapa ratus ms); hanya diimpor kalau timeline memang digambar
+        import plotly.express as px
         fig = px.timeline(
             cal_df,
             x_start="Order Date",
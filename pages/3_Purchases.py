@@ -1,34 +1,16 @@
 import streamlit as st
 import pandas as pd
-from db import get_connection
+from db import jalankan_tulis, baca_sql
+from query_halaman import QUERY_PURCHASES, QUERY_PROJECT_ONGOING
 
 st.set_page_config(page_title="Purchases", page_icon="🛒", layout="wide")
 st.title("🛒 Manajemen Pembelian & Pengeluaran")
 
-conn = get_connection()
-conn.row_factory = None
-c = conn.cursor()
-
 # =========================
 # LOAD DATA
 # =========================
 # Query Lengkap untuk Tabel
-query_list = """
-SELECT 
-    pc.id,
-    p.project_name AS "Untuk Project",
-    s.name AS "Supplier",
-    pc.item AS "Nama Barang",
-    pc.amount AS "Jml",
-    pc.unit AS "Satuan",
-    pc.price AS "Total Harga",
-    pc.date AS "Tanggal"
-FROM purchases pc
-LEFT JOIN projects p ON p.id = pc.project_id
-LEFT JOIN suppliers s ON s.id = pc.supplier_id
-ORDER BY pc.date DESC
-"""
-df_purchases = pd.read_sql_query(query_list, conn)
+df_purchases = baca_sql(QUERY_PURCHASES)
 df_purchases["Tanggal"] = pd.to_datetime(df_purchases["Tanggal"])
 
 # =========================
@@ -75,8 +57,8 @@ with tab2:
         st.subheader("➕ Catat Pembelian Baru")
         with st.form("add_purchase_form"):
             # Load Data Pendukung
-            projects = c.execute("SELECT id, project_name FROM projects WHERE status='ongoing'").fetchall()
-            suppliers = c.execute("SELECT id, name FROM suppliers").fetchall()
+            projects = list(baca_sql(QUERY_PROJECT_ONGOING).itertuples(index=False))
+            suppliers = list(baca_sql("SELECT id, name FROM suppliers").itertuples(index=False))
             
             proj_map = {f"ID {p[0]} - {p[1]}": p[0] for p in projects}
             supp_map = {f"{s[1]}": s[0] for s in suppliers}
@@ -98,19 +80,20 @@ with tab2:
                     pid = proj_map[sel_proj] if sel_proj else None
                     sid = supp_map[sel_supp] if sel_supp else None
                     
-                    # 1. Insert Purchase
-                    c.execute("""
-                        INSERT INTO purchases (project_id, supplier_id, item, amount, unit, price, date)
-                        VALUES (?, ?, ?, ?, ?, ?, DATE('now'))
-                    """, (pid, sid, item, amount, unit, price))
-                    
-                    # 2. Auto Inventory IN
-                    c.execute("""
-                        INSERT INTO inventory (fabric_type, amount, direction, reason, project_id)
-                        VALUES (?, ?, 'IN', 'purchase', ?)
-                    """, (item, amount, pid))
-                    
-                    conn.commit()
+                    def catat_pembelian(tx):
+                        # 1. Insert Purchase
+                        tx.execute("""
+                            INSERT INTO purchases (project_id, supplier_id, item, amount, unit, price, date)
+                            VALUES (?, ?, ?, ?, ?, ?, DATE('now'))
+                        """, (pid, sid, item, amount, unit, price))
+
+                        # 2. Auto Inventory IN
+                        tx.execute("""
+                            INSERT INTO inventory (fabric_type, amount, direction, reason, project_id)
+                            VALUES (?, ?, 'IN', 'purchase', ?)
+                        """, (item, amount, pid))
+
+                    jalankan_tulis(catat_pembelian)
                     st.success("Pembelian tercatat & Stok bertambah!")
                     st.rerun()
 
@@ -1,34 +1,17 @@
 import streamlit as st
-import pandas as pd
-from db import get_connection
+from db import jalankan_tulis, baca_sql
+from query_halaman import QUERY_STOK_KAIN, QUERY_RIWAYAT_INVENTORY, QUERY_PROJECT_ONGOING
 
 st.set_page_config(page_title="Inventory", page_icon="🧶", layout="wide")
 st.title("🧶 Gudang & Inventaris Kain")
 
-conn = get_connection()
-conn.row_factory = None
-c = conn.cursor()
-
 # =========================
 # LOAD DATA STOCK
 # =========================
-stock_query = """
-SELECT
-    fabric_type AS "Jenis Kain",
-    SUM(CASE WHEN direction='IN' THEN amount ELSE -amount END) AS "Stok Akhir"
-FROM inventory
-GROUP BY fabric_type
-HAVING "Stok Akhir" != 0
-ORDER BY "Stok Akhir" DESC
-"""
-df_stock = pd.read_sql_query(stock_query, conn)
+df_stock = baca_sql(QUERY_STOK_KAIN)
 
 # Load History
-history_query = """
-SELECT id, fabric_type, amount, direction, reason, created_at 
-FROM inventory ORDER BY created_at DESC
-"""
-df_history = pd.read_sql_query(history_query, conn)
+df_history = baca_sql(QUERY_RIWAYAT_INVENTORY)
 
 # =========================
 # TABS LAYOUT
@@ -85,7 +68,7 @@ with tab2:
             reason = st.selectbox("Keterangan", ["purchase", "production", "leftover", "initial"])
             
             # Load project utk referensi
-            proj_data = c.execute("SELECT id, project_name FROM projects WHERE status='ongoing'").fetchall()
+            proj_data = list(baca_sql(QUERY_PROJECT_ONGOING).itertuples(index=False))
             proj_opts = {f"ID {p[0]} - {p[1]}": p[0] for p in proj_data}
             proj_select = st.selectbox("Untuk Project (Opsional)", ["-"] + list(proj_opts.keys()))
             
@@ -95,9 +78,9 @@ with tab2:
                 real_dir = "IN" if "IN" in direction else "OUT"
                 proj_id = proj_opts[proj_select] if proj_select != "-" else None
                 
-                c.execute("INSERT INTO inventory (fabric_type, amount, direction, reason, project_id) VALUES (?, ?, ?, ?, ?)",
-                          (fabric_type, amount, real_dir, reason, proj_id))
-                conn.commit()
+                jalankan_tulis(lambda tx: tx.execute(
+                    "INSERT INTO inventory (fabric_type, amount, direction, reason, project_id) VALUES (?, ?, ?, ?, ?)",
+                    (fabric_type, amount, real_dir, reason, proj_id)))
                 st.success("Berhasil disimpan.")
                 st.rerun()
 
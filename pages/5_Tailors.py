@@ -1,8 +1,11 @@
 import streamlit as st
 import pandas as pd
-import altair as alt
 import os
-from db import get_connection
+from db import koneksi, jalankan_tulis, baca_sql
+from query_halaman import QUERY_RIWAYAT_PENJAHIT
+from db_init import ALPHA_SPEED
+from import_capabilities import CSV_PATH, KAPABILITAS_CSV, impor_kapabilitas
+from clustering import tetapkan_cluster, muat_model, latih_ulang_latar, label_cluster
 
 # Konfigurasi Halaman
 st.set_page_config(
@@ -37,24 +40,22 @@ st.markdown("""
 st.title("🧵 Pusat Data Penjahit")
 st.markdown("Monitor kinerja, sebaran lokasi, dan status operasional mitra penjahit.")
 
-# Load Data dari Database
-conn = get_connection()
-conn.row_factory = None # Biar bisa dibaca pandas
-c = conn.cursor()
-
 # Query Data Lengkap
-df = pd.read_sql_query("""
+df = baca_sql("""
     SELECT 
-        id, 
-        name, 
-        age, 
-        distance_km, 
-        speed_clothes_per_day AS speed, 
-        specialty, 
-        status, 
-        contact 
-    FROM tailors
-""", conn)
+        t.id, 
+        t.name, 
+        t.age, 
+        t.distance_km, 
+        t.speed_clothes_per_day AS speed, 
+        t.specialty, 
+        t.status, 
+        t.contact,
+        k.label AS cluster
+    FROM tailors t
+    LEFT JOIN tailor_attributes a ON a.tailor_id = t.id
+    LEFT JOIN cluster_centroids k ON k.cluster_id = a.cluster_id
+""")
 
 # --- TAB MENU ---
 tab1, tab2, tab3 = st.tabs(["📊 Dashboard Analitik", "🛠️ Manajemen Data", "📋 History Assignment"])
@@ -109,6 +110,8 @@ with tab1:
         st.divider()
 
         # --- SECTION 2: CHARTS ---
+        # Altair hanya diimpor kalau ada data untuk digambar
+        import altair as alt
         c1, c2 = st.columns([2, 1])
 
         with c1:
@@ -204,17 +207,44 @@ with tab2:
                 new_age = st.number_input("Usia", 17, 80, 30)
                 new_dist = st.number_input("Jarak (Km)", 0.0, 100.0, 5.0)
             with col_b:
-                new_speed = st.number_input("Speed (Pcs/Hari)", 1.0, 50.0, 5.0)
-                new_spec = st.selectbox("Spesialis", ["uniform", "custom"])
-            
-            new_contact = st.text_input("Kontak")
+                new_spec = st.selectbox("Spesialis", ["seragam", "semua", "atasan/rok/celana"])
+                new_contact = st.text_input("Kontak")
+
+            st.caption("Kecepatan per jenis pakaian (Pcs/Hari)")
+            kolom_speed = st.columns(3)
+            new_speeds = {
+                jenis: kolom_speed[i % 3].number_input(kolom.replace(" (Pcs/hari)", ""), 0.0, 50.0, 5.0 if jenis != "custom" else 0.0)
+                for i, (kolom, jenis) in enumerate(KAPABILITAS_CSV.items())
+            }
+            col_c, col_d, col_e, col_f = st.columns(4)
+            new_rapi = col_c.checkbox("Rapi", value=True)
+            new_komit = col_d.checkbox("Komitmen", value=True)
+            new_tepat = col_e.checkbox("Tepat Waktu", value=True)
+            new_qty = col_f.checkbox("Sanggup Banyak", value=False)
+
             if st.form_submit_button("Simpan Data Baru"):
-                c.execute("""
-                    INSERT INTO tailors (name, age, distance_km, speed_clothes_per_day, specialty, status, contact)
-                    VALUES (?, ?, ?, ?, ?, 'idle', ?)
-                """, (new_name, new_age, new_dist, new_speed, new_spec, new_contact))
-                conn.commit()
-                st.success("Berhasil ditambahkan!")
+                new_speed = sum(new_speeds.values()) / len(new_speeds)
+
+                def tambah_penjahit(tx):
+                    c = tx.cursor()
+                    c.execute("""
+                        INSERT INTO tailors (name, age, distance_km, speed_clothes_per_day, specialty, status, contact)
+                        VALUES (?, ?, ?, ?, ?, 'idle', ?)
+                    """, (new_name.strip(), new_age, new_dist, new_speed, new_spec, new_contact))
+                    new_id = c.lastrowid
+                    c.execute("""
+                        INSERT INTO tailor_attributes (tailor_id, kerapian, komitmen, ketepatan_waktu, quantity)
+                        VALUES (?, ?, ?, ?, ?)
+                    """, (new_id, int(new_rapi), int(new_komit), int(new_tepat), int(new_qty)))
+                    c.executemany(
+                        "INSERT INTO tailor_capabilities (tailor_id, clothes_type, pcs_per_day) VALUES (?, ?, ?)",
+                        [(new_id, jenis, speed) for jenis, speed in new_speeds.items()]
+                    )
+                    # Langsung dapat cluster tanpa fit ulang seluruh roster
+                    return tetapkan_cluster(tx, new_id, baru=True)
+
+                cluster = jalankan_tulis(tambah_penjahit)
+                st.success(f"Berhasil ditambahkan! Cluster: {label_cluster().get(cluster, '-')}")
                 st.rerun()
 
     with c2:
@@ -227,35 +257,97 @@ with tab2:
         if selected_id_edit:
             # Ambil data current
             curr = df[df['id'] == selected_id_edit].iloc[0]
-            
+            kapabilitas = baca_sql("SELECT clothes_type, pcs_per_day FROM tailor_capabilities WHERE tailor_id = ?",
+                                   (int(selected_id_edit),))
+            curr_speeds = dict(zip(kapabilitas['clothes_type'], kapabilitas['pcs_per_day']))
+            if not curr_speeds:
+                # Belum ada kapabilitas: sama seperti roster Smart Allocation (speed umum, kecuali Custom)
+                curr_speeds = {jenis: float(curr['speed'] or 0) for jenis in KAPABILITAS_CSV.values() if jenis != "custom"}
+
             with st.form("edit_form"):
                 e_name = st.text_input("Nama", value=curr['name'])
-                
+
+                # Speed yang dipakai alokasi ada per jenis pakaian (tailor_capabilities);
+                # speed umum = rata-ratanya, seperti saat tambah penjahit
+                st.caption("Kecepatan per jenis pakaian (Pcs/Hari)")
+                kolom_speed = st.columns(3)
+                e_speeds = {
+                    jenis: kolom_speed[i % 3].number_input(kolom.replace(" (Pcs/hari)", ""), 0.0, 50.0,
+                                                           float(curr_speeds.get(jenis, 0.0)), key=f"edit_{jenis}")
+                    for i, (kolom, jenis) in enumerate(KAPABILITAS_CSV.items())
+                }
+
                 ec1, ec2 = st.columns(2)
                 with ec1:
-                    e_speed = st.number_input("Speed", value=float(curr['speed']))
                     e_status = st.selectbox("Status", ["idle", "working"], index=0 if curr['status']=='idle' else 1)
                 with ec2:
-                    e_spec = st.selectbox("Spesialis", ["uniform", "custom"], index=0 if curr['specialty']=='uniform' else 1)
+                    pilihan_spec = ["seragam", "semua", "atasan/rok/celana"]
+                    e_spec = st.selectbox("Spesialis", pilihan_spec, index=pilihan_spec.index(curr['specialty']) if curr['specialty'] in pilihan_spec else 0)
                     e_dist = st.number_input("Jarak", value=float(curr['distance_km']))
                 
                 btn_col1, btn_col2 = st.columns(2)
                 with btn_col1:
                     if st.form_submit_button("Update Data"):
-                        c.execute("""
-                            UPDATE tailors SET name=?, speed_clothes_per_day=?, status=?, specialty=?, distance_km=? 
-                            WHERE id=?
-                        """, (e_name, e_speed, e_status, e_spec, e_dist, selected_id_edit))
-                        conn.commit()
+                        e_speed = sum(e_speeds.values()) / len(e_speeds)
+
+                        def ubah_penjahit(tx):
+                            tx.execute("""
+                                UPDATE tailors SET name=?, speed_clothes_per_day=?, status=?, specialty=?, distance_km=?
+                                WHERE id=?
+                            """, (e_name, e_speed, e_status, e_spec, e_dist, selected_id_edit))
+                            tx.executemany("""
+                                INSERT INTO tailor_capabilities (tailor_id, clothes_type, pcs_per_day) VALUES (?, ?, ?)
+                                ON CONFLICT(tailor_id, clothes_type) DO UPDATE SET pcs_per_day = excluded.pcs_per_day
+                            """, [(int(selected_id_edit), jenis, speed) for jenis, speed in e_speeds.items()])
+                            tetapkan_cluster(tx, selected_id_edit, baru=False)
+
+                        jalankan_tulis(ubah_penjahit)
                         st.success("Data Updated!")
                         st.rerun()
                 with btn_col2:
                     if st.form_submit_button("Hapus Data", type="primary"):
-                        c.execute("DELETE FROM tailors WHERE id=?", (selected_id_edit,))
-                        conn.commit()
+                        # Atribut, kapabilitas, speed terukur, beban & draft ikut terhapus (trg_tailor_hapus)
+                        jalankan_tulis(lambda tx: tx.execute("DELETE FROM tailors WHERE id=?", (selected_id_edit,)))
                         st.error("Data Deleted!")
                         st.rerun()
 
+    st.divider()
+
+    # --- STATUS MODEL CLUSTER ---
+    st.markdown("##### 🧠 Model Cluster Penjahit")
+    with koneksi() as conn:
+        model = muat_model(conn)
+    if model is None:
+        st.caption("Belum ada data atribut penjahit untuk clustering.")
+    else:
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Jumlah Cluster", len(model.centroid))
+        m2.metric("Ditempatkan Sejak Fit", f"{model.n_baru} / {model.n_fit}")
+        m3.metric("Drift", f"{model.drift():.2f}x", "Perlu fit ulang" if model.perlu_latih_ulang() else "Aman",
+                  delta_color="inverse" if model.perlu_latih_ulang() else "normal")
+        if st.button("🔄 Fit Ulang Cluster (Background)"):
+            if latih_ulang_latar():
+                st.success("Fit ulang berjalan di background.")
+            else:
+                st.info("Fit ulang sedang berjalan.")
+
+    # --- IMPORT KAPABILITAS (AKSI ADMIN) ---
+    st.markdown("##### 📥 Import Kapabilitas dari CSV")
+    tanpa_atribut = int(baca_sql("""
+        SELECT COUNT(*) AS n FROM tailors t
+        WHERE NOT EXISTS (SELECT 1 FROM tailor_attributes a WHERE a.tailor_id = t.id)
+    """)["n"].iloc[0])
+    st.caption(f"{tanpa_atribut} penjahit belum punya atribut & kapabilitas; di Smart Allocation mereka "
+               f"dinilai dengan atribut netral dan speed umum. Import mencocokkan nama di "
+               f"{os.path.basename(CSV_PATH)} ke data penjahit.")
+    if st.button("📥 Import dari CSV"):
+        if not os.path.exists(CSV_PATH):
+            st.error(f"File {os.path.basename(CSV_PATH)} tidak ditemukan!")
+        else:
+            jumlah, baru = jalankan_tulis(impor_kapabilitas)
+            st.success(f"{jumlah} penjahit diimpor ({baru} penjahit baru dibuat).")
+            st.rerun()
+
 with tab3:
     st.subheader("📜 Riwayat Assignment Penjahit")
 
@@ -269,22 +361,7 @@ with tab3:
     tailor_id = tailor_map[selected_tailor]
 
     # Ambil assignment berdasarkan tailor
-    hist_df = pd.read_sql_query("""
-        SELECT 
-            a.id AS "Assignment ID",
-            p.project_name AS "Project",
-            p.order_date AS "Tanggal Order",
-            p.deadline AS "Deadline",
-            a.amount_assigned AS "Jumlah Dijahit",
-            a.status AS "Status",
-            (a.amount_assigned * p.tailor_fee_per_item) AS Bayaran
-        FROM assignments a
-        JOIN tailors t on a.tailor_id = t.id
-        JOIN projects p on p.id = a.project_id
-
-        WHERE t.id = ?
-        ORDER BY a.id DESC
-    """, conn, params=(tailor_id,))
+    hist_df = baca_sql(QUERY_RIWAYAT_PENJAHIT, (tailor_id,))
     st.dataframe(
         hist_df.style.format({
             "Bayaran": "Rp {:,.0f}",
@@ -303,7 +380,7 @@ with tab3:
         hist_df["durasi_hari"] = (hist_df["Deadline"] - hist_df["Tanggal Order"]).dt.days
         hist_df["durasi_hari"] = hist_df["durasi_hari"].clip(lower=1)
 
-        hist_df["speed"] = float(hist_df["Jumlah Dijahit"] / hist_df["durasi_hari"])
+        hist_df["speed"] = hist_df["Jumlah Dijahit"] / hist_df["durasi_hari"]
 
         avg_speed = hist_df["speed"].mean()
 
@@ -323,6 +400,33 @@ with tab3:
         with c4:
             st.metric("⚡ Rata-rata Kecepatan", f"{avg_speed:.1f} pcs/hari")
 
+    # Speed terukur (EWMA) yang dipakai Smart Allocation, diperbarui tiap assignment selesai
+    speed_df = baca_sql("""
+        SELECT
+            clothes_type AS "Jenis Pakaian",
+            ewma_obs AS ewma_obs,
+            n_obs AS "Jumlah Observasi",
+            last_speed AS "Speed Terakhir (Pcs/Hari)",
+            updated_at AS "Diperbarui"
+        FROM tailor_speed
+        WHERE tailor_id = ?
+        ORDER BY clothes_type
+    """, (tailor_id,))
+    if not speed_df.empty:
+        st.markdown("### 🎯 Kecepatan Terukur per Jenis Pakaian")
+        # Bobot prior (kapabilitas) yang tersisa: (1 - ALPHA)^n
+        speed_df["Bobot Data Riwayat"] = 1 - (1 - ALPHA_SPEED) ** speed_df["Jumlah Observasi"]
+        st.dataframe(
+            speed_df.drop(columns="ewma_obs"),
+            column_config={
+                "Speed Terakhir (Pcs/Hari)": st.column_config.NumberColumn(format="%.1f"),
+                "Bobot Data Riwayat": st.column_config.ProgressColumn(min_value=0.0, max_value=1.0, format="%.2f"),
+            },
+            use_container_width=True, hide_index=True
+        )
+        st.caption("Smart Allocation memakai campuran speed kapabilitas dan speed terukur ini; "
+                   "makin banyak assignment selesai, makin besar bobot data riwayat.")
+
 
     # else:
     #     st.dataframe(
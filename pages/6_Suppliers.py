@@ -1,31 +1,17 @@
 import streamlit as st
-import pandas as pd
-from db import get_connection
+from db import jalankan_tulis, baca_sql
+from query_halaman import QUERY_BELANJA_SUPPLIER
 
 st.set_page_config(page_title="Suppliers", page_icon="🚚", layout="wide")
 st.title("🚚 Partner & Supplier")
 
-conn = get_connection()
-conn.row_factory = None
-c = conn.cursor()
-
 # =========================
 # LOAD DATA
 # =========================
-df_suppliers = pd.read_sql_query("SELECT id, name, address, contact, notes FROM suppliers ORDER BY name", conn)
+df_suppliers = baca_sql("SELECT id, name, address, contact, notes FROM suppliers ORDER BY name")
 
 # Load Spending per Supplier (Join table)
-query_spend = """
-SELECT 
-    s.name AS "Supplier",
-    COUNT(p.id) AS "Total Transaksi",
-    COALESCE(SUM(p.price), 0) AS "Total Belanja"
-FROM suppliers s
-LEFT JOIN purchases p ON p.supplier_id = s.id
-GROUP BY s.id
-ORDER BY "Total Belanja" DESC
-"""
-df_spend = pd.read_sql_query(query_spend, conn)
+df_spend = baca_sql(QUERY_BELANJA_SUPPLIER)
 
 # =========================
 # TABS LAYOUT
@@ -67,9 +53,8 @@ with tab2:
             
             if st.form_submit_button("Simpan"):
                 if name:
-                    c.execute("INSERT INTO suppliers (name, address, contact, notes) VALUES (?,?,?,?)", 
-                              (name, address, contact, notes))
-                    conn.commit()
+                    jalankan_tulis(lambda tx: tx.execute("INSERT INTO suppliers (name, address, contact, notes) VALUES (?,?,?,?)",
+                                                         (name, address, contact, notes)))
                     st.success("Tersimpan!")
                     st.rerun()
                 else:
@@ -88,7 +73,6 @@ with tab2:
                     n_contact = st.text_input("Kontak", curr["contact"])
                     n_addr = st.text_input("Alamat", curr["address"])
                     if st.form_submit_button("Update"):
-                        c.execute("UPDATE suppliers SET name=?, contact=?, address=? WHERE id=?", (n_name, n_contact, n_addr, sel_id))
-                        conn.commit()
+                        jalankan_tulis(lambda tx: tx.execute("UPDATE suppliers SET name=?, contact=?, address=? WHERE id=?", (n_name, n_contact, n_addr, sel_id)))
                         st.success("Updated.")
                         st.rerun()
\ No newline at end of file
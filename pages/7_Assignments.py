@@ -1,26 +1,24 @@
 import streamlit as st
 import pandas as pd
-from db import get_connection
+from db import jalankan_tulis, baca_sql
+from query_halaman import QUERY_PROJECT_ONGOING_TUGAS, QUERY_KUOTA_TERPAKAI
+from allocation import kapasitas_tersedia, map_clothes_type
+from global_allocator import buat_rencana_global, simpan_draft, muat_draft, terapkan_draft, METODE_HEURISTIK
 
 st.set_page_config(page_title="Assignments", page_icon="📋", layout="wide")
 st.title("📋 Distribusi Tugas & Monitoring")
 st.markdown("Pantau beban kerja penjahit dan kelola pembagian tugas produksi.")
 
-conn = get_connection()
-conn.row_factory = None
-c = conn.cursor()
-
 # =========================
 # LOAD DATA (COMMON)
 # =========================
 # Data Project Ongoing (untuk dropdown & validasi)
-projects = c.execute("SELECT id, project_name, amount FROM projects WHERE status='ongoing'").fetchall()
+df_proj = baca_sql(QUERY_PROJECT_ONGOING_TUGAS)
+projects = list(df_proj[["id", "project_name", "amount"]].itertuples(index=False))
 proj_map = {p[0]: f"{p[1]} (Target: {p[2]} pcs)" for p in projects}
 proj_amount_map = {p[0]: p[2] for p in projects}
-
-# Data Tailor (untuk dropdown)
-tailors = c.execute("SELECT id, name, status FROM tailors").fetchall()
-idle_tailors = [t for t in tailors if t[2] == 'idle']
+# Kategori kapabilitas project (sama seperti Smart Allocation & Rencana Global)
+proj_jenis_map = {pid: map_clothes_type.get(jenis, jenis) for pid, jenis in zip(df_proj["id"], df_proj["clothes_type"])}
 
 # Data Assignment Lengkap (untuk Tabel Utama)
 query_main = """
@@ -38,12 +36,12 @@ JOIN projects p ON p.id = a.project_id
 JOIN tailors t ON t.id = a.tailor_id
 ORDER BY a.id DESC
 """
-df_assign = pd.read_sql_query(query_main, conn)
+df_assign = baca_sql(query_main)
 
 # =========================
 # TABS LAYOUT
 # =========================
-tab1, tab2 = st.tabs(["📊 Monitor Beban Kerja", "📝 Kelola Penugasan"])
+tab1, tab2, tab3 = st.tabs(["📊 Monitor Beban Kerja", "📝 Kelola Penugasan", "🌐 Rencana Global"])
 
 # ------------------------------------------------------------------
 # TAB 1: DASHBOARD ANALITIK
@@ -110,17 +108,22 @@ with tab2:
             st.warning("⚠️ Tidak ada project ongoing.")
             st.info("Silakan buat project baru dulu di menu 'Projects'.")
         else:
-            # Jika project ada, baru buat form
+            # Project dipilih di luar form supaya daftar penjahit ikut kategorinya
+            sel_proj_id = st.selectbox("Pilih Project", list(proj_map.keys()), format_func=lambda x: proj_map[x])
+
+            # Penjahit yang masih punya sisa kapasitas untuk kategori project ini
+            # (speed kapabilitas/terukur dikurangi beban, sama seperti Smart Allocation)
+            tersedia_tailors = kapasitas_tersedia(proj_jenis_map[sel_proj_id])
+            tersedia_opts = {
+                int(t.tailor_id): f"{t.Nama} (sisa {t.sisa:.1f} pcs/hari)"
+                for t in tersedia_tailors.itertuples()
+            }
+
             with st.form("assign_form"):
-                sel_proj_id = st.selectbox("Pilih Project", list(proj_map.keys()), format_func=lambda x: proj_map[x])
-                
-                # Filter penjahit idle
-                idle_opts = {t[0]: t[1] for t in idle_tailors}
-                
-                if idle_opts:
-                    sel_tailor_id = st.selectbox("Pilih Penjahit (Idle)", list(idle_opts.keys()), format_func=lambda x: idle_opts[x])
+                if tersedia_opts:
+                    sel_tailor_id = st.selectbox("Pilih Penjahit (Ada Kapasitas)", list(tersedia_opts.keys()), format_func=lambda x: tersedia_opts[x])
                 else:
-                    st.warning("Semua penjahit sedang sibuk!")
+                    st.warning("Semua penjahit sedang penuh!")
                     sel_tailor_id = None
                 
                 amount = st.number_input("Jumlah Pcs", min_value=1, step=1)
@@ -132,27 +135,25 @@ with tab2:
                     if not sel_tailor_id:
                         st.error("Pilih penjahit terlebih dahulu (atau semua sedang sibuk).")
                     else:
-                        # Validasi Kuota Project
-                        curr_assigned = c.execute("SELECT COALESCE(SUM(amount_assigned), 0) FROM assignments WHERE project_id=?", (sel_proj_id,)).fetchone()[0]
                         proj_total = proj_amount_map[sel_proj_id]
-                        
-                        if curr_assigned + amount > proj_total:
-                            st.error(f"❌ Over capacity! Sisa kuota project ini hanya: {proj_total - curr_assigned} pcs.")
-                        else:
+
+                        def beri_tugas(tx):
+                            # Validasi Kuota Project (dalam transaksi yang sama dengan insert)
+                            curr_assigned = tx.execute(QUERY_KUOTA_TERPAKAI, (sel_proj_id,)).fetchone()[0]
+                            if curr_assigned + amount > proj_total:
+                                return proj_total - curr_assigned
+
                             # 1. Insert Assignment
-                            c.execute("INSERT INTO assignments (project_id, tailor_id, amount_assigned, status) VALUES (?, ?, ?, 'assigned')", (sel_proj_id, sel_tailor_id, amount))
-                            
+                            tx.execute("INSERT INTO assignments (project_id, tailor_id, amount_assigned, status) VALUES (?, ?, ?, 'assigned')", (sel_proj_id, sel_tailor_id, amount))
+
                             # 2. Update Status Penjahit -> Working
-                            c.execute("UPDATE tailors SET status='working' WHERE id=?", (sel_tailor_id,))
-
-                            # c.execute("""
-                            # UPDATE assignments SET a.payment_amount = (p.tailor_fee_per_item * ?)
-                            # FROM assignments a
-                            # JOIN projects p ON a.project_id = p.id
-                            # WHERE a.id = MAX(SELECT id FROM assignments)
-                            # """)
-                            
-                            conn.commit()
+                            tx.execute("UPDATE tailors SET status='working' WHERE id=?", (sel_tailor_id,))
+                            return None
+
+                        sisa_kuota = jalankan_tulis(beri_tugas)
+                        if sisa_kuota is not None:
+                            st.error(f"❌ Over capacity! Sisa kuota project ini hanya: {sisa_kuota} pcs.")
+                        else:
                             st.success(f"Tugas berhasil diberikan kepada penjahit ID {sel_tailor_id}!")
                             st.rerun()
 
@@ -203,15 +204,19 @@ with tab2:
                         # tailor_fee = c.execute("SELECT tailor_fee_per_item FROM projects WHERE id=?", (sel_proj_id,))
                     
                     if st.form_submit_button("Simpan Perubahan"):
-                        # Update Assignment
-                        c.execute("UPDATE assignments SET amount_assigned=?, status=? WHERE id=?", (new_amount, new_status, sel_assign_id))
-                        
-                        # LOGIC PENTING: Jika status berubah jadi 'paid', bebaskan penjahit (idle)
-                        if new_status == 'paid' and curr_row["Status"] != 'paid':
-                            c.execute("UPDATE tailors SET status='idle' WHERE id=?", (int(curr_row["tailor_id"]),))
+                        def ubah_assignment(tx):
+                            # Update Assignment
+                            tx.execute("UPDATE assignments SET amount_assigned=?, status=? WHERE id=?", (new_amount, new_status, sel_assign_id))
+
+                            # LOGIC PENTING: Jika status berubah jadi 'paid', bebaskan penjahit (idle)
+                            # kalau sudah tidak ada assignment lain yang masih berjalan
+                            if new_status == 'paid' and curr_row["Status"] != 'paid':
+                                tid = int(curr_row["tailor_id"])
+                                return tx.execute("UPDATE tailors SET status='idle' WHERE id=? AND NOT EXISTS (SELECT 1 FROM tailor_load WHERE tailor_id=?)", (tid, tid)).rowcount
+                            return 0
+
+                        if jalankan_tulis(ubah_assignment):
                             st.toast("Penjahit kini statusnya IDLE (Siap kerja lagi).")
-                            
-                        conn.commit()
                         st.success("Data berhasil diupdate!")
                         st.rerun()
         
@@ -220,7 +225,64 @@ with tab2:
             st.warning("Hapus assignment bersifat permanen")
         
         if st.button("Hapus Assignment"):
-            c.execute("DELETE FROM assignments WHERE id=?", (sel_assign_id,))
-            conn.commit()
+            jalankan_tulis(lambda tx: tx.execute("DELETE FROM assignments WHERE id=?", (sel_assign_id,)))
             st.error("Project dihapus.")
-            st.rerun()
\ No newline at end of file
+            st.rerun()
+
+# ------------------------------------------------------------------
+# TAB 3: RENCANA ALOKASI GLOBAL (SEMUA PROJECT ONGOING)
+# ------------------------------------------------------------------
+with tab3:
+    st.subheader("🌐 Rencana Alokasi Semua Project Ongoing")
+    st.caption("Menyusun pembagian penjahit idle ke semua project sekaligus, agar sebanyak mungkin project terkejar deadline. "
+               "Dihitung eksak (MILP) bila memungkinkan; kalau solver tidak tersedia atau terlalu lama, dipakai "
+               "heuristik greedy yang belum tentu optimal.")
+
+    if st.button("🧮 Susun Rencana Global"):
+        with st.spinner("Menyusun rencana..."):
+            st.session_state.rencana_global = buat_rencana_global()
+
+    if "rencana_global" in st.session_state:
+        df_ringkas, df_draft, metode = st.session_state.rencana_global
+        if df_ringkas.empty:
+            st.info("Semua project ongoing sudah terbagi habis.")
+        else:
+            n_kejar = int(df_ringkas["Terkejar?"].sum())
+            st.metric("Project Terkejar", f"{n_kejar} / {len(df_ringkas)}")
+            if metode == METODE_HEURISTIK:
+                st.warning(f"Metode: {metode}. Jumlah project terkejar belum tentu maksimum.")
+            else:
+                st.caption(f"Metode: {metode}")
+            st.dataframe(
+                df_ringkas.drop(columns=["project_id"]),
+                column_config={
+                    "Target (Pcs/Hari)": st.column_config.NumberColumn(format="%.1f"),
+                    "Kapasitas Tim (Pcs/Hari)": st.column_config.NumberColumn(format="%.1f"),
+                    "Estimasi Selesai (Hari)": st.column_config.NumberColumn(format="%.1f"),
+                },
+                use_container_width=True,
+                hide_index=True
+            )
+            st.markdown("##### 📋 Usulan Penugasan")
+            st.dataframe(df_draft.drop(columns=["project_id", "tailor_id"]), use_container_width=True, hide_index=True)
+
+            if not df_draft.empty and st.button("💾 Simpan sebagai Draft"):
+                plan_id = simpan_draft(df_draft)
+                del st.session_state.rencana_global
+                st.success(f"Draft rencana {plan_id} tersimpan.")
+                st.rerun()
+
+    st.divider()
+    st.markdown("##### 📝 Draft Aktif")
+    df_draft_aktif = muat_draft()
+    if df_draft_aktif.empty:
+        st.info("Belum ada draft.")
+    else:
+        st.dataframe(df_draft_aktif, use_container_width=True, hide_index=True)
+        if st.button("✅ Terapkan Draft ke Assignments"):
+            try:
+                jumlah = terapkan_draft()
+                st.success(f"{jumlah} penugasan dibuat dari draft.")
+                st.rerun()
+            except ValueError as e:
+                st.error(str(e))
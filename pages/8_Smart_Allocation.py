@@ -1,17 +1,28 @@
 import streamlit as st
 import pandas as pd
-import time
 import math
+import os
 import urllib.parse
 import random
 from datetime import date
-from allocation import hitung_rekomendasi 
+from allocation import (cari_rekomendasi, hitung_rekomendasi_batch, bagi_tugas, sapu_deadline, SAPU_HARI_MAKS,
+                        statistik_cache_hasil)
+from team_optimizer import pilih_tim_bertahap, front_pareto_tim
+from profiling import rekam, tahap, profil_aktif_default
+from clustering import label_cluster
+from db import baca_sql, statistik_pool, statistik_cache_query
 
 st.set_page_config(page_title="Smart Allocation", page_icon="🤖", layout="wide")
 
 st.title("🤖 AI Smart Allocation")
 st.markdown("Sistem rekomendasi penjahit berbasis **Deadline Matematis** dan **Kapasitas Real-time**.")
 
+# Tanpa atribut & kapabilitas (CSV tidak ada saat migrasi) semua penjahit dinilai netral
+if baca_sql("SELECT COUNT(*) AS n FROM tailor_attributes")["n"].iloc[0] == 0:
+    st.warning("Atribut & kapabilitas penjahit belum diimpor: semua penjahit dinilai dengan atribut netral "
+               "dan speed umum, jadi peringkat per jenis pakaian belum akurat. "
+               "Jalankan **Import dari CSV** di halaman Tailors.")
+
 st.divider()
 
 # --- FUNGSI GENERATOR LINK WA ---
@@ -49,14 +60,83 @@ Mohon konfirmasinya. Terima kasih."""
 # ==========================================
 if "search_done" not in st.session_state:
     st.session_state.search_done = False
-if "df_hasil" not in st.session_state:
-    st.session_state.df_hasil = None
+if "hasil" not in st.session_state:
+    st.session_state.hasil = None
+if "jumlah_tampil" not in st.session_state:
+    st.session_state.jumlah_tampil = 10
 if "input_pcs" not in st.session_state:
     st.session_state.input_pcs = 0
 if "input_deadline" not in st.session_state:
     st.session_state.input_deadline = date.today()
 if "project_name" not in st.session_state:
     st.session_state.project_name = "Project Baru"
+if "input_jenis" not in st.session_state:
+    st.session_state.input_jenis = "Seragam Sekolah"
+if "jejak_cari" not in st.session_state:
+    st.session_state.jejak_cari = None
+if "pareto" not in st.session_state:
+    st.session_state.pareto = None
+
+# ==========================================
+# MODE BULK UPLOAD (BANYAK ORDER SEKALIGUS)
+# ==========================================
+mode_input = st.sidebar.radio("Mode Input", ["📝 Satu Order", "📦 Bulk Upload"])
+debug = st.sidebar.checkbox("🐞 Profiling (Debug)", value=profil_aktif_default(),
+                            help="Catat waktu & jumlah baris tiap tahap perhitungan.")
+
+if mode_input == "📦 Bulk Upload":
+    st.subheader("📦 Bulk Upload Order")
+    st.caption("Upload CSV berisi banyak order. Semua order dihitung dalam satu kali proses.")
+
+    template = pd.DataFrame({
+        "nama_project": ["SD Contoh - Seragam Putih", "SMP Contoh - Rok"],
+        "jenis_project": ["Seragam Sekolah", "Rok Seragam"],
+        "jumlah_pcs": [300, 120],
+        "tgl_deadline": [date.today().isoformat(), date.today().isoformat()],
+    })
+    st.download_button("⬇️ Download Template CSV", template.to_csv(index=False), "template_bulk_order.csv", "text/csv")
+
+    file_orders = st.file_uploader("Upload CSV Order", type=["csv"])
+    if file_orders is not None:
+        try:
+            df_orders = pd.read_csv(file_orders)
+            if "nama_project" not in df_orders.columns:
+                df_orders["nama_project"] = [f"Order {i + 1}" for i in range(len(df_orders))]
+            with st.spinner(f"Menghitung {len(df_orders)} order..."):
+                hasil_batch = hitung_rekomendasi_batch(df_orders)
+        except Exception as e:
+            st.error(f"File order tidak valid: {e}")
+            st.stop()
+
+        ringkasan = []
+        for (_, order), (df_order, _) in zip(df_orders.iterrows(), hasil_batch):
+            top = df_order.iloc[0] if not df_order.empty else None
+            ringkasan.append({
+                "Project": order["nama_project"],
+                "Jenis": order["jenis_project"],
+                "Pcs": order["jumlah_pcs"],
+                "Deadline": order["tgl_deadline"],
+                "Kandidat Terbaik": top["Nama"] if top is not None else "-",
+                "Sanggup Solo?": bool(top["Sanggup?"]) if top is not None else False,
+                "Jml Sanggup (Tersedia)": int((df_order["Sanggup?"] & df_order["Tersedia?"]).sum()) if top is not None else 0,
+            })
+
+        st.success(f"✅ {len(ringkasan)} order selesai dianalisis.")
+        st.dataframe(pd.DataFrame(ringkasan), use_container_width=True, hide_index=True)
+
+        for (_, order), (df_order, pesan_order) in zip(df_orders.iterrows(), hasil_batch):
+            with st.expander(f"{order['nama_project']} ({order['jenis_project']}, {order['jumlah_pcs']} pcs)"):
+                st.markdown(pesan_order)
+                st.dataframe(
+                    df_order.head(10),
+                    column_config={
+                        "FINAL_SCORE": st.column_config.NumberColumn("Score", format="%.2f"),
+                        "Max Speed (Pcs/Hari)": st.column_config.NumberColumn("Speed", format="%.1f"),
+                        "Jarak (Km)": st.column_config.NumberColumn("Jarak", format="%.1f")
+                    },
+                    use_container_width=True
+                )
+    st.stop()
 
 # ==========================================
 # 1. FORM INPUT
@@ -72,20 +152,30 @@ with st.form("form_cari"):
     with col2:
         pcs = st.number_input("Jumlah Pcs", 1, 1000000, 100) 
         deadline_date = st.date_input("Tanggal Deadline", min_value=date.today())
+
+    nama_cluster = label_cluster()
+    filter_cluster = st.multiselect(
+        "Prefilter Cluster (opsional)", options=list(nama_cluster), format_func=lambda i: nama_cluster[i],
+        help="Hanya penjahit di cluster terpilih yang dihitung skornya. Kosongkan untuk semua penjahit."
+    )
     
     btn_cari = st.form_submit_button("🔍 Kalkulasi & Cari Solusi")
 
 if btn_cari:
     with st.spinner("Menghitung kapasitas & menyusun tim..."):
-        time.sleep(0.5) 
         try:
-            df_hasil, pesan = hitung_rekomendasi(jenis, pcs, deadline_date)
-            
+            # Hasil malas: hanya skor yang disimpan, peringkat diambil sesuai kebutuhan
+            with rekam("cari_rekomendasi", aktif=debug) as jejak:
+                hasil, pesan = cari_rekomendasi(jenis, pcs, deadline_date, cluster=filter_cluster or None)
+            st.session_state.jejak_cari = jejak
+
             st.session_state.search_done = True
-            st.session_state.df_hasil = df_hasil
+            st.session_state.hasil = hasil
+            st.session_state.jumlah_tampil = 10
             st.session_state.input_pcs = pcs
             st.session_state.input_deadline = deadline_date
             st.session_state.project_name = project_name
+            st.session_state.input_jenis = jenis
             
         except Exception as e:
             st.error(f"Terjadi kesalahan sistem: {e}")
@@ -93,173 +183,266 @@ if btn_cari:
 # ==========================================
 # 2. MENAMPILKAN HASIL
 # ==========================================
-if st.session_state.search_done and st.session_state.df_hasil is not None:
+with rekam("tampil_hasil", aktif=debug and st.session_state.search_done) as jejak_tampil:
+    if st.session_state.search_done and st.session_state.hasil is not None:
     
-    df_hasil = st.session_state.df_hasil
-    pcs_val = st.session_state.input_pcs
-    deadline_val = st.session_state.input_deadline
-    proj_name = st.session_state.project_name
+        hasil = st.session_state.hasil
+        df_hasil = hasil.teratas(st.session_state.jumlah_tampil)
+        pcs_val = st.session_state.input_pcs
+        deadline_val = st.session_state.input_deadline
+        proj_name = st.session_state.project_name
     
-    hari_sisa = (deadline_val - date.today()).days
-    if hari_sisa <= 0: hari_sisa = 1
-    target_speed = pcs_val / hari_sisa
+        hari_sisa = (deadline_val - date.today()).days
+        if hari_sisa <= 0: hari_sisa = 1
+        target_speed = pcs_val / hari_sisa
     
-    if not df_hasil.empty:
-        top = df_hasil.iloc[0]
-        is_single_capable = top['Sanggup?']
+        if not df_hasil.empty:
+            top = df_hasil.iloc[0]
+            is_single_capable = top['Sanggup?']
         
-        # --- BAGIAN A: REKOMENDASI UTAMA (SOLO) ---
-        # Layout tetap bersih seperti awal (Text & Metrics saja)
-        with st.container():
-            st.success("✅ Analisis Selesai!")
-            st.info(f"""
-            **Target Produksi:** {target_speed:.1f} pcs/hari (Selama {hari_sisa} hari)
-            """)
-
-            if is_single_capable:
-                st.markdown(f"""
-                ### 🏆 Rekomendasi Solo: **{top['Nama']}**
-                - **Status:** {top['Status'].upper()}
-                - **Kapasitas:** {top['Max Speed (Pcs/Hari)']:.1f} pcs/hari
-                - **Prediksi:** ✅ **Sanggup Mengerjakan Sendiri**
+            # --- BAGIAN A: REKOMENDASI UTAMA (SOLO) ---
+            # Layout tetap bersih seperti awal (Text & Metrics saja)
+            with st.container():
+                st.success("✅ Analisis Selesai!")
+                st.info(f"""
+                **Target Produksi:** {target_speed:.1f} pcs/hari (Selama {hari_sisa} hari)
                 """)
-            else:
-                st.error(f"⚠️ Tidak ada penjahit yang sanggup mengerjakan {pcs_val} pcs sendirian dalam {hari_sisa} hari!")
-                st.markdown(f"**Kandidat Terbaik (Solo):** {top['Nama']} (Hanya mampu {top['Max Speed (Pcs/Hari)']:.1f} pcs/hari)")
 
-        # Tabel Top 10 (WA Link disisipkan rapi di sini)
-        with st.expander("Lihat Detail Top 10 Kandidat Individu", expanded=not is_single_capable):
-            # Tambah link WA ke df_hasil (hanya untuk display)
-            df_display = add_whatsapp_link(df_hasil.head(10), proj_name, pcs_val)
+                if is_single_capable:
+                    st.markdown(f"""
+                    ### 🏆 Rekomendasi Solo: **{top['Nama']}**
+                    - **Status:** {top['Status'].upper()}
+                    - **Sisa Kapasitas:** {top['Max Speed (Pcs/Hari)']:.1f} pcs/hari (beban berjalan {top['Beban (Pcs/Hari)']:.1f} pcs/hari)
+                    - **Prediksi:** ✅ **Sanggup Mengerjakan Sendiri**
+                    """)
+                else:
+                    st.error(f"⚠️ Tidak ada penjahit yang sanggup mengerjakan {pcs_val} pcs sendirian dalam {hari_sisa} hari!")
+                    st.markdown(f"**Kandidat Terbaik (Solo):** {top['Nama']} (Hanya mampu {top['Max Speed (Pcs/Hari)']:.1f} pcs/hari)")
+
+            # Tabel Top 10 (WA Link disisipkan rapi di sini)
+            with st.expander(f"Lihat Detail Top {len(df_hasil)} Kandidat Individu", expanded=not is_single_capable):
+                # Tambah link WA ke df_hasil (hanya untuk display)
+                with tahap("link WA (top)", len(df_hasil)):
+                    df_display = add_whatsapp_link(df_hasil, proj_name, pcs_val)
             
-            st.dataframe(
-                df_display,
-                column_config={
-                    "Link WA": st.column_config.LinkColumn(
-                        "Hubungi", display_text="📲 Chat"
-                    ),
-                    "FINAL_SCORE": st.column_config.NumberColumn("Score", format="%.2f"),
-                    "Max Speed (Pcs/Hari)": st.column_config.NumberColumn("Speed", format="%.1f"),
-                    "Jarak (Km)": st.column_config.NumberColumn("Jarak", format="%.1f")
-                },
-                use_container_width=True
-            )
+                st.dataframe(
+                    df_display,
+                    column_config={
+                        "Link WA": st.column_config.LinkColumn(
+                            "Hubungi", display_text="📲 Chat"
+                        ),
+                        "FINAL_SCORE": st.column_config.NumberColumn("Score", format="%.2f"),
+                        "Max Speed (Pcs/Hari)": st.column_config.NumberColumn("Sisa Speed", format="%.1f"),
+                        "Beban (Pcs/Hari)": st.column_config.NumberColumn("Beban", format="%.1f"),
+                        "Jarak (Km)": st.column_config.NumberColumn("Jarak", format="%.1f")
+                    },
+                    use_container_width=True
+                )
+                if len(df_hasil) < len(hasil) and st.button("⬇️ Tampilkan 10 Berikutnya"):
+                    st.session_state.jumlah_tampil += 10
+                    st.rerun()
 
-        st.divider()
+            st.divider()
 
-        # --- BAGIAN B: SIMULASI SPLIT ORDER (LAYOUT AWAL YANG RAPI) ---
-        if is_single_capable:
-            st.subheader("⚡ Opsi Alternatif: Custom Split Order")
-            st.caption("Bagi beban kerja ke beberapa orang agar lebih ringan.")
-        else:
-            st.subheader("🤝 Solusi Wajib: Rekomendasi Tim")
-            st.caption("Satu orang tidak sanggup. Gunakan tim di bawah ini.")
+            # --- BAGIAN B: SIMULASI SPLIT ORDER (LAYOUT AWAL YANG RAPI) ---
+            if is_single_capable:
+                st.subheader("⚡ Opsi Alternatif: Custom Split Order")
+                st.caption("Bagi beban kerja ke beberapa orang agar lebih ringan.")
+            else:
+                st.subheader("🤝 Solusi Wajib: Rekomendasi Tim")
+                st.caption("Satu orang tidak sanggup. Gunakan tim di bawah ini.")
 
-        # Layout Split: Input Kiri, Hasil Kanan (Sesuai request awal)
-        col_sim1, col_sim2 = st.columns([1, 2])
+            # Layout Split: Input Kiri, Hasil Kanan (Sesuai request awal)
+            col_sim1, col_sim2 = st.columns([1, 2])
         
-        with col_sim1:
-            st.markdown("##### ⚙️ Atur Beban Kerja")
-            max_beban_user = st.number_input(
-                "Maksimal Pcs per Orang:", 
-                min_value=1, max_value=1000000,
-                value=int(pcs_val) if not is_single_capable else int(pcs_val/2),
-                step=10,
-                help="Sistem akan memastikan beban per orang tidak melebihi angka ini."
-            )
+            with col_sim1:
+                st.markdown("##### ⚙️ Atur Beban Kerja")
+                max_beban_user = st.number_input(
+                    "Maksimal Pcs per Orang:", 
+                    min_value=1, max_value=1000000,
+                    value=int(pcs_val) if not is_single_capable else int(pcs_val/2),
+                    step=10,
+                    help="Sistem akan memastikan beban per orang tidak melebihi angka ini."
+                )
+                mode_tim = st.radio(
+                    "Prioritas Tim:",
+                    ["Tim Terkecil", "Skor Tertinggi"],
+                    help="Tim Terkecil: orang paling sedikit yang memenuhi target. Skor Tertinggi: rata-rata skor terbaik."
+                )
         
-        with col_sim2:
-            # --- LOGIKA HITUNG TIM (STRICT CAPPING) ---
-            safe_max_beban = max(1, max_beban_user)
-            jumlah_org_butuh = math.ceil(pcs_val / safe_max_beban)
+            with col_sim2:
+                # --- LOGIKA HITUNG TIM (STRICT CAPPING) ---
+                safe_max_beban = max(1, max_beban_user)
+                jumlah_org_butuh = math.ceil(pcs_val / safe_max_beban)
             
-            candidates = df_hasil[df_hasil['Status'] == 'idle'].copy()
-            team = candidates.head(jumlah_org_butuh)
-            current_speed = team['Max Speed (Pcs/Hari)'].sum()
-            
-            while current_speed < target_speed and len(team) < len(candidates):
-                jumlah_org_butuh += 1
-                team = candidates.head(jumlah_org_butuh)
-                current_speed = team['Max Speed (Pcs/Hari)'].sum()
-
-            final_team = []
-            for idx, row in team.iterrows():
-                final_team.append(row)
-
-            if final_team:
-                # --- LOGIKA DISTRIBUSI TUGAS (WATER FILLING) ---
-                total_speed_team = sum([p['Max Speed (Pcs/Hari)'] for p in final_team])
-                temp_allocations = []
-                for p in final_team:
-                    ideal_share = (p['Max Speed (Pcs/Hari)'] / total_speed_team) * pcs_val
-                    capped_share = min(ideal_share, safe_max_beban) 
-                    temp_allocations.append(capped_share)
-                
-                allocations = [int(x) for x in temp_allocations]
-                
-                remaining_pcs = pcs_val - sum(allocations)
-                sorted_indices = sorted(range(len(final_team)), key=lambda k: final_team[k]['Max Speed (Pcs/Hari)'], reverse=True)
-                
-                while remaining_pcs > 0:
-                    distributed = False
-                    for idx in sorted_indices:
-                        if remaining_pcs <= 0: break
-                        if allocations[idx] < safe_max_beban:
-                            allocations[idx] += 1
-                            remaining_pcs -= 1
-                            distributed = True
-                    if not distributed: break
-
-                # PREPARE DATA UNTUK TABEL AKHIR
-                dist_data = []
-                for i, member in enumerate(final_team):
-                    row_data = member.to_dict()
-                    row_data['Tugas (Pcs)'] = allocations[i]
-                    dist_data.append(row_data)
+                # Kandidat: siapa saja yang masih punya sisa kapasitas (bukan hanya yang idle)
+                # diambil bertahap dari peringkat teratas, bukan DataFrame seluruh roster
+                team, info_tim = pilih_tim_bertahap(
+                    hasil.tersedia(), target_speed, jumlah_org_butuh,
+                    mode="terkecil" if mode_tim == "Tim Terkecil" else "skor"
+                )
+
+                final_team = []
+                for idx, row in team.iterrows():
+                    final_team.append(row)
+
+                if final_team:
+                    # --- LOGIKA DISTRIBUSI TUGAS (WATER FILLING) ---
+                    with tahap("bagi_tugas", len(final_team)):
+                        allocations = bagi_tugas(
+                            [p['Max Speed (Pcs/Hari)'] for p in final_team], pcs_val, safe_max_beban
+                        )
+
+                    # PREPARE DATA UNTUK TABEL AKHIR
+                    dist_data = []
+                    for i, member in enumerate(final_team):
+                        row_data = member.to_dict()
+                        row_data['Tugas (Pcs)'] = allocations[i]
+                        dist_data.append(row_data)
                 
-                df_team_final = pd.DataFrame(dist_data)
+                    df_team_final = pd.DataFrame(dist_data)
                 
-                # Tambah Link WA ke Tim
-                df_team_final = add_whatsapp_link(df_team_final, proj_name, pcs_val)
+                    # Tambah Link WA ke Tim
+                    with tahap("link WA (tim)", len(df_team_final)):
+                        df_team_final = add_whatsapp_link(df_team_final, proj_name, pcs_val)
                 
-                # --- DISPLAY METRICS & TABLE ---
-                # Metrics
-                df_team_ori = pd.DataFrame(final_team)
-                total_cap = df_team_ori['Max Speed (Pcs/Hari)'].sum()
-                est_days = pcs_val / total_cap if total_cap > 0 else 999
+                    # --- DISPLAY METRICS & TABLE ---
+                    # Metrics
+                    df_team_ori = pd.DataFrame(final_team)
+                    total_cap = df_team_ori['Max Speed (Pcs/Hari)'].sum()
+                    est_days = pcs_val / total_cap if total_cap > 0 else 999
 
-                st.info(f"Hasil Simulasi: Membatasi max **{safe_max_beban} pcs/orang** ➝ Butuh **{len(final_team)} Penjahit**.")
+                    st.info(f"Hasil Simulasi: Membatasi max **{safe_max_beban} pcs/orang** ➝ Butuh **{len(final_team)} Penjahit**.")
+                    st.caption(f"Metode pemilihan tim: {info_tim['metode']} ({info_tim['waktu'] * 1000:.0f} ms)")
 
-                m1, m2, m3 = st.columns(3)
-                m1.metric("Kapasitas Tim", f"{total_cap:.1f} pcs/hari", f"Target: {target_speed:.1f}")
+                    m1, m2, m3 = st.columns(3)
+                    m1.metric("Kapasitas Tim", f"{total_cap:.1f} pcs/hari", f"Target: {target_speed:.1f}")
                 
-                if est_days <= hari_sisa:
-                    m2.metric("Estimasi Selesai", f"{est_days:.1f} Hari", f"✅ Aman (< {hari_sisa} hari)")
+                    if est_days <= hari_sisa:
+                        m2.metric("Estimasi Selesai", f"{est_days:.1f} Hari", f"✅ Aman (< {hari_sisa} hari)")
+                    else:
+                        m2.metric("Estimasi Selesai", f"{est_days:.1f} Hari", f"⚠️ Telat", delta_color="inverse")
+                        st.warning("Kapasitas masih kurang. Tambah orang atau undur deadline.")
+
+                    # Table Tim
+                    st.markdown("##### ⚖️ Saran Pembagian Tugas & Kontak:")
+                    st.dataframe(
+                        df_team_final[['Nama', 'Status', 'Max Speed (Pcs/Hari)', 'Beban (Pcs/Hari)', 'Tugas (Pcs)', 'Link WA']],
+                        column_config={
+                            "Link WA": st.column_config.LinkColumn(
+                                "Hubungi", display_text="📲 Chat"
+                            ),
+                            "Max Speed (Pcs/Hari)": st.column_config.NumberColumn("Sisa Speed", format="%.1f"),
+                            "Beban (Pcs/Hari)": st.column_config.NumberColumn("Beban", format="%.1f")
+                        },
+                        use_container_width=True
+                    )
+
                 else:
-                    m2.metric("Estimasi Selesai", f"{est_days:.1f} Hari", f"⚠️ Telat", delta_color="inverse")
-                    st.warning("Kapasitas masih kurang. Tambah orang atau undur deadline.")
+                    st.error("Tidak cukup penjahit tersedia.")
 
-                # Table Tim
-                st.markdown("##### ⚖️ Saran Pembagian Tugas & Kontak:")
-                st.dataframe(
-                    df_team_final[['Nama', 'Status', 'Max Speed (Pcs/Hari)', 'Tugas (Pcs)', 'Link WA']],
-                    column_config={
-                        "Link WA": st.column_config.LinkColumn(
-                            "Hubungi", display_text="📲 Chat"
-                        ),
-                        "Max Speed (Pcs/Hari)": st.column_config.NumberColumn("Speed", format="%.1f")
-                    },
-                    use_container_width=True
+            # --- BAGIAN B2: JELAJAH FRONTIER TIM (PARETO) ---
+            with st.expander("🧭 Jelajah Pilihan Tim (Kapasitas vs Jarak vs Attitude)"):
+                st.caption(
+                    "Semua tim yang memenuhi target dan tidak kalah di ketiga aspek sekaligus. "
+                    "Pilih sesuai prioritas tanpa menghitung ulang."
                 )
+                # Frontier dihitung sekali per pencarian & batas beban; memilih tim cukup membaca session_state
+                kunci_pareto = (id(hasil), pcs_val, deadline_val, safe_max_beban)
+                if st.session_state.pareto is None or st.session_state.pareto[0] != kunci_pareto:
+                    if st.button("Hitung Frontier Tim"):
+                        kandidat = hasil.tersedia().teratas(300)
+                        with tahap("frontier pareto", len(kandidat)):
+                            front, info_front = front_pareto_tim(kandidat, target_speed, jumlah_org_butuh)
+                        st.session_state.pareto = (kunci_pareto, kandidat, front, info_front)
 
-            else:
-                st.error("Tidak cukup penjahit tersedia.")
+                if st.session_state.pareto is not None and st.session_state.pareto[0] == kunci_pareto:
+                    _, kandidat, front, info_front = st.session_state.pareto
+                    if front.empty:
+                        st.error("Tidak ada tim yang memenuhi target dari kandidat yang tersedia.")
+                    else:
+                        st.caption(
+                            f"{len(front)} tim di frontier dari {info_front['kandidat']} kandidat teratas "
+                            f"({info_front['kandidat_dipakai']} tersisa setelah pemangkasan, "
+                            f"{info_front['waktu'] * 1000:.0f} ms)"
+                        )
+                        st.scatter_chart(
+                            front, x='Rata-rata Jarak (Km)', y='Kapasitas Tim (Pcs/Hari)',
+                            color='Rata-rata Attitude', size='Jml Penjahit'
+                        )
+                        pilihan = st.selectbox(
+                            "Pilih Tim:",
+                            front.index,
+                            format_func=lambda i: (
+                                f"Tim {i + 1}: {front.at[i, 'Jml Penjahit']} orang · "
+                                f"{front.at[i, 'Kapasitas Tim (Pcs/Hari)']:.1f} pcs/hari · "
+                                f"{front.at[i, 'Rata-rata Jarak (Km)']:.1f} km · "
+                                f"attitude {front.at[i, 'Rata-rata Attitude']:.0f}"
+                            )
+                        )
+                        tim_pilih = kandidat.loc[front.at[pilihan, 'anggota']].copy()
+                        tim_pilih['Tugas (Pcs)'] = bagi_tugas(
+                            tim_pilih['Max Speed (Pcs/Hari)'].to_numpy(), pcs_val, safe_max_beban
+                        )
+                        tim_pilih = add_whatsapp_link(tim_pilih, proj_name, pcs_val)
+                        st.dataframe(
+                            tim_pilih[['Nama', 'Status', 'Max Speed (Pcs/Hari)', 'Jarak (Km)', 'Attitude',
+                                       'Tugas (Pcs)', 'Link WA']],
+                            column_config={
+                                "Link WA": st.column_config.LinkColumn("Hubungi", display_text="📲 Chat"),
+                                "Max Speed (Pcs/Hari)": st.column_config.NumberColumn("Sisa Speed", format="%.1f"),
+                            },
+                            use_container_width=True
+                        )
 
-    else:
-        st.warning("Data tidak ditemukan.")
+            # --- BAGIAN C: SENSITIVITAS DEADLINE ---
+            with st.expander("📈 Sensitivitas Deadline (Kapan Paling Cepat Bisa Janji?)"):
+                with tahap("sapu deadline"):
+                    df_sapu = sapu_deadline(st.session_state.input_jenis, pcs_val, maks_per_orang=safe_max_beban)
+                terkejar = df_sapu[df_sapu['Terkejar?']]
+                if terkejar.empty:
+                    st.error(f"Dalam {SAPU_HARI_MAKS} hari ke depan tidak ada tim yang bisa mengejar {pcs_val} pcs.")
+                else:
+                    paling_cepat = terkejar.iloc[0]
+                    s1, s2 = st.columns(2)
+                    s1.metric("Deadline Paling Cepat", paling_cepat['Deadline'].strftime('%d %b %Y'), f"{int(paling_cepat['Sisa Hari'])} hari lagi")
+                    s2.metric("Tim Minimum", f"{int(paling_cepat['Min Penjahit'])} Penjahit")
+                st.caption(f"Tim terkecil (maks {safe_max_beban} pcs/orang) untuk setiap deadline dari hari ini sampai +{SAPU_HARI_MAKS} hari.")
+                st.line_chart(df_sapu, x='Deadline', y=['Min Penjahit', 'Estimasi Selesai (Hari)'])
+
+        else:
+            st.warning("Data tidak ditemukan.")
+
+# ==========================================
+# 3. PANEL DEBUG (PROFILING)
+# ==========================================
+if debug:
+    with st.expander("🐞 Debug: Waktu per Tahap", expanded=True):
+        for jejak in [st.session_state.jejak_cari, jejak_tampil]:
+            if jejak is None:
+                continue
+            st.markdown(f"**{jejak.nama}** — total {jejak.total * 1000:.1f} ms")
+            st.dataframe(
+                jejak.ke_dataframe(),
+                column_config={"ms": st.column_config.NumberColumn("Waktu (ms)", format="%.2f")},
+                hide_index=True, use_container_width=True
+            )
+        cache = statistik_cache_hasil()
+        st.caption(f"Cache hasil bersama: {cache['entri']} entri, {cache['mb']:.1f} MB, "
+                   f"hit {cache['hit']} / miss {cache['miss']}, dibuang {cache['dibuang']}.")
+        for path, pool in statistik_pool().items():
+            st.caption(f"Pool koneksi {os.path.basename(path)}: {pool['dipinjam']} dipinjam, "
+                       f"{pool['menganggur']} menganggur (maks {pool['maks']}), {pool['dibuat']} dibuat, "
+                       f"tunggu rata-rata {pool['rata_tunggu_ms']:.1f} ms (maks {pool['maks_tunggu_ms']:.1f} ms), "
+                       f"{pool['ulang_tulis']} tulis diulang.")
+        query = statistik_cache_query()
+        st.caption(f"Cache query halaman: {query['entri']} entri, {query['mb']:.1f} MB, "
+                   f"hit {query['hit']} / miss {query['miss']}, basi {query['basi']}, dibuang {query['dibuang']}.")
+        st.caption("Set env KOPERASI_PROFIL_LOG=path untuk menyimpan jejak sebagai JSON per baris.")
 
 if st.session_state.search_done:
     if st.button("🔄 Reset / Cari Ulang"):
         st.session_state.search_done = False
-        st.session_state.df_hasil = None
+        st.session_state.hasil = None
+        st.session_state.pareto = None
         st.rerun()
\ No newline at end of file
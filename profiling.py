@@ -0,0 +1,99 @@
+# profiling.py (Instrumentasi opsional: waktu & jumlah baris per tahap)
+#
+# Pemakaian:
+#   with rekam("smart_allocation") as jejak:      # aktifkan perekaman
+#       hasil = hitung_rekomendasi(...)           # tahap di dalamnya ikut tercatat
+#   jejak.ke_dataframe()
+#
+# Di dalam kode yang diukur:
+#   with tahap("muat CSV") as t:
+#       df = pd.read_csv(...)
+#       t["baris"] = len(df)
+#
+# Tanpa rekam() aktif, tahap() hampir tanpa biaya (tidak mengukur apa pun).
+# Set KOPERASI_PROFIL=1 untuk mengaktifkan rekam() di semua tempat, dan
+# KOPERASI_PROFIL_LOG=path untuk menulis tiap jejak sebagai satu baris JSON.
+import contextvars
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+logger = logging.getLogger("koperasi.profil")
+
+_jejak_aktif = contextvars.ContextVar("jejak_aktif", default=None)
+
+if os.environ.get("KOPERASI_PROFIL_LOG"):
+    _handler = logging.FileHandler(os.environ["KOPERASI_PROFIL_LOG"], encoding="utf-8")
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+
+def profil_aktif_default():
+    """Profiling aktif untuk semua rekam() kalau env KOPERASI_PROFIL diset."""
+    return os.environ.get("KOPERASI_PROFIL", "").lower() in ("1", "true", "ya")
+
+
+class Jejak:
+    """Daftar tahap (nama, detik, baris) untuk satu kali proses yang direkam."""
+
+    def __init__(self, nama):
+        self.nama = nama
+        self.waktu = datetime.now().isoformat(timespec="seconds")
+        self.tahap = []
+        self.total = 0.0
+
+    def ke_dict(self):
+        return {"jejak": self.nama, "waktu": self.waktu, "total_detik": round(self.total, 6),
+                "tahap": self.tahap}
+
+    def ke_dataframe(self):
+        df = pd.DataFrame(self.tahap, columns=["tahap", "detik", "baris"])
+        df["ms"] = df["detik"] * 1000
+        return df[["tahap", "ms", "baris"]]
+
+
+@contextmanager
+def rekam(nama, aktif=None):
+    """
+    Rekam semua tahap() yang dijalankan di dalam blok ini (thread/sesi yang sama).
+    Yield Jejak, atau None kalau tidak aktif. Saat selesai jejak ditulis ke log.
+    """
+    if aktif is None:
+        aktif = profil_aktif_default()
+    if not aktif:
+        yield None
+        return
+
+    jejak = Jejak(nama)
+    token = _jejak_aktif.set(jejak)
+    mulai = time.perf_counter()
+    try:
+        yield jejak
+    finally:
+        jejak.total = time.perf_counter() - mulai
+        _jejak_aktif.reset(token)
+        logger.info(json.dumps(jejak.ke_dict(), default=str))
+
+
+@contextmanager
+def tahap(nama, baris=None):
+    """Ukur satu tahap kalau ada rekam() aktif. Isi catatan["baris"] untuk jumlah baris."""
+    jejak = _jejak_aktif.get()
+    catatan = {"tahap": nama, "detik": 0.0, "baris": baris}
+    if jejak is None:
+        yield catatan
+        return
+
+    # Dicatat saat mulai supaya tahap bersarang tetap urut waktu mulai
+    jejak.tahap.append(catatan)
+    mulai = time.perf_counter()
+    try:
+        yield catatan
+    finally:
+        catatan["detik"] = time.perf_counter() - mulai
@@ -0,0 +1,108 @@
+# query_halaman.py (Query SQL halaman Streamlit, dipakai halaman & cek_query_plan.py)
+#
+# Query di sini dijalankan apa adanya oleh halaman; cek_query_plan.py memeriksa
+# plan query yang sama, jadi ubah di sini (bukan di halaman) supaya tetap sinkron.
+
+# Projects: daftar project + estimasi biaya & profit
+QUERY_PROJECTS = """
+SELECT
+    p.id AS project_id,
+    p.project_name AS "Nama Project",
+    p.customer_name AS "Customer",
+    p.clothes_type AS "Jenis",
+    p.amount AS "Jumlah (pcs)",
+    p.order_date AS "Order Date",
+    p.deadline AS "Deadline",
+    p.status AS "Status",
+    p.notes AS "Catatan",
+    p.tailor_fee_per_item AS "Biaya Jahit / Item",
+    p.base_fee AS "Harga Dasar",
+    p.price_per_item AS "Harga Jual / Item",
+    -- Estimasi Biaya & Profit
+    (COALESCE(SUM(pc.price), 0) + p.base_fee + (p.amount * p.tailor_fee_per_item)) AS "Total Biaya",
+    (p.price_per_item * p.amount) AS "Total Pendapatan",
+    ((p.price_per_item * p.amount) - (COALESCE(SUM(pc.price), 0) + p.base_fee + (p.amount * p.tailor_fee_per_item))) AS "Total Keuntungan"
+FROM projects p
+LEFT JOIN purchases pc ON pc.project_id = p.id
+GROUP BY p.id
+ORDER BY p.id DESC;
+"""
+
+# Purchases & Inventory: pilihan project ongoing di form
+QUERY_PROJECT_ONGOING = "SELECT id, project_name FROM projects WHERE status='ongoing'"
+
+# Purchases: daftar pembelian lengkap
+QUERY_PURCHASES = """
+SELECT
+    pc.id,
+    p.project_name AS "Untuk Project",
+    s.name AS "Supplier",
+    pc.item AS "Nama Barang",
+    pc.amount AS "Jml",
+    pc.unit AS "Satuan",
+    pc.price AS "Total Harga",
+    pc.date AS "Tanggal"
+FROM purchases pc
+LEFT JOIN projects p ON p.id = pc.project_id
+LEFT JOIN suppliers s ON s.id = pc.supplier_id
+ORDER BY pc.date DESC
+"""
+
+# Inventory: stok akhir per kain
+QUERY_STOK_KAIN = """
+SELECT
+    fabric_type AS "Jenis Kain",
+    SUM(CASE WHEN direction='IN' THEN amount ELSE -amount END) AS "Stok Akhir"
+FROM inventory
+GROUP BY fabric_type
+HAVING "Stok Akhir" != 0
+ORDER BY "Stok Akhir" DESC
+"""
+
+# Inventory: riwayat keluar-masuk kain
+QUERY_RIWAYAT_INVENTORY = """
+SELECT id, fabric_type, amount, direction, reason, created_at
+FROM inventory ORDER BY created_at DESC
+"""
+
+# Suppliers: total belanja per supplier
+QUERY_BELANJA_SUPPLIER = """
+SELECT
+    s.name AS "Supplier",
+    COUNT(p.id) AS "Total Transaksi",
+    COALESCE(SUM(p.price), 0) AS "Total Belanja"
+FROM suppliers s
+LEFT JOIN purchases p ON p.supplier_id = s.id
+GROUP BY s.id
+ORDER BY "Total Belanja" DESC
+"""
+
+# Tailors: riwayat kerja satu penjahit (parameter: tailor_id)
+QUERY_RIWAYAT_PENJAHIT = """
+    SELECT
+        a.id AS "Assignment ID",
+        p.project_name AS "Project",
+        p.order_date AS "Tanggal Order",
+        p.deadline AS "Deadline",
+        a.amount_assigned AS "Jumlah Dijahit",
+        a.status AS "Status",
+        (a.amount_assigned * p.tailor_fee_per_item) AS Bayaran
+    FROM assignments a
+    JOIN tailors t on a.tailor_id = t.id
+    JOIN projects p on p.id = a.project_id
+
+    WHERE t.id = ?
+    ORDER BY a.id DESC
+"""
+
+# Assignments: project ongoing untuk dropdown & validasi kuota
+QUERY_PROJECT_ONGOING_TUGAS = "SELECT id, project_name, amount, clothes_type FROM projects WHERE status='ongoing'"
+
+# Assignments: pcs yang sudah dibagi untuk satu project (parameter: project_id)
+QUERY_KUOTA_TERPAKAI = "SELECT COALESCE(SUM(amount_assigned), 0) FROM assignments WHERE project_id=?"
+
+# Dashboard: jumlah project per status
+QUERY_STATUS_PROJECT = "SELECT status, COUNT(*) as count FROM projects GROUP BY status"
+
+# Dashboard: pembelian terakhir
+QUERY_PEMBELIAN_TERAKHIR = "SELECT item, amount, unit, price, date FROM purchases ORDER BY date DESC LIMIT 5"
@@ -0,0 +1,198 @@
+# rencana_batch.py (Perencanaan offline: evaluasi banyak skenario order sekaligus, tanpa Streamlit)
+#
+# Contoh:
+#   python rencana_batch.py skenario.csv                       # hasil ke rencana_ringkasan.csv & rencana_tim.csv
+#   python rencana_batch.py skenario.csv -o tahun_ajaran --format parquet --workers 8
+#
+# Kolom CSV skenario:
+#   jenis_project   kategori map_kapabilitas (mis. "Seragam Sekolah") atau clothes_type project ("rok")
+#   jumlah_pcs      jumlah pcs order
+#   tgl_deadline    YYYY-MM-DD, atau kolom `hari` (deadline = hari ini + hari)
+#   skenario        (opsional) label skenario, default nomor baris
+#   maks_per_orang  (opsional) batas pcs per penjahit, default seperti halaman Smart Allocation
+#   mode            (opsional) "terkecil" / "skor", default "terkecil"
+import argparse
+import math
+import multiprocessing as mp
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+import pandas as pd
+
+from allocation import (RosterStatis, snapshot_roster, hasil_dari_statis, bagi_tugas, _normalisasi_orders,
+                        _sisa_hari, map_kapabilitas, map_clothes_type)
+from team_optimizer import pilih_tim_bertahap
+
+KOLOM_RINGKASAN = ['skenario', 'jenis_project', 'jumlah_pcs', 'tgl_deadline', 'Sisa Hari', 'Target (Pcs/Hari)',
+                   'Maks Pcs/Orang', 'Sanggup Sendiri?', 'Jml Penjahit', 'Kapasitas Tim (Pcs/Hari)',
+                   'Estimasi Selesai (Hari)', 'Terkejar?', 'Tim Optimal?', 'Metode Tim', 'Pesan']
+KOLOM_TIM = ['skenario', 'tailor_id', 'Nama', 'Status', 'Max Speed (Pcs/Hari)', 'FINAL_SCORE', 'Tugas (Pcs)']
+
+# (roster, RosterStatis) milik proses worker, read-only. Dengan start method "fork"
+# diwarisi dari proses induk (copy-on-write), jadi roster tidak disalin per worker.
+_snapshot = None
+
+
+def baca_skenario(path):
+    """CSV skenario -> DataFrame order standar (lihat kolom di atas)."""
+    df = pd.read_csv(path)
+    if 'tgl_deadline' not in df.columns and 'hari' in df.columns:
+        df['tgl_deadline'] = [date.today() + timedelta(days=int(h)) for h in df['hari']]
+    df = _normalisasi_orders(df)
+    df['jenis_project'] = [map_clothes_type.get(str(j).strip().lower(), str(j).strip()) for j in df['jenis_project']]
+    asing = sorted(set(df['jenis_project']) - set(map_kapabilitas))
+    if asing:
+        raise ValueError(f"Jenis project tidak dikenal: {', '.join(asing)}")
+    if 'skenario' not in df.columns:
+        df['skenario'] = [f"#{i + 1}" for i in range(len(df))]
+    if 'maks_per_orang' not in df.columns:
+        df['maks_per_orang'] = None
+    if 'mode' not in df.columns:
+        df['mode'] = "terkecil"
+    df['mode'] = df['mode'].fillna("terkecil")
+    return df
+
+
+def rencanakan_skenario(roster, statis, skenario):
+    """
+    Rekomendasi tim + pembagian tugas untuk satu skenario (dict satu baris CSV).
+    Aturan sama dengan halaman Smart Allocation: target = pcs / sisa hari,
+    default batas per orang = semua pcs kalau ada yang sanggup sendiri, kalau
+    tidak setengahnya.
+    Return: (dict ringkasan, list dict anggota tim)
+    """
+    pcs = int(skenario['jumlah_pcs'])
+    sisa_hari = _sisa_hari(skenario['tgl_deadline'])
+    target_speed = pcs / sisa_hari
+
+    hasil = hasil_dari_statis(statis, skenario['jenis_project'], pcs, skenario['tgl_deadline'])
+    top = hasil.teratas(1)
+    sanggup_sendiri = bool(len(top) and top['Sanggup?'].iloc[0])
+
+    maks_per_orang = skenario.get('maks_per_orang')
+    if maks_per_orang is None or pd.isna(maks_per_orang):
+        maks_per_orang = pcs if sanggup_sendiri else int(pcs / 2)
+    maks_per_orang = max(1, int(maks_per_orang))
+
+    team, info = pilih_tim_bertahap(hasil.tersedia(), target_speed, math.ceil(pcs / maks_per_orang),
+                                    mode=skenario['mode'])
+    speeds = team['Max Speed (Pcs/Hari)'].to_numpy(dtype=float)
+    tugas = bagi_tugas(speeds, pcs, maks_per_orang) if len(team) else []
+    kapasitas = float(speeds.sum())
+
+    ringkasan = {
+        'skenario': skenario['skenario'],
+        'jenis_project': skenario['jenis_project'],
+        'jumlah_pcs': pcs,
+        'tgl_deadline': skenario['tgl_deadline'],
+        'Sisa Hari': sisa_hari,
+        'Target (Pcs/Hari)': target_speed,
+        'Maks Pcs/Orang': maks_per_orang,
+        'Sanggup Sendiri?': sanggup_sendiri,
+        'Jml Penjahit': len(team),
+        'Kapasitas Tim (Pcs/Hari)': kapasitas,
+        'Estimasi Selesai (Hari)': pcs / kapasitas if kapasitas > 0 else None,
+        'Terkejar?': kapasitas > 0 and pcs / kapasitas <= sisa_hari,
+        'Tim Optimal?': bool(info.get('optimal', False)),
+        'Metode Tim': info.get('metode'),
+        'Pesan': " ".join(hasil.pesan.split()),
+    }
+    tailor_id = roster['tailor_id'] if 'tailor_id' in roster.columns else None
+    anggota = [{
+        'skenario': skenario['skenario'],
+        'tailor_id': None if tailor_id is None else int(tailor_id.loc[idx]),
+        'Nama': row['Nama'],
+        'Status': row['Status'],
+        'Max Speed (Pcs/Hari)': float(row['Max Speed (Pcs/Hari)']),
+        'FINAL_SCORE': float(row['FINAL_SCORE']),
+        'Tugas (Pcs)': int(jatah),
+    } for (idx, row), jatah in zip(team.iterrows(), tugas)]
+    return ringkasan, anggota
+
+
+def _siapkan_worker(roster):
+    global _snapshot
+    if roster is not None:
+        # Start method tanpa fork: roster dikirim sekali per worker, bukan per skenario
+        _snapshot = (roster, RosterStatis(roster))
+
+
+def _evaluasi_potongan(daftar_skenario):
+    roster, statis = _snapshot
+    return [rencanakan_skenario(roster, statis, s) for s in daftar_skenario]
+
+
+def evaluasi_semua(roster, statis, df_skenario, workers=None, ukuran_potongan=None):
+    """
+    Evaluasi semua skenario paralel di ProcessPoolExecutor.
+    Return: (DataFrame ringkasan, DataFrame tim) urut sesuai CSV.
+    """
+    global _snapshot
+    daftar = df_skenario.to_dict('records')
+    workers = workers or os.cpu_count() or 1
+    ukuran_potongan = ukuran_potongan or max(1, math.ceil(len(daftar) / (workers * 4)))
+    potongan = [daftar[i:i + ukuran_potongan] for i in range(0, len(daftar), ukuran_potongan)]
+
+    _snapshot = (roster, statis)
+    if workers == 1 or len(potongan) <= 1:
+        hasil = [_evaluasi_potongan(p) for p in potongan]
+    else:
+        if 'fork' in mp.get_all_start_methods():
+            ctx, initargs = mp.get_context('fork'), (None,)
+        else:
+            ctx, initargs = mp.get_context('spawn'), (roster,)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                 initializer=_siapkan_worker, initargs=initargs) as pool:
+            hasil = list(pool.map(_evaluasi_potongan, potongan))
+
+    ringkasan, tim = [], []
+    for potong in hasil:
+        for r, anggota in potong:
+            ringkasan.append(r)
+            tim += anggota
+    return pd.DataFrame(ringkasan, columns=KOLOM_RINGKASAN), pd.DataFrame(tim, columns=KOLOM_TIM)
+
+
+def simpan(df, path, format):
+    if format == "parquet":
+        try:
+            df.to_parquet(path, index=False)
+        except ImportError:
+            raise SystemExit("❌ Format parquet butuh pyarrow (pip install pyarrow).")
+    else:
+        df.to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluasi banyak skenario order (tim & kelayakan) secara offline")
+    parser.add_argument("skenario", help="CSV skenario order")
+    parser.add_argument("-o", "--output", default="rencana", help="awalan nama file hasil")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--workers", type=int, default=None, help="jumlah proses (default: jumlah core)")
+    args = parser.parse_args()
+
+    try:
+        df_skenario = baca_skenario(args.skenario)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    mulai = time.perf_counter()
+    roster, statis = snapshot_roster()
+    ringkasan, tim = evaluasi_semua(roster, statis, df_skenario, args.workers)
+
+    path_ringkasan = f"{args.output}_ringkasan.{args.format}"
+    path_tim = f"{args.output}_tim.{args.format}"
+    simpan(ringkasan, path_ringkasan, args.format)
+    simpan(tim, path_tim, args.format)
+    print(f"✅ {len(ringkasan)} skenario dievaluasi dalam {time.perf_counter() - mulai:.1f} detik "
+          f"({int(ringkasan['Terkejar?'].sum())} terkejar).")
+    print(f"   Ringkasan: {path_ringkasan}")
+    print(f"   Tim      : {path_tim}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+import math
+import time
+import numpy as np
+import pandas as pd
+from profiling import tahap
+
+KOLOM_SPEED = 'Max Speed (Pcs/Hari)'
+KOLOM_SKOR = 'FINAL_SCORE'
+KOLOM_JARAK = 'Jarak (Km)'
+KOLOM_ATTITUDE = 'Attitude'
+
+
+def tim_greedy(speeds, target_speed, min_anggota):
+    """
+    Cara lama: ambil prefix urutan skor, tambah satu orang sampai total speed
+    mencapai target. Return jumlah anggota (prefix).
+    """
+    n = len(speeds)
+    k = min(min_anggota, n)
+    kumulatif = np.cumsum(speeds)
+    while k < n and (k == 0 or kumulatif[k - 1] < target_speed):
+        k += 1
+    return k
+
+
+def _buang_terdominasi(speeds, scores, k):
+    """
+    Buang kandidat yang didominasi >= k kandidat lain (skor & speed sama/lebih
+    baik). Kandidat seperti itu selalu bisa ditukar tanpa merugikan, jadi
+    solusi optimal tetap ada di sisa kandidat. Input sudah urut skor menurun.
+    """
+    n = len(speeds)
+    # Ranking speed untuk Fenwick tree (speed lebih besar -> rank lebih kecil)
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.argsort(-speeds, kind='stable')] = np.arange(1, n + 1)
+    pohon = [0] * (n + 1)
+    simpan = []
+    for j in range(n):
+        # hitung kandidat sebelumnya dengan speed >= speeds[j]
+        jumlah, r = 0, int(rank[j])
+        while r > 0:
+            jumlah += pohon[r]
+            r -= r & -r
+        if jumlah < k:
+            simpan.append(j)
+        r = int(rank[j])
+        while r <= n:
+            pohon[r] += 1
+            r += r & -r
+    return np.array(simpan, dtype=np.int64)
+
+
+def _maks_skor_ukuran_k(speeds, scores, k, target_speed, tenggat):
+    """
+    Branch & bound: pilih tepat k kandidat dengan total skor maksimum dan total
+    speed >= target. Kandidat urut skor menurun. Return (indeks, optimal?).
+    """
+    n = len(speeds)
+    kum_skor = np.concatenate(([0.0], np.cumsum(scores)))
+
+    # top_speed[i][m] = jumlah m speed terbesar di kandidat i..n-1
+    top_speed = [None] * (n + 1)
+    terbesar = []
+    top_speed[n] = [0.0] * (k + 1)
+    for i in range(n - 1, -1, -1):
+        terbesar.append(speeds[i])
+        terbesar.sort(reverse=True)
+        del terbesar[k:]
+        baris = [0.0] * (k + 1)
+        for m in range(1, k + 1):
+            baris[m] = baris[m - 1] + (terbesar[m - 1] if m <= len(terbesar) else 0.0)
+        top_speed[i] = baris
+
+    # Solusi awal yang pasti layak (kalau ada): k kandidat tercepat
+    terbaik_skor = -math.inf
+    terbaik = None
+    tercepat = np.argsort(-speeds, kind='stable')[:k]
+    if len(tercepat) == k and speeds[tercepat].sum() >= target_speed:
+        terbaik = tuple(int(x) for x in np.sort(tercepat))
+        terbaik_skor = scores[tercepat].sum()
+
+    optimal = True
+    stack = [(0, (), 0.0, 0.0)]
+    langkah = 0
+    while stack:
+        langkah += 1
+        if langkah % 1024 == 0 and time.perf_counter() > tenggat:
+            optimal = False
+            break
+        i, dipilih, speed, skor = stack.pop()
+        sisa = k - len(dipilih)
+        if sisa == 0:
+            if speed >= target_speed and skor > terbaik_skor:
+                terbaik_skor, terbaik = skor, dipilih
+            continue
+        if n - i < sisa:
+            continue
+        if skor + kum_skor[i + sisa] - kum_skor[i] <= terbaik_skor:
+            continue
+        if speed + top_speed[i][sisa] < target_speed:
+            continue
+        # Lewati dulu di-push supaya "ambil" diproses lebih dulu (DFS)
+        stack.append((i + 1, dipilih, speed, skor))
+        stack.append((i + 1, dipilih + (i,), speed + speeds[i], skor + scores[i]))
+    return terbaik, optimal
+
+
+def pilih_tim(candidates, target_speed, min_anggota, mode="terkecil", budget_detik=0.5):
+    """
+    Pilih tim penjahit dari `candidates` (DataFrame urut FINAL_SCORE menurun,
+    biasanya hanya yang idle) yang memenuhi total speed >= target_speed dan
+    minimal `min_anggota` orang (dari batas pcs per orang).
+
+    mode="terkecil": jumlah orang paling sedikit, lalu total skor tertinggi.
+    mode="skor": rata-rata skor tertinggi, maksimal sebanyak tim greedy lama.
+
+    Pencarian exact (branch & bound) dibatasi `budget_detik`; kalau waktunya
+    habis, dipakai solusi terbaik yang sudah ditemukan atau tim greedy lama.
+    Return: (DataFrame tim, info dict)
+    """
+    mulai = time.perf_counter()
+    tenggat = mulai + budget_detik
+    speeds = candidates[KOLOM_SPEED].to_numpy(dtype=float)
+    scores = candidates[KOLOM_SKOR].to_numpy(dtype=float)
+    n = len(candidates)
+
+    k_greedy = tim_greedy(speeds, target_speed, min_anggota)
+    info = {"metode": "greedy", "optimal": False, "layak": False, "waktu": 0.0}
+
+    # Ukuran minimum supaya speed cukup: jumlah k speed tercepat
+    k_min = _k_minimum(speeds, target_speed, min_anggota)
+
+    if n == 0 or k_min > n:
+        # Tidak ada tim yang memenuhi: pakai semua (sama seperti cara lama)
+        info["waktu"] = time.perf_counter() - mulai
+        return candidates.iloc[:k_greedy], info
+
+    info["layak"] = True
+    ukuran = [k_min] if mode == "terkecil" else range(k_min, max(k_min, k_greedy) + 1)
+
+    terbaik, nilai_terbaik, optimal = None, -math.inf, True
+    for k in ukuran:
+        posisi = _buang_terdominasi(speeds, scores, k)
+        pilihan, opt_k = _maks_skor_ukuran_k(speeds[posisi], scores[posisi], k, target_speed, tenggat)
+        optimal = optimal and opt_k
+        if pilihan is None:
+            continue
+        idx = posisi[list(pilihan)]
+        nilai = scores[idx].mean() if mode == "skor" else scores[idx].sum()
+        if nilai > nilai_terbaik:
+            terbaik, nilai_terbaik = idx, nilai
+        if time.perf_counter() > tenggat:
+            optimal = False
+            break
+
+    info["waktu"] = time.perf_counter() - mulai
+    if terbaik is None:
+        return candidates.iloc[:k_greedy], info
+
+    info["metode"] = "exact" if optimal else "exact (budget habis)"
+    info["optimal"] = optimal
+    return candidates.iloc[np.sort(terbaik)], info
+
+
+def _k_minimum(speeds, target_speed, min_anggota):
+    """Ukuran tim terkecil yang mungkin: jumlah speed tercepat sampai target."""
+    kum_tercepat = np.cumsum(np.sort(speeds)[::-1])
+    k_speed = int(np.searchsorted(kum_tercepat, target_speed - 1e-9)) + 1
+    return max(min_anggota, k_speed, 1)
+
+
+def pilih_tim_bertahap(hasil, target_speed, min_anggota, mode="terkecil", budget_detik=0.5, langkah=256):
+    """
+    Sama seperti pilih_tim, tapi kandidat diambil bertahap dari HasilRekomendasi
+    (urut skor, lihat allocation.HasilRekomendasi) alih-alih DataFrame seluruh roster.
+
+    Pengambilan berhenti begitu hasilnya pasti sama dengan pilih_tim atas semua
+    kandidat: tim greedy sudah tercapai di prefix, dan prefix memuat >= k_maks
+    kandidat yang speed-nya >= speed siapa pun di luar prefix. Kandidat di luar
+    prefix didominasi >= k_maks orang (skor & speed), jadi toh akan dibuang
+    _buang_terdominasi.
+    Return: (DataFrame tim, info dict)
+    """
+    n = len(hasil)
+    k_min = _k_minimum(hasil.speed, target_speed, min_anggota)
+
+    m = min(n, max(langkah, k_min))
+    with tahap("ambil kandidat tim") as t:
+        while True:
+            prefix = hasil.teratas(m)
+            if m >= n:
+                break
+            speeds = prefix[KOLOM_SPEED].to_numpy(dtype=float)
+            k_greedy = tim_greedy(speeds, target_speed, min_anggota)
+            greedy_tercapai = k_greedy < m or speeds.sum() >= target_speed
+            k_maks = k_min if mode == "terkecil" else max(k_min, k_greedy)
+            if greedy_tercapai and k_min <= m:
+                pembatas = hasil.speed_maks_setelah(m)
+                if np.count_nonzero(speeds >= pembatas) >= k_maks:
+                    break
+            m = min(n, 2 * m)
+        t["baris"] = len(prefix)
+
+    with tahap("pilih_tim (exact)", len(prefix)):
+        team, info = pilih_tim(prefix, target_speed, min_anggota, mode=mode, budget_detik=budget_detik)
+    info["kandidat_dibaca"] = len(prefix)
+    return team, info
+
+
+def _saring_pareto(speed, jarak, att):
+    """
+    Indeks titik yang tidak didominasi untuk (speed maks, jarak min, att maks).
+    Per nilai att (menurun) dibuat "tangga" jarak -> speed terbaik dari att yang
+    lebih tinggi, jadi cukup satu searchsorted per kelompok. Titik kembar
+    disimpan satu saja.
+    """
+    if len(speed) == 0:
+        return np.array([], dtype=np.int64)
+    urut = np.lexsort((-speed, jarak, -att))
+    att_urut = att[urut]
+    batas = np.flatnonzero(np.diff(att_urut)) + 1
+    simpan = []
+    tangga_jarak = np.array([])
+    tangga_speed = np.array([])
+    for kelompok in np.split(urut, batas):
+        j, v = jarak[kelompok], speed[kelompok]
+        # Terbaik dari att lebih tinggi dengan jarak <= j (att lebih tinggi: speed sama pun sudah kalah)
+        pos = np.searchsorted(tangga_jarak, j, side='right') - 1
+        dari_atas = np.where(pos >= 0, tangga_speed[np.maximum(pos, 0)] if len(tangga_speed) else -np.inf, -np.inf)
+        # Terbaik di kelompok yang sama dengan jarak <= j (urut jarak naik, speed turun)
+        sebelum = np.concatenate(([-np.inf], np.maximum.accumulate(v)[:-1]))
+        tetap = (v > dari_atas) & (v > sebelum)
+        simpan.append(kelompok[tetap])
+        tangga_jarak = np.concatenate((tangga_jarak, j[tetap]))
+        tangga_speed = np.concatenate((tangga_speed, v[tetap]))
+        urut_tangga = np.argsort(tangga_jarak, kind='stable')
+        tangga_jarak = tangga_jarak[urut_tangga]
+        tangga_speed = np.maximum.accumulate(tangga_speed[urut_tangga])
+    return np.sort(np.concatenate(simpan))
+
+
+# Selisih pembulatan float (mis. 3.4999999999999996 vs 3.5) tidak dihitung sebagai lebih baik
+TOLERANSI_DOMINASI = 1e-9
+
+
+def _bulatkan(nilai, grid):
+    """Nilai dibulatkan ke kelipatan `grid` hanya untuk perbandingan dominasi."""
+    if grid <= 0:
+        return nilai
+    return np.round(nilai / grid) * grid
+
+
+def _buang_terdominasi_3d(speeds, jarak, att, k):
+    """
+    Seperti _buang_terdominasi, untuk (speed, jarak, attitude): kandidat yang
+    didominasi >= k kandidat lain tidak pernah dibutuhkan tim berukuran <= k
+    (selalu ada penggantinya di luar tim yang tidak lebih buruk).
+
+    Urut (speed turun, jarak naik, att turun, indeks) sehingga semua pendominasi
+    kandidat ada di depannya (kembar: yang di depan dianggap mendominasi); cukup
+    dihitung di antara kandidat yang DISIMPAN: kalau ada pendominasi yang
+    dibuang, >= k pendominasinya yang disimpan juga mendominasi kandidat ini.
+    Memori O(n), bukan matriks n x n.
+    """
+    n = len(speeds)
+    urut = np.lexsort((np.arange(n), -att, jarak, -speeds))
+    jarak_simpan = np.empty(n)
+    att_simpan = np.empty(n)
+    simpan = []
+    for i in urut:
+        m = len(simpan)
+        # Kandidat di depan sudah punya speed >= speeds[i]
+        if np.count_nonzero((jarak_simpan[:m] <= jarak[i]) & (att_simpan[:m] >= att[i])) < k:
+            jarak_simpan[m] = jarak[i]
+            att_simpan[m] = att[i]
+            simpan.append(i)
+    return np.sort(np.array(simpan, dtype=np.int64))
+
+
+def front_pareto_tim(candidates, target_speed, min_anggota, ekstra_anggota=2, grid_jarak=0.1, maks_label=400):
+    """
+    Semua tim layak (total speed >= target, minimal `min_anggota` orang) yang
+    tidak didominasi pada tiga tujuan: kapasitas tim (maks), rata-rata jarak
+    (min), dan rata-rata attitude (maks). Ukuran tim dari ukuran terkecil yang
+    mungkin sampai `ekstra_anggota` orang lebih banyak.
+
+    Pemangkasan:
+    - kandidat yang didominasi >= ukuran tim maksimum orang dibuang dulu
+    - DP per ukuran tim atas kandidat urut speed; tim parsial yang didominasi
+      tim parsial lain berukuran sama dibuang (semua pelengkapnya juga kalah)
+    - tim parsial yang tidak mungkin lagi mencapai target speed dibuang
+    - jumlah jarak dibulatkan ke `grid_jarak` km saat membandingkan (ε-Pareto,
+      rata-rata jarak meleset paling banyak `grid_jarak`; 0 = exact)
+    - kalau tim parsial satu ukuran lebih dari `maks_label`, grid jarak
+      diperkasar (dua kali lipat) sampai muat; info["grid"] mencatat grid akhir
+
+    Return: (DataFrame frontier urut kapasitas menurun; kolom `anggota` berisi
+    label indeks `candidates`, info dict)
+    """
+    mulai = time.perf_counter()
+    speeds_semua = candidates[KOLOM_SPEED].to_numpy(dtype=float)
+    info = {"kandidat": len(candidates), "kandidat_dipakai": 0, "label_maks": 0, "grid": grid_jarak,
+            "waktu": 0.0}
+    kolom = ['Jml Penjahit', 'Kapasitas Tim (Pcs/Hari)', 'Rata-rata Jarak (Km)', 'Rata-rata Attitude',
+             'Rata-rata Skor', 'anggota']
+
+    k_min = _k_minimum(speeds_semua, target_speed, min_anggota)
+    if len(candidates) == 0 or k_min > len(candidates):
+        info["waktu"] = time.perf_counter() - mulai
+        return pd.DataFrame(columns=kolom), info
+    k_maks = min(len(candidates), k_min + ekstra_anggota)
+
+    jarak_semua = candidates[KOLOM_JARAK].to_numpy(dtype=float)
+    att_semua = candidates[KOLOM_ATTITUDE].to_numpy(dtype=float)
+    with tahap("pareto: buang terdominasi", len(candidates)) as t:
+        posisi = _buang_terdominasi_3d(speeds_semua, jarak_semua, att_semua, k_maks)
+        posisi = posisi[np.argsort(-speeds_semua[posisi], kind='stable')]
+        t["baris"] = len(posisi)
+    speeds, jarak, att = speeds_semua[posisi], jarak_semua[posisi], att_semua[posisi]
+    n = len(posisi)
+    info["kandidat_dipakai"] = n
+    kum = np.concatenate(([0.0], np.cumsum(speeds)))
+
+    # label[m] = tim parsial berukuran m: (speed, jarak, att, anggota sebagai bitmask int)
+    kosong = (np.zeros(0), np.zeros(0), np.zeros(0), np.zeros(0, dtype=object))
+    label = [(np.zeros(1), np.zeros(1), np.zeros(1), np.array([0], dtype=object))] + [kosong] * k_maks
+    grid = grid_jarak
+    with tahap("pareto: DP per ukuran tim", n):
+        for i in range(n):
+            bit = 1 << i
+            for m in range(min(i + 1, k_maks), 0, -1):
+                v0, j0, a0, b0 = label[m - 1]
+                if not len(v0):
+                    continue
+                v = np.concatenate((label[m][0], v0 + speeds[i]))
+                j = np.concatenate((label[m][1], j0 + jarak[i]))
+                a = np.concatenate((label[m][2], a0 + att[i]))
+                b = np.concatenate((label[m][3], b0 | bit))
+                # Masih bisa mencapai target dengan sisa kandidat tercepat?
+                bisa = v + (kum[min(n, i + 1 + k_maks - m)] - kum[i + 1]) >= target_speed - 1e-9
+                v, j, a, b = v[bisa], j[bisa], a[bisa], b[bisa]
+                tetap = _saring_pareto(v, _bulatkan(j, grid), a)
+                while len(tetap) > maks_label:
+                    grid = 2 * grid if grid > 0 else 0.1
+                    tetap = tetap[_saring_pareto(v[tetap], _bulatkan(j[tetap], grid), a[tetap])]
+                label[m] = (v[tetap], j[tetap], a[tetap], b[tetap])
+                info["label_maks"] = max(info["label_maks"], len(tetap))
+
+    with tahap("pareto: frontier akhir") as t:
+        baris = []
+        for m in range(k_min, k_maks + 1):
+            v, j, a, b = label[m]
+            layak = v >= target_speed - 1e-9
+            for vi, ji, ai, bi in zip(v[layak], j[layak], a[layak], b[layak]):
+                baris.append((m, vi, ji / m, ai / m, bi))
+        if baris:
+            m_, v_, j_, a_, b_ = (np.array(x) for x in zip(*baris))
+            tetap = _saring_pareto(*(_bulatkan(x, TOLERANSI_DOMINASI) for x in (v_, j_, a_)))
+        else:
+            tetap = []
+        skor = candidates[KOLOM_SKOR].to_numpy(dtype=float)
+        front = []
+        for idx in tetap:
+            anggota = posisi[[i for i in range(n) if (int(b_[idx]) >> i) & 1]]
+            anggota = np.sort(anggota)
+            front.append((int(m_[idx]), float(v_[idx]), float(j_[idx]), float(a_[idx]),
+                          float(skor[anggota].mean()), list(candidates.index[anggota])))
+        df = pd.DataFrame(front, columns=kolom)
+        df = df.sort_values(['Kapasitas Tim (Pcs/Hari)', 'Rata-rata Jarak (Km)'], ascending=[False, True],
+                            kind='stable').reset_index(drop=True)
+        t["baris"] = len(df)
+    info["grid"] = grid
+    info["waktu"] = time.perf_counter() - mulai
+    return df, info
+